@@ -0,0 +1,110 @@
+"""Measure bytes on the wire and CPU time of compressing list responses.
+
+Bodies are synthetic ``/students`` pages of 1,000 and 10,000 rows,
+serialized the way FastAPI renders them. Each body is compressed with the
+encoders the compression middleware uses, both as one complete response
+and as an NDJSON stream flushed every ``STREAM_CHUNK_SIZE`` rows. Brotli is
+measured only when the library is installed.
+
+Usage (from the backend directory):
+    python benchmarks/compression_benchmark.py [--runs 5] [--rows 1000 10000]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "tutorhub_benchmark")
+
+from config import CompressionConfig, PaginationConfig  # noqa: E402
+from middleware.compression import available_encodings, build_encoder  # noqa: E402
+
+def build_students(rows: int) -> list:
+    """Student documents shaped like the ``/students`` response."""
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Student {index}",
+            "email": f"student{index}@example.com",
+            "phone": f"98{index:08d}",
+            "whatsapp": f"98{index:08d}",
+            "batch_id": str(uuid.uuid4()),
+            "batch_name": f"Batch {index % 40}",
+            "total_fees": 12000.0,
+            "paid_amount": float(index % 12 * 1000),
+            "payment_status": ("pending", "partial", "paid")[index % 3],
+            "institute_id": "institute-benchmark",
+            "created_at": (created + timedelta(minutes=index)).isoformat(),
+        }
+        for index in range(rows)
+    ]
+
+def render_json(documents: list) -> bytes:
+    """Body of a JSON array response, as JSONResponse renders it."""
+    return json.dumps(documents, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def render_ndjson_chunks(documents: list, chunk_size: int) -> list:
+    """Body pieces of an NDJSON stream, one per ``chunk_size`` documents."""
+    return [
+        "".join(json.dumps(document, separators=(",", ":")) + "\n" for document in documents[start:start + chunk_size]).encode("utf-8")
+        for start in range(0, len(documents), chunk_size)
+    ]
+
+def compress_whole(encoding: str, body: bytes) -> int:
+    """Compress a complete body and return its compressed size."""
+    encoder = build_encoder(encoding, CompressionConfig.GZIP_LEVEL, CompressionConfig.BROTLI_QUALITY)
+    return len(encoder.finish(body))
+
+def compress_stream(encoding: str, chunks: list) -> int:
+    """Compress a body chunk by chunk, flushing each, and return the bytes sent."""
+    encoder = build_encoder(encoding, CompressionConfig.GZIP_LEVEL, CompressionConfig.BROTLI_QUALITY)
+    sent = sum(len(encoder.compress(chunk)) for chunk in chunks)
+    return sent + len(encoder.finish())
+
+def measure(compress, payload, runs: int) -> dict:
+    """Median CPU milliseconds and compressed size over ``runs`` repetitions."""
+    samples = []
+    size = 0
+    for _ in range(runs):
+        started = time.process_time()
+        size = compress(payload)
+        samples.append(time.process_time() - started)
+    return {"bytes": size, "cpu_ms": round(statistics.median(samples) * 1000, 2)}
+
+def run_benchmark(row_counts: list, runs: int) -> dict:
+    """Measure every encoding for each response size."""
+    summary = {"encodings": list(available_encodings()), "results": {}}
+    for rows in row_counts:
+        documents = build_students(rows)
+        body = render_json(documents)
+        chunks = render_ndjson_chunks(documents, PaginationConfig.STREAM_CHUNK_SIZE)
+
+        result = {"identity": {"bytes": len(body), "cpu_ms": 0.0}}
+        for encoding in available_encodings():
+            whole = measure(lambda payload: compress_whole(encoding, payload), body, runs)
+            streamed = measure(lambda payload: compress_stream(encoding, payload), chunks, runs)
+            whole["ratio"] = round(whole["bytes"] / len(body), 3)
+            streamed["ratio"] = round(streamed["bytes"] / sum(len(chunk) for chunk in chunks), 3)
+            result[encoding] = whole
+            result[f"{encoding}_streamed"] = streamed
+        summary["results"][f"{rows}_rows"] = result
+    return summary
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TutorHub response compression")
+    parser.add_argument("--runs", type=int, default=5, help="repetitions per measurement")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000], help="response sizes in rows")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.rows, args.runs), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure how long a fresh worker takes to import the application and how much memory it holds.
+
+Each measurement runs in a new interpreter so module caches never carry
+over. The ``baseline`` scenario preloads pandas and openpyxl before the
+server module, which is what every worker paid while those libraries were
+imported at module load; ``current`` imports the server module alone.
+
+Usage (from the backend directory):
+    python benchmarks/startup_benchmark.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "baseline": ["pandas", "openpyxl", "server"],
+    "current": ["server"],
+}
+
+# Runs inside the child interpreter; prints elapsed seconds and peak RSS in KiB
+PROBE = """
+import importlib, resource, sys, time
+started = time.perf_counter()
+for module in sys.argv[1:]:
+    importlib.import_module(module)
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024
+print(elapsed, rss, "pandas" in sys.modules)
+"""
+
+def measure(modules: list) -> dict:
+    """Import modules in a fresh interpreter and return time and memory.
+
+    Args:
+        modules: Module names imported in order
+
+    Returns:
+        Import seconds, peak RSS in MiB and whether pandas ended up loaded
+    """
+    env = {
+        "MONGO_URL": "mongodb://localhost:27017",
+        "DB_NAME": "tutorhub_benchmark",
+        **os.environ,
+    }
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE, *modules],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed, rss, pandas_loaded = completed.stdout.split()[-3:]
+    return {
+        "seconds": float(elapsed),
+        "rss_mb": int(rss) / 1024,
+        "pandas_loaded": pandas_loaded == "True",
+    }
+
+def run_benchmark(runs: int) -> dict:
+    """Measure every scenario ``runs`` times and summarize the medians."""
+    summary = {}
+    for name, modules in SCENARIOS.items():
+        samples = [measure(modules) for _ in range(runs)]
+        summary[name] = {
+            "modules": modules,
+            "median_import_ms": round(statistics.median(sample["seconds"] for sample in samples) * 1000, 1),
+            "median_rss_mb": round(statistics.median(sample["rss_mb"] for sample in samples), 1),
+            "pandas_loaded": samples[-1]["pandas_loaded"],
+        }
+
+    summary["saved"] = {
+        "import_ms": round(summary["baseline"]["median_import_ms"] - summary["current"]["median_import_ms"], 1),
+        "rss_mb": round(summary["baseline"]["median_rss_mb"] - summary["current"]["median_rss_mb"], 1),
+    }
+    return summary
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TutorHub worker start-up cost")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per scenario")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.runs), indent=2))
+
+if __name__ == "__main__":
+    main()
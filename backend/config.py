@@ -10,6 +10,15 @@ class DatabaseConfig:
     """Database connection configuration."""
     MONGO_URL: str = os.environ['MONGO_URL']
     DB_NAME: str = os.environ['DB_NAME']
+    APPLY_INDEXES_ON_STARTUP: bool = os.environ.get('APPLY_INDEXES_ON_STARTUP', 'True').lower() == 'true'
+    NORMALIZE_EMAILS_ON_STARTUP: bool = os.environ.get('NORMALIZE_EMAILS_ON_STARTUP', 'True').lower() == 'true'
+    MAX_POOL_SIZE: int = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+    MIN_POOL_SIZE: int = int(os.environ.get('MONGO_MIN_POOL_SIZE', '5'))
+    MAX_IDLE_TIME_MS: int = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000'))
+    WAIT_QUEUE_TIMEOUT_MS: int = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000'))
+    COMPRESSORS: str = os.environ.get('MONGO_COMPRESSORS', 'zlib')  # e.g. "zstd,snappy,zlib"; empty disables
+    ANALYTICS_READ_PREFERENCE: str = os.environ.get('MONGO_ANALYTICS_READ_PREFERENCE', 'secondaryPreferred')
+    INSTITUTE_STATS_RECONCILE_SECONDS: int = int(os.environ.get('INSTITUTE_STATS_RECONCILE_SECONDS', '900'))  # 0 disables
 
 class SecurityConfig:
     """Security and authentication configuration."""
@@ -17,6 +26,57 @@ class SecurityConfig:
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     PASSWORD_HASH_SCHEMES: list = ["bcrypt"]
+    STUDENT_TEMPORARY_PASSWORD: str = os.environ.get('STUDENT_TEMPORARY_PASSWORD', 'Student@123')
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', '60'))
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.environ.get('PRINCIPAL_CACHE_MAX_ENTRIES', '10000'))
+    TOKEN_CACHE_MAX_ENTRIES: int = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '2048'))
+    SCOPE_CACHE_TTL_SECONDS: int = int(os.environ.get('SCOPE_CACHE_TTL_SECONDS', '60'))
+    SCOPE_CACHE_MAX_ENTRIES: int = int(os.environ.get('SCOPE_CACHE_MAX_ENTRIES', '10000'))
+    PASSWORD_HASH_POOL_KIND: str = os.environ.get('PASSWORD_HASH_POOL_KIND', 'thread')  # thread or process
+    PASSWORD_HASH_POOL_WORKERS: int = int(os.environ.get('PASSWORD_HASH_POOL_WORKERS', '4'))
+    PASSWORD_HASH_MAX_QUEUE_DEPTH: int = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE_DEPTH', '64'))
+    STATELESS_CLAIMS_ENABLED: bool = os.environ.get('STATELESS_CLAIMS_ENABLED', 'False').lower() == 'true'
+    TOKEN_VERSION_REFRESH_SECONDS: int = int(os.environ.get('TOKEN_VERSION_REFRESH_SECONDS', '5'))
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = int(os.environ.get('PASSWORD_HASH_RETRY_AFTER_SECONDS', '2'))
+
+class PaginationConfig:
+    """List endpoint paging configuration."""
+    DEFAULT_PAGE_SIZE: int = int(os.environ.get('DEFAULT_PAGE_SIZE', '100'))
+    MAX_PAGE_SIZE: int = int(os.environ.get('MAX_PAGE_SIZE', '500'))
+    STREAM_CHUNK_SIZE: int = int(os.environ.get('STREAM_CHUNK_SIZE', '200'))
+
+class ImportConfig:
+    """Bulk upload and import configuration."""
+    INSERT_CHUNK_SIZE: int = int(os.environ.get('IMPORT_INSERT_CHUNK_SIZE', '1000'))
+    MAX_UPLOAD_BYTES: int = int(os.environ.get('IMPORT_MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+    MAX_ROWS: int = int(os.environ.get('IMPORT_MAX_ROWS', '50000'))
+    MAX_CONCURRENT_JOBS: int = int(os.environ.get('IMPORT_MAX_CONCURRENT_JOBS', '2'))  # per institute
+    JOB_STALE_SECONDS: int = int(os.environ.get('IMPORT_JOB_STALE_SECONDS', '600'))
+    JOB_MAX_STORED_ERRORS: int = int(os.environ.get('IMPORT_JOB_MAX_STORED_ERRORS', '1000'))
+
+class EnquiryConfig:
+    """Public enquiry and contact form intake configuration."""
+    WRITE_BEHIND_ENABLED: bool = os.environ.get('ENQUIRY_WRITE_BEHIND_ENABLED', 'True').lower() == 'true'
+    FLUSH_INTERVAL_MS: int = int(os.environ.get('ENQUIRY_FLUSH_INTERVAL_MS', '250'))
+    FLUSH_MAX_RECORDS: int = int(os.environ.get('ENQUIRY_FLUSH_MAX_RECORDS', '200'))
+    BUFFER_MAX_PENDING: int = int(os.environ.get('ENQUIRY_BUFFER_MAX_PENDING', '5000'))
+    ENQUEUE_TIMEOUT_SECONDS: float = float(os.environ.get('ENQUIRY_ENQUEUE_TIMEOUT_SECONDS', '2'))
+    RETRY_AFTER_SECONDS: int = int(os.environ.get('ENQUIRY_RETRY_AFTER_SECONDS', '5'))
+    INSTITUTE_CACHE_SECONDS: int = int(os.environ.get('ENQUIRY_INSTITUTE_CACHE_SECONDS', '300'))
+
+class CacheConfig:
+    """HTTP conditional request configuration."""
+    CONDITIONAL_GET_ENABLED: bool = os.environ.get('CONDITIONAL_GET_ENABLED', 'True').lower() == 'true'
+    VERSION_CACHE_TTL_SECONDS: float = float(os.environ.get('VERSION_CACHE_TTL_SECONDS', '2'))  # 0 reads Mongo every time
+    VERSION_CACHE_MAX_ENTRIES: int = int(os.environ.get('VERSION_CACHE_MAX_ENTRIES', '10000'))
+
+class CompressionConfig:
+    """HTTP response compression configuration."""
+    ENABLED: bool = os.environ.get('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    MINIMUM_SIZE: int = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', '1024'))  # bytes
+    GZIP_LEVEL: int = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+    BROTLI_QUALITY: int = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))  # used when Brotli is installed
+    EXCLUDED_PATHS: list = [path for path in os.environ.get('COMPRESSION_EXCLUDED_PATHS', '').split(',') if path]
 
 class ApplicationConfig:
     """General application configuration."""
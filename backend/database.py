@@ -1,33 +1,175 @@
 """Database connection and initialization."""
+import threading
+import time
+from typing import Optional
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
+
 from config import DatabaseConfig
 
+class ConnectionPoolMonitor(monitoring.ConnectionPoolListener):
+    """Collects connection pool counters from pymongo pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkout_started = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self.counters = {
+                "connections_created": 0,
+                "connections_closed": 0,
+                "checked_out": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "pool_clears": 0,
+                "peak_checked_out": 0,
+            }
+            self._checkout_wait_total = 0.0
+            self._checkout_wait_max = 0.0
+
+    def _record_checkout_wait(self, event) -> None:
+        started = self._checkout_started.pop(threading.get_ident(), None)
+        if started is not None:
+            waited = time.perf_counter() - started
+            self._checkout_wait_total += waited
+            self._checkout_wait_max = max(self._checkout_wait_max, waited)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.counters["pool_clears"] += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.counters["connections_created"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.counters["connections_closed"] += 1
+
+    def connection_check_out_started(self, event):
+        self._checkout_started[threading.get_ident()] = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.counters["checkout_failures"] += 1
+            self._record_checkout_wait(event)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.counters["checkouts"] += 1
+            self.counters["checked_out"] += 1
+            self.counters["peak_checked_out"] = max(
+                self.counters["peak_checked_out"], self.counters["checked_out"]
+            )
+            self._record_checkout_wait(event)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.counters["checked_out"] -= 1
+
+    def get_statistics(self) -> dict:
+        """Return pool counters and utilization against ``maxPoolSize``."""
+        with self._lock:
+            checkouts = self.counters["checkouts"]
+            return {
+                **self.counters,
+                "open_connections": self.counters["connections_created"] - self.counters["connections_closed"],
+                "max_pool_size": DatabaseConfig.MAX_POOL_SIZE,
+                "utilization": self.counters["checked_out"] / DatabaseConfig.MAX_POOL_SIZE,
+                "avg_checkout_wait_ms": (self._checkout_wait_total / checkouts * 1000) if checkouts else 0.0,
+                "max_checkout_wait_ms": self._checkout_wait_max * 1000,
+            }
+
 class DatabaseConnection:
-    """Manages MongoDB connection lifecycle."""
-    
+    """Manages the single MongoDB client shared by the whole application."""
+
     def __init__(self):
-        self.client: AsyncIOMotorClient = None
-        self.database: AsyncIOMotorDatabase = None
-    
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.database: Optional[AsyncIOMotorDatabase] = None
+        self.analytics_database: Optional[AsyncIOMotorDatabase] = None
+        self.pool_monitor = ConnectionPoolMonitor()
+
     def connect_to_database(self) -> None:
-        """Establish connection to MongoDB."""
-        self.client = AsyncIOMotorClient(DatabaseConfig.MONGO_URL)
+        """Create the MongoDB client with the configured pool settings."""
+        if self.client is not None:
+            return
+
+        client_options = {
+            "tz_aware": True,
+            "maxPoolSize": DatabaseConfig.MAX_POOL_SIZE,
+            "minPoolSize": DatabaseConfig.MIN_POOL_SIZE,
+            "maxIdleTimeMS": DatabaseConfig.MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": DatabaseConfig.WAIT_QUEUE_TIMEOUT_MS,
+            "event_listeners": [self.pool_monitor],
+        }
+        if DatabaseConfig.COMPRESSORS:
+            client_options["compressors"] = DatabaseConfig.COMPRESSORS
+
+        self.client = AsyncIOMotorClient(DatabaseConfig.MONGO_URL, **client_options)
         self.database = self.client[DatabaseConfig.DB_NAME]
-    
+        self.analytics_database = self.client.get_database(
+            DatabaseConfig.DB_NAME,
+            read_preference=make_read_preference(
+                read_pref_mode_from_name(DatabaseConfig.ANALYTICS_READ_PREFERENCE), None
+            )
+        )
+
     def close_database_connection(self) -> None:
         """Close MongoDB connection."""
         if self.client:
             self.client.close()
-    
+        self.client = None
+        self.database = None
+        self.analytics_database = None
+
     def get_database(self) -> AsyncIOMotorDatabase:
         """Get database instance."""
         if self.database is None:
             self.connect_to_database()
         return self.database
 
+    def get_analytics_database(self) -> AsyncIOMotorDatabase:
+        """Get the database handle used for dashboard and reporting reads."""
+        if self.analytics_database is None:
+            self.connect_to_database()
+        return self.analytics_database
+
+class DatabaseProxy:
+    """Module-level database handle that resolves the client on first use.
+
+    Modules import ``database`` at import time, while the client itself is
+    created by the application lifespan (or lazily by command line tools).
+    """
+
+    def __init__(self, resolver):
+        self._resolver = resolver
+
+    def __getattr__(self, name: str):
+        return getattr(self._resolver(), name)
+
+    def __getitem__(self, name: str):
+        return self._resolver()[name]
+
 # Global database connection instance
 db_connection = DatabaseConnection()
-db_connection.connect_to_database()
 
-# Export database instance for direct use
-database = db_connection.get_database()
+# Export database handles for direct use
+database = DatabaseProxy(db_connection.get_database)
+analytics_database = DatabaseProxy(db_connection.get_analytics_database)
@@ -0,0 +1,51 @@
+"""Command line entry point for applying and checking MongoDB indexes.
+
+Usage (from the backend directory):
+    python manage_indexes.py apply [--drop-extra]
+    python manage_indexes.py report
+    python manage_indexes.py verify
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from database import database
+from services.index_service import index_management_service
+
+async def run_command(command: str, drop_extra: bool) -> int:
+    """Run an index command and print its result as JSON.
+
+    Args:
+        command: One of apply, report or verify
+        drop_extra: Whether apply should drop undeclared indexes
+
+    Returns:
+        Process exit code
+    """
+    if command == "apply":
+        summary = await index_management_service.apply_indexes(database, drop_extra=drop_extra)
+        print(json.dumps(summary, indent=2))
+        return 1 if summary["failed"] else 0
+
+    if command == "report":
+        report = await index_management_service.report_indexes(database)
+        print(json.dumps(report, indent=2))
+        return 1 if report["missing"] or report["mismatched"] else 0
+
+    results = await index_management_service.verify_hot_queries(database)
+    for result in results:
+        status = "IXSCAN" if result["uses_index"] else "NO INDEX"
+        print(f"[{status}] {result['collection']} {json.dumps(result['filter'], default=str)} -> {result['stages']}")
+    return 0 if all(result["uses_index"] for result in results) else 1
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage TutorHub MongoDB indexes")
+    parser.add_argument("command", choices=["apply", "report", "verify"])
+    parser.add_argument("--drop-extra", action="store_true", help="drop indexes not in the registry (apply only)")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run_command(args.command, args.drop_extra)))
+
+if __name__ == "__main__":
+    main()
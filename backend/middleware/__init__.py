@@ -0,0 +1,16 @@
+"""Middleware package initialization - exports all ASGI middleware."""
+from middleware.conditional_get import (
+    ConditionalGetMiddleware,
+    etag_matches
+)
+from middleware.compression import (
+    CompressionMiddleware,
+    available_encodings
+)
+
+__all__ = [
+    "ConditionalGetMiddleware",
+    "etag_matches",
+    "CompressionMiddleware",
+    "available_encodings",
+]
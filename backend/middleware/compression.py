@@ -0,0 +1,176 @@
+"""Response compression with gzip, or brotli when the library is installed."""
+import zlib
+from typing import Dict, Iterable, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Media types that are already compressed and would only cost CPU
+INCOMPRESSIBLE_MEDIA_TYPES = (
+    "application/vnd.openxmlformats-officedocument.",
+    "application/zip",
+    "application/gzip",
+    "image/",
+    "video/",
+    "audio/",
+)
+
+class GzipEncoder:
+    """Incremental gzip stream."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it right away."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and close the stream."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+class BrotliEncoder:
+    """Incremental brotli stream."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it right away."""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last chunk and close the stream."""
+        return self._compressor.process(data) + self._compressor.finish()
+
+def available_encodings() -> Sequence[str]:
+    """Content codings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def build_encoder(encoding: str, gzip_level: int, brotli_quality: int):
+    """Encoder for a content coding returned by :func:`available_encodings`."""
+    if encoding == "br":
+        return BrotliEncoder(brotli_quality)
+    return GzipEncoder(gzip_level)
+
+def negotiate_encoding(accept_encoding: Optional[str], encodings: Iterable[str]) -> Optional[str]:
+    """Pick the first of ``encodings`` the client accepts with a non-zero q-value."""
+    accepted: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+class CompressionMiddleware:
+    """Compresses response bodies for clients that accept gzip or brotli.
+
+    Complete bodies smaller than ``minimum_size`` bytes are sent as they
+    are, since framing overhead outweighs the saving. Streamed bodies are
+    compressed chunk by chunk. Responses that already carry a
+    ``Content-Encoding``, are of an already compressed media type, or
+    belong to a path starting with one of ``excluded_paths`` are never
+    touched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        excluded_paths: Sequence[str] = (),
+        enabled: bool = True
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_paths = tuple(path for path in excluded_paths if path)
+        self.enabled = enabled
+
+    def _should_skip(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        media_type = headers.get("content-type", "")
+        return (
+            message["status"] < 200
+            or message["status"] in (204, 304)
+            or "content-encoding" in headers
+            or media_type.startswith(INCOMPRESSIBLE_MEDIA_TYPES)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or scope["path"].startswith(self.excluded_paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), available_encodings())
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = self._should_skip(message)
+                if passthrough:
+                    await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(scope=start_message)
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                encoder = build_encoder(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    body = encoder.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+            chunk = encoder.compress(body) if more_body else encoder.finish(body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
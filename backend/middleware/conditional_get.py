@@ -0,0 +1,93 @@
+"""Conditional GET (ETag / If-None-Match) for version-tracked list endpoints."""
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services import collection_version_service
+
+# Returns the authenticated principal of a request, or None if there is none
+PrincipalResolver = Callable[[Request], Awaitable[Optional[dict]]]
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    candidates = [opaque(tag) for tag in if_none_match.split(",")]
+    return "*" in candidates or opaque(etag) in candidates
+
+class ConditionalGetMiddleware:
+    """Answers repeated GETs of registered paths with 304 Not Modified.
+
+    ``resources`` maps a path to the collections its response is built
+    from. The ETag combines the caller's institute counters for those
+    collections with the caller, the query string and the current UTC day
+    (dashboards count "today"). It is computed before the endpoint runs, so
+    a matching ``If-None-Match`` is answered without running the endpoint's
+    queries; otherwise the tag is attached to the endpoint's 200 response.
+    Requests without a valid principal pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        database,
+        resources: Dict[str, Sequence[str]],
+        resolve_principal: PrincipalResolver,
+        enabled: bool = True
+    ):
+        self.app = app
+        self.database = database
+        self.resources = resources
+        self.resolve_principal = resolve_principal
+        self.enabled = enabled
+
+    async def _etag(self, request: Request, collections: Sequence[str]) -> Optional[str]:
+        principal = await self.resolve_principal(request)
+        if principal is None:
+            return None
+
+        institute_id = principal.get("institute_id") or principal["id"]
+        versions = await collection_version_service.get_versions(self.database, institute_id, collections)
+        return collection_version_service.etag(
+            versions,
+            principal["id"],
+            principal["role"],
+            request.url.path,
+            request.url.query,
+            datetime.now(timezone.utc).date().isoformat()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        collections = self.resources.get(scope.get("path")) if scope["type"] == "http" else None
+        if not self.enabled or collections is None or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        etag = await self._etag(request, collections)
+        if etag is None:
+            await self.app(scope, receive, send)
+            return
+
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            await Response(status_code=304, headers=cache_headers)(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                for name, value in cache_headers.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,45 @@
+"""Command line entry point for converting ISO-string dates to BSON datetimes.
+
+The migration runs in batches against the live database and can be stopped
+and restarted at any time; progress is kept in the ``migrations`` collection.
+
+Usage (from the backend directory):
+    python migrate_dates.py [--batch-size 500]
+    python migrate_dates.py --restart
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from database import database
+from services.date_migration_service import date_migration_service
+
+async def run_migration(batch_size: int, restart: bool) -> int:
+    """Run the date migration and print per-field counts as JSON.
+
+    Args:
+        batch_size: Number of documents converted per bulk write
+        restart: Whether to discard saved checkpoints first
+
+    Returns:
+        Process exit code
+    """
+    date_migration_service.batch_size = batch_size
+    if restart:
+        await date_migration_service.reset_checkpoints(database)
+
+    summary = await date_migration_service.migrate_all(database)
+    print(json.dumps(summary, indent=2))
+    return 1 if any(counts["failed"] for counts in summary.values()) else 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert TutorHub string dates to BSON datetimes")
+    parser.add_argument("--batch-size", type=int, default=500, help="documents per bulk write")
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress and rescan every field")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run_migration(args.batch_size, args.restart)))
+
+if __name__ == "__main__":
+    main()
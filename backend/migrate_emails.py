@@ -0,0 +1,48 @@
+"""Command line entry point for normalizing stored emails.
+
+Emails are stored and looked up lowercased. This rewrites addresses saved
+in mixed case before that, in batches against the live database; it can be
+stopped and restarted at any time, with progress kept in the
+``migrations`` collection. The server also runs it on startup unless
+``NORMALIZE_EMAILS_ON_STARTUP`` is false.
+
+Usage (from the backend directory):
+    python migrate_emails.py [--batch-size 500]
+    python migrate_emails.py --restart
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from database import database
+from services.email_migration_service import email_migration_service
+
+async def run_migration(batch_size: int, restart: bool) -> int:
+    """Run the email migration and print per-collection counts as JSON.
+
+    Args:
+        batch_size: Number of documents updated per bulk write
+        restart: Whether to discard saved checkpoints first
+
+    Returns:
+        Process exit code; 1 if accounts differing only in case need merging
+    """
+    email_migration_service.batch_size = batch_size
+    if restart:
+        await email_migration_service.reset_checkpoints(database)
+
+    summary = await email_migration_service.migrate_all(database)
+    print(json.dumps(summary, indent=2))
+    return 1 if any(counts["conflicts"] for counts in summary.values()) else 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Normalize TutorHub stored emails")
+    parser.add_argument("--batch-size", type=int, default=500, help="documents per bulk write")
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress and rescan every collection")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run_migration(args.batch_size, args.restart)))
+
+if __name__ == "__main__":
+    main()
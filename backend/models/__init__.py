@@ -1,10 +1,14 @@
 """Model package initialization - exports all schemas."""
 from models.user import (
+    normalize_email,
+    NormalizedEmail,
     UserRoleEnum,
+    UserAccountStatusEnum,
     UserCreateSchema,
     UserResponseSchema,
     UserLoginSchema,
     PasswordChangeSchema,
+    AccountActivationSchema,
     TokenResponseSchema,
     TutorUpdateSchema
 )
@@ -49,14 +53,23 @@ from models.invite import (
     InviteCreateSchema,
     InviteResponseSchema
 )
+from models.import_job import (
+    ImportJobStatusEnum,
+    ImportJobKindEnum,
+    ImportJobResponseSchema
+)
 
 __all__ = [
     # User models
+    "normalize_email",
+    "NormalizedEmail",
     "UserRoleEnum",
+    "UserAccountStatusEnum",
     "UserCreateSchema",
     "UserResponseSchema",
     "UserLoginSchema",
     "PasswordChangeSchema",
+    "AccountActivationSchema",
     "TokenResponseSchema",
     "TutorUpdateSchema",
     # Batch models
@@ -92,4 +105,8 @@ __all__ = [
     "InviteStatusEnum",
     "InviteCreateSchema",
     "InviteResponseSchema",
+    # Import job models
+    "ImportJobStatusEnum",
+    "ImportJobKindEnum",
+    "ImportJobResponseSchema",
 ]
@@ -1,6 +1,6 @@
 """Batch-related data models and schemas."""
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, timezone
 import uuid
 
@@ -43,3 +43,4 @@ class BatchActivitySchema(BaseModel):
     classes: List[dict]
     students: List[dict]
     materials: List[dict]
+    next_cursors: Dict[str, Optional[str]] = Field(default_factory=dict)
@@ -0,0 +1,39 @@
+"""Import job data models and schemas."""
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+import uuid
+
+class ImportJobStatusEnum:
+    """Import job status constants."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ImportJobKindEnum:
+    """Import job kind constants."""
+    STUDENTS = "students"
+    INVITES = "invites"
+    SCHEDULE = "schedule"
+
+class ImportJobResponseSchema(BaseModel):
+    """Schema for import job progress in API responses."""
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    kind: str
+    status: str = ImportJobStatusEnum.QUEUED
+    filename: Optional[str] = None
+    batch_id: Optional[str] = None
+    institute_id: str
+    created_by: str
+    total_rows: Optional[int] = None
+    processed_rows: int = 0
+    counts: Dict[str, float] = Field(default_factory=dict)
+    errors: List[dict] = Field(default_factory=list)
+    errors_truncated: bool = False
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -1,9 +1,11 @@
 """Invite-related data models and schemas."""
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from datetime import datetime, timezone
 import uuid
 
+from models.user import NormalizedEmail
+
 class InviteStatusEnum:
     """Invite status constants."""
     PENDING = "pending"
@@ -11,7 +13,7 @@ class InviteStatusEnum:
 
 class InviteBaseSchema(BaseModel):
     """Base invite schema with common fields."""
-    email: EmailStr
+    email: NormalizedEmail
     role: str  # tutor, student
     batch_id: Optional[str] = None
 
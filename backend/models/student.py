@@ -1,13 +1,15 @@
 """Student-related data models and schemas."""
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from datetime import datetime, timezone
 import uuid
 
+from models.user import NormalizedEmail
+
 class StudentBaseSchema(BaseModel):
     """Base student schema with common fields."""
     name: str
-    email: EmailStr
+    email: NormalizedEmail
     phone: str
     whatsapp: Optional[str] = None
     batch_id: str
@@ -30,7 +32,7 @@ class StudentResponseSchema(StudentBaseSchema):
 class StudentUpdateSchema(BaseModel):
     """Schema for updating student information."""
     name: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[NormalizedEmail] = None
     phone: Optional[str] = None
     whatsapp: Optional[str] = None
     batch_id: Optional[str] = None
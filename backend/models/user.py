@@ -1,18 +1,34 @@
 """User-related data models and schemas."""
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict, EmailStr
+from typing import Annotated, Optional
 from datetime import datetime, timezone
 import uuid
 
+def normalize_email(email: str) -> str:
+    """Canonical form of an email address: trimmed and lowercased.
+
+    Emails are stored and looked up in this form, so addresses that differ
+    only in case name the same account.
+    """
+    return email.strip().lower()
+
+# Email field that validates and then normalizes the address
+NormalizedEmail = Annotated[EmailStr, AfterValidator(normalize_email)]
+
 class UserRoleEnum:
     """User role constants for type safety."""
     ADMIN = "admin"
     TUTOR = "tutor"
     STUDENT = "student"
 
+class UserAccountStatusEnum:
+    """User account lifecycle states."""
+    ACTIVE = "active"
+    PENDING_ACTIVATION = "pending_activation"
+
 class UserBaseSchema(BaseModel):
     """Base user schema with common fields."""
-    email: EmailStr
+    email: NormalizedEmail
     name: str
     role: str
     phone: Optional[str] = None
@@ -32,7 +48,7 @@ class UserResponseSchema(UserBaseSchema):
 
 class UserLoginSchema(BaseModel):
     """Schema for user login credentials."""
-    email: EmailStr
+    email: NormalizedEmail
     password: str
 
 class PasswordChangeSchema(BaseModel):
@@ -40,6 +56,11 @@ class PasswordChangeSchema(BaseModel):
     old_password: str
     new_password: str
 
+class AccountActivationSchema(BaseModel):
+    """Schema for activating a pending account with its one-time token."""
+    activation_token: str
+    new_password: str
+
 class TokenResponseSchema(BaseModel):
     """Schema for authentication token response."""
     access_token: str
@@ -50,5 +71,5 @@ class TokenResponseSchema(BaseModel):
 class TutorUpdateSchema(BaseModel):
     """Schema for updating tutor information."""
     name: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[NormalizedEmail] = None
     phone: Optional[str] = None
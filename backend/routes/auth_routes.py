@@ -1,18 +1,19 @@
 """Authentication routes."""
 from fastapi import APIRouter, HTTPException, Depends
-from datetime import datetime
 
 from models import (
     UserCreateSchema,
     UserLoginSchema,
     PasswordChangeSchema,
+    AccountActivationSchema,
     TokenResponseSchema,
     UserResponseSchema
 )
 from services import (
     user_authentication_service,
     user_management_service,
-    jwt_token_service
+    jwt_token_service,
+    account_activation_service
 )
 from routes.dependencies import get_current_authenticated_user
 
@@ -43,10 +44,9 @@ async def signup_new_user(user_data: UserCreateSchema):
     )
     
     # Generate access token
-    access_token = jwt_token_service.create_access_token({
-        "sub": created_user.id,
-        "role": created_user.role
-    })
+    access_token = jwt_token_service.create_access_token(
+        jwt_token_service.build_user_claims(created_user.model_dump())
+    )
     
     return TokenResponseSchema(
         access_token=access_token,
@@ -77,18 +77,13 @@ async def login_user(credentials: UserLoginSchema):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    # Convert datetime string to datetime object if needed
-    if isinstance(user.get("created_at"), str):
-        user["created_at"] = datetime.fromisoformat(user["created_at"])
-    
     # Create user response object
     user_response = UserResponseSchema(**user)
     
     # Generate access token
-    access_token = jwt_token_service.create_access_token({
-        "sub": user_response.id,
-        "role": user_response.role
-    })
+    access_token = jwt_token_service.create_access_token(
+        jwt_token_service.build_user_claims(user)
+    )
     
     return TokenResponseSchema(
         access_token=access_token,
@@ -109,9 +104,6 @@ async def get_current_user_info(
     Returns:
         User information
     """
-    if isinstance(current_user.get("created_at"), str):
-        current_user["created_at"] = datetime.fromisoformat(current_user["created_at"])
-    
     return UserResponseSchema(**current_user)
 
 @auth_router.post("/change-password")
@@ -126,7 +118,7 @@ async def change_user_password(
         current_user: Current authenticated user from dependency
         
     Returns:
-        Success message
+        Success message and a new access token
         
     Raises:
         HTTPException: If old password is invalid
@@ -140,4 +132,43 @@ async def change_user_password(
     if not password_changed:
         raise HTTPException(status_code=400, detail="Invalid old password")
     
-    return {"message": "Password changed successfully"}
+    # The change revoked existing tokens, so hand back a fresh one
+    updated_user = await user_authentication_service.get_principal_by_id(current_user["id"])
+    access_token = jwt_token_service.create_access_token(
+        jwt_token_service.build_user_claims(updated_user)
+    )
+    
+    return {"message": "Password changed successfully", "access_token": access_token}
+
+@auth_router.post("/activate", response_model=TokenResponseSchema)
+async def activate_pending_account(activation_data: AccountActivationSchema):
+    """Activate a pending account with its one-time token.
+    
+    Args:
+        activation_data: Activation token and the password to set
+        
+    Returns:
+        Token response with access token and user information
+        
+    Raises:
+        HTTPException: If the token is unknown or already used
+    """
+    user = await account_activation_service.activate_account(
+        activation_data.activation_token,
+        activation_data.new_password
+    )
+    
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid or already used activation token")
+    
+    user_response = UserResponseSchema(**user)
+    
+    access_token = jwt_token_service.create_access_token(
+        jwt_token_service.build_user_claims(user)
+    )
+    
+    return TokenResponseSchema(
+        access_token=access_token,
+        token_type="bearer",
+        user=user_response
+    )
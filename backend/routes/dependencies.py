@@ -4,7 +4,13 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import List
 import jwt
 
-from services import user_authentication_service, jwt_token_service
+from config import SecurityConfig
+from services import (
+    user_authentication_service,
+    jwt_token_service,
+    principal_cache_service,
+    token_version_registry_service
+)
 
 security_scheme = HTTPBearer()
 
@@ -25,19 +31,29 @@ async def get_current_authenticated_user(
     try:
         token = credentials.credentials
         
-        # Decode JWT token
-        payload = jwt_token_service.decode_access_token(token)
+        # Decode JWT token (cached by token hash)
+        payload = principal_cache_service.decode_token(
+            token,
+            jwt_token_service.decode_access_token
+        )
         user_id = payload.get("sub")
         
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token payload")
         
-        # Retrieve user from database
-        user = await user_authentication_service.get_user_by_id(user_id)
+        # Retrieve user from the principal cache, falling back to the database
+        user = await principal_cache_service.get_principal(
+            user_id,
+            user_authentication_service.get_principal_by_id
+        )
         
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         
+        # Tokens issued before a password or email change are revoked
+        if "token_version" in payload and payload["token_version"] != user.get("token_version", 0):
+            raise HTTPException(status_code=401, detail="Token revoked")
+        
         return user
         
     except jwt.ExpiredSignatureError:
@@ -45,6 +61,45 @@ async def get_current_authenticated_user(
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme)
+) -> dict:
+    """Dependency to get the current principal, from token claims when possible.
+    
+    With stateless claims enabled, tokens that carry a ``token_version`` are
+    authorized from their claims and the in-memory version registry, without
+    a database read. Otherwise this falls back to the full user lookup.
+    
+    Args:
+        credentials: HTTP bearer token credentials
+        
+    Returns:
+        Principal dictionary with id, role, institute_id, email and name
+        
+    Raises:
+        HTTPException: If token is invalid, expired, or revoked
+    """
+    if not SecurityConfig.STATELESS_CLAIMS_ENABLED or not token_version_registry_service.is_loaded:
+        return await get_current_authenticated_user(credentials)
+    
+    try:
+        payload = principal_cache_service.decode_token(
+            credentials.credentials,
+            jwt_token_service.decode_access_token
+        )
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    if "token_version" not in payload or "sub" not in payload:
+        return await get_current_authenticated_user(credentials)
+    
+    if not token_version_registry_service.is_token_current(payload["sub"], payload["token_version"]):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    
+    return jwt_token_service.principal_from_claims(payload)
+
 def require_user_role(allowed_roles: List[str]):
     """Dependency factory to check if user has required role.
     
@@ -58,7 +113,7 @@ def require_user_role(allowed_roles: List[str]):
         HTTPException: If user doesn't have required role
     """
     async def role_checker(
-        current_user: dict = Depends(get_current_authenticated_user)
+        current_user: dict = Depends(get_current_principal)
     ) -> dict:
         """Check if current user has required role."""
         if current_user.get("role") not in allowed_roles:
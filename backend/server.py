@@ -1,8 +1,11 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, BackgroundTasks, UploadFile, File, Response, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 import os
 import logging
 from pathlib import Path
@@ -10,29 +13,84 @@ from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from typing import List, Optional
 import uuid
 from datetime import datetime, timezone, timedelta
-from passlib.context import CryptContext
 import jwt
-import pandas as pd
 import io
 
+from config import SecurityConfig, DatabaseConfig, EnquiryConfig, CacheConfig, CompressionConfig
+from database import db_connection, database, analytics_database
+from middleware import ConditionalGetMiddleware, CompressionMiddleware, etag_matches
+from models import UserAccountStatusEnum, ImportJobKindEnum, NormalizedEmail, normalize_email
+from pymongo import ReturnDocument, ASCENDING, DESCENDING
+from services import (
+    principal_cache_service,
+    principal_scope_service,
+    password_hashing_pool_service,
+    HashingPoolSaturatedError,
+    account_activation_service,
+    jwt_token_service,
+    TOKEN_CLAIM_FIELDS,
+    token_version_registry_service,
+    index_management_service,
+    email_migration_service,
+    document_codec_service,
+    keyset_pagination_service,
+    InvalidCursorError,
+    document_stream_service,
+    dashboard_statistics_service,
+    institute_stats_service,
+    payment_ledger_service,
+    student_import_service,
+    bulk_invite_service,
+    class_schedule_service,
+    upload_ingestion_service,
+    UploadTooLargeError,
+    import_job_service,
+    ImportJobLimitError,
+    enquiry_intake_service,
+    EnquiryBufferFullError,
+    document_export_service,
+    batch_activity_service,
+    collection_version_service
+)
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# MongoDB connection - a single pooled client, opened and closed by the app lifespan
+db = database
+analytics_db = analytics_database
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
 security = HTTPBearer()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db_connection.connect_to_database()
+    # Lookups use normalized emails, so older mixed-case ones are rewritten first
+    if DatabaseConfig.NORMALIZE_EMAILS_ON_STARTUP:
+        await email_migration_service.migrate_all(db)
+    if DatabaseConfig.APPLY_INDEXES_ON_STARTUP:
+        await index_management_service.apply_indexes(db)
+    if SecurityConfig.STATELESS_CLAIMS_ENABLED:
+        token_version_registry_service.start(db)
+    institute_stats_service.start(db)
+    enquiry_intake_service.start(db)
+    
+    yield
+    
+    await enquiry_intake_service.stop(db)
+    await import_job_service.stop()
+    await institute_stats_service.stop()
+    await token_version_registry_service.stop()
+    db_connection.close_database_connection()
+    password_hashing_pool_service.shutdown()
+
 # Create the main app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 
 # ============ MODELS ============
@@ -45,7 +103,7 @@ class UserRole:
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    email: EmailStr
+    email: NormalizedEmail
     name: str
     role: str  # admin, tutor, student
     phone: Optional[str] = None
@@ -54,7 +112,7 @@ class User(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class UserCreate(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
     password: str
     name: str
     role: str
@@ -73,8 +131,12 @@ class BatchActivity(BaseModel):
     students: List[dict]
     materials: List[dict]
 
+class AccountActivation(BaseModel):
+    activation_token: str
+    new_password: str
+
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
     password: str
 
 class Token(BaseModel):
@@ -110,7 +172,7 @@ class Student(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
-    email: EmailStr
+    email: NormalizedEmail
     phone: str
     whatsapp: Optional[str] = None
     batch_id: str
@@ -123,7 +185,7 @@ class Student(BaseModel):
 
 class StudentCreate(BaseModel):
     name: str
-    email: EmailStr
+    email: NormalizedEmail
     phone: str
     whatsapp: Optional[str] = None
     batch_id: str
@@ -251,7 +313,7 @@ class EnquiryCreate(BaseModel):
 class Invite(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    email: EmailStr
+    email: NormalizedEmail
     role: str  # tutor, student
     batch_id: Optional[str] = None
     batch_name: Optional[str] = None
@@ -261,7 +323,7 @@ class Invite(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class InviteCreate(BaseModel):
-    email: EmailStr
+    email: NormalizedEmail
     role: str
     batch_id: Optional[str] = None
 
@@ -276,7 +338,7 @@ class BatchUpdate(BaseModel):
 
 class StudentUpdate(BaseModel):
     name: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[NormalizedEmail] = None
     phone: Optional[str] = None
     whatsapp: Optional[str] = None
     batch_id: Optional[str] = None
@@ -284,7 +346,7 @@ class StudentUpdate(BaseModel):
 
 class TutorUpdate(BaseModel):
     name: Optional[str] = None
-    email: Optional[EmailStr] = None
+    email: Optional[NormalizedEmail] = None
     phone: Optional[str] = None
 
 class ClassScheduleUpload(BaseModel):
@@ -293,41 +355,258 @@ class ClassScheduleUpload(BaseModel):
 
 # ============ UTILITY FUNCTIONS ============
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    # bcrypt runs in the bounded hashing pool so the event loop stays free
+    return await password_hashing_pool_service.hash_password(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hashing_pool_service.verify_password(plain_password, hashed_password)
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    issued_at = datetime.now(timezone.utc)
+    expire = issued_at + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": issued_at})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def create_user_access_token(user: dict) -> str:
+    # Self-contained claims (role, institute, email, name, token_version)
+    return create_access_token(jwt_token_service.build_user_claims(user))
+
+def build_student_user_document(student: Student) -> tuple:
+    """User account for a student, left pending activation so no bcrypt runs here.
+    
+    Returns the document to insert and the one-time activation token.
+    """
+    user = User(
+        email=student.email,
+        name=student.name,
+        role=UserRole.STUDENT,
+        phone=student.phone,
+        whatsapp=student.whatsapp,
+        institute_id=student.institute_id
+    )
+    activation_token, credentials = account_activation_service.build_pending_credentials()
+    
+    doc = document_codec_service.encode(user)
+    doc.update(credentials)
+    return doc, activation_token
+
+async def paginate_collection(
+    response: Response,
+    collection,
+    query: dict,
+    sort_field: str,
+    direction: int,
+    limit: Optional[int],
+    cursor: Optional[str],
+    include_total: bool,
+    projection: Optional[dict] = None,
+    model: Optional[type] = None,
+    stream: Optional[str] = None
+):
+    """Fetch one keyset page and expose the next cursor and total as headers.
+    
+    With ``stream`` set the matches are streamed as NDJSON or a JSON array
+    instead, bounded only by an explicit ``limit``.
+    """
+    if stream is not None:
+        if not document_stream_service.is_supported(stream):
+            raise HTTPException(status_code=400, detail="stream must be 'ndjson' or 'json'")
+        try:
+            documents = keyset_pagination_service.open_cursor(
+                collection, query, sort_field, direction, cursor, projection
+            )
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        if limit is not None:
+            documents = documents.limit(max(1, limit))
+        
+        headers = {}
+        if include_total:
+            headers["X-Total-Count"] = str(await keyset_pagination_service.count(collection, query))
+        return StreamingResponse(
+            document_stream_service.iter_encoded(documents, model, stream),
+            media_type=document_stream_service.media_type(stream),
+            headers=headers
+        )
+    
+    try:
+        documents, next_cursor = await keyset_pagination_service.fetch_page(
+            collection, query, sort_field, direction, limit, cursor, projection
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        response.headers["X-Total-Count"] = str(await keyset_pagination_service.count(collection, query))
+    
+    return documents
+
+async def build_students_query(current_user: dict, batch_id: Optional[str] = None) -> dict:
+    """Students visible to the current user, optionally limited to one batch"""
+    if batch_id:
+        return {"batch_id": batch_id}
+    
+    return await principal_scope_service.build_query(db, current_user, "students")
+
+async def build_payments_query(
+    current_user: dict,
+    student_id: Optional[str] = None,
+    batch_id: Optional[str] = None
+) -> dict:
+    """Payments visible to the current user, optionally limited to a student or batch"""
+    if student_id:
+        return {"student_id": student_id}
+    if batch_id:
+        return {"batch_id": batch_id}
+    
+    return await principal_scope_service.build_query(db, current_user, "payments")
+
+async def build_classes_query(
+    current_user: dict,
+    batch_id: Optional[str] = None,
+    date: Optional[str] = None
+) -> dict:
+    """Classes visible to the current user, optionally limited to a batch or calendar day"""
+    if batch_id:
+        query = {"batch_id": batch_id}
+    else:
+        query = await principal_scope_service.build_query(db, current_user, "classes")
+    
+    if date:
+        # Filter by calendar day
+        day_start = document_codec_service.normalize_datetime(
+            datetime.combine(datetime.fromisoformat(date).date(), datetime.min.time())
+        )
+        query["class_date"] = {"$gte": day_start, "$lt": day_start + timedelta(days=1)}
+    
+    return query
+
+def export_collection(
+    collection,
+    query: dict,
+    sort_field: str,
+    direction: int,
+    columns: List[str],
+    export_format: str,
+    name: str
+) -> StreamingResponse:
+    """Stream the matching documents as a CSV or Excel download"""
+    if not document_export_service.is_supported(export_format):
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'xlsx'")
+    
+    cursor = collection.find(query, {"_id": 0, **{column: 1 for column in columns}}).sort(
+        [(sort_field, direction), ("id", direction)]
+    )
+    return StreamingResponse(
+        document_export_service.iter_export(cursor, columns, export_format, name),
+        media_type=document_export_service.media_type(export_format),
+        headers={"Content-Disposition": f"attachment; filename={name}.{export_format}"}
+    )
+
+async def start_import_job(
+    file: UploadFile,
+    kind: str,
+    required_columns: List[str],
+    missing_columns_detail: str,
+    runner,
+    current_user: dict,
+    batch_id: Optional[str] = None
+) -> dict:
+    """Spool an upload, check its header and hand its rows to a background import job"""
+    spooled = None
+    try:
+        spooled = await run_in_threadpool(upload_ingestion_service.spool, file)
+        sheet = await run_in_threadpool(upload_ingestion_service.open_file, spooled, file.filename)
+    except Exception as e:
+        if spooled:
+            spooled.close()
+        code = 413 if isinstance(e, UploadTooLargeError) else 400
+        raise HTTPException(status_code=code, detail=str(e))
+    
+    if not all(col in sheet.columns for col in required_columns):
+        spooled.close()
+        raise HTTPException(status_code=400, detail=missing_columns_detail)
+    
+    try:
+        job = await import_job_service.submit(
+            db, kind, spooled, sheet, runner,
+            institute_id=current_user["institute_id"] or current_user["id"],
+            created_by=current_user["id"],
+            filename=file.filename,
+            batch_id=batch_id
+        )
+    except ImportJobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    
+    return {
+        "message": "Import started",
+        "job_id": job.id,
+        "status": job.status,
+        "total_rows": job.total_rows
+    }
+
 def generate_invite_code() -> str:
     import secrets
     return secrets.token_urlsafe(16)
 
+def decode_access_token(token: str) -> dict:
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+async def load_principal(user_id: str) -> Optional[dict]:
+    return await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0, "activation_token_hash": 0})
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = principal_cache_service.decode_token(token, decode_access_token)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        user = await db.users.find_one({"id": user_id}, {"_id": 0})
+        user = await principal_cache_service.get_principal(user_id, load_principal)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
+        
+        # Tokens issued before a password or email change are revoked
+        if "token_version" in payload and payload["token_version"] != user.get("token_version", 0):
+            raise HTTPException(status_code=401, detail="Token revoked")
         return user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def get_current_principal(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """Principal from token claims when stateless claims are enabled, else the full user.
+    
+    Claims-bearing tokens are checked against the in-memory token version
+    registry, so role-gated routes authorize without touching Mongo.
+    """
+    if not SecurityConfig.STATELESS_CLAIMS_ENABLED or not token_version_registry_service.is_loaded:
+        return await get_current_user(credentials)
+    
+    try:
+        payload = principal_cache_service.decode_token(credentials.credentials, decode_access_token)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    # Tokens issued before claims were embedded still need the DB lookup
+    if "token_version" not in payload or "sub" not in payload:
+        return await get_current_user(credentials)
+    
+    if not token_version_registry_service.is_token_current(payload["sub"], payload["token_version"]):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    
+    return jwt_token_service.principal_from_claims(payload)
+
 def require_role(allowed_roles: List[str]):
-    async def role_checker(current_user: dict = Depends(get_current_user)):
+    async def role_checker(current_user: dict = Depends(get_current_principal)):
         if current_user["role"] not in allowed_roles:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
         return current_user
@@ -366,32 +645,32 @@ async def signup(user_data: UserCreate):
     
     # Create user
     user_dict = user_data.model_dump()
-    hashed_pw = hash_password(user_dict.pop("password"))
+    hashed_pw = await hash_password(user_dict.pop("password"))
     
     user = User(**user_dict)
-    doc = user.model_dump()
+    doc = document_codec_service.encode(user)
     doc["password"] = hashed_pw
-    doc["created_at"] = doc["created_at"].isoformat()
     
     await db.users.insert_one(doc)
+    token_version_registry_service.register(user.id)
     
     # Create token
-    token = create_access_token({"sub": user.id, "role": user.role})
+    token = create_user_access_token(doc)
     
     return Token(access_token=token, token_type="bearer", user=user)
 
 @api_router.post("/auth/login", response_model=Token)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user["password"]):
+    if not user or not await account_activation_service.verify_user_password(user, credentials.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    # Convert datetime strings
-    if isinstance(user["created_at"], str):
-        user["created_at"] = datetime.fromisoformat(user["created_at"])
+    # Pending accounts get their real password hash only now, on first login
+    if account_activation_service.is_pending(user):
+        await account_activation_service.complete_first_login(user)
     
     user_obj = User(**user)
-    token = create_access_token({"sub": user_obj.id, "role": user_obj.role})
+    token = create_user_access_token(user)
     
     # Include must_change_password in response
     return {
@@ -403,8 +682,6 @@ async def login(credentials: UserLogin):
 
 @api_router.get("/auth/me", response_model=User)
 async def get_me(current_user: dict = Depends(get_current_user)):
-    if isinstance(current_user["created_at"], str):
-        current_user["created_at"] = datetime.fromisoformat(current_user["created_at"])
     return User(**current_user)
 
 @api_router.post("/auth/change-password")
@@ -414,16 +691,44 @@ async def change_password(
 ):
     user = await db.users.find_one({"id": current_user["id"]})
     
-    if not verify_password(password_data.old_password, user["password"]):
+    if not await account_activation_service.verify_user_password(user, password_data.old_password):
         raise HTTPException(status_code=400, detail="Invalid old password")
     
-    new_hashed = hash_password(password_data.new_password)
-    await db.users.update_one(
+    new_hashed = await hash_password(password_data.new_password)
+    # Bumping token_version revokes every token issued before the change
+    updated_user = await db.users.find_one_and_update(
         {"id": current_user["id"]},
-        {"$set": {"password": new_hashed, "must_change_password": False}}
+        token_version_registry_service.add_version_bump({
+            "$set": {
+                "password": new_hashed,
+                "must_change_password": False,
+                "account_status": UserAccountStatusEnum.ACTIVE
+            },
+            "$unset": {"activation_token_hash": ""}
+        }),
+        projection={"_id": 0, "password": 0},
+        return_document=ReturnDocument.AFTER
     )
+    principal_cache_service.invalidate_user(current_user["id"])
+    token_version_registry_service.register(current_user["id"], updated_user["token_version"])
+    
+    # Hand back a fresh token since the current one was just revoked
+    return {"message": "Password changed successfully", "access_token": create_user_access_token(updated_user)}
+
+@api_router.post("/auth/activate", response_model=Token)
+async def activate_account(activation_data: AccountActivation):
+    """Activate a pending account with its one-time token and set a password"""
+    user = await account_activation_service.activate_account(
+        activation_data.activation_token,
+        activation_data.new_password
+    )
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid or already used activation token")
+    
+    user_obj = User(**user)
+    token = create_user_access_token(user)
     
-    return {"message": "Password changed successfully"}
+    return Token(access_token=token, token_type="bearer", user=user_obj)
 
 @api_router.put("/users/profile")
 async def update_profile(
@@ -432,22 +737,38 @@ async def update_profile(
 ):
     """Update user profile information"""
     # Remove fields that shouldn't be updated via this endpoint
-    disallowed_fields = ["id", "role", "institute_id", "password", "created_at", "must_change_password"]
+    disallowed_fields = [
+        "id", "role", "institute_id", "password", "created_at", "must_change_password",
+        "account_status", "activation_token_hash", "token_version"
+    ]
     update_data = {k: v for k, v in profile_data.items() if k not in disallowed_fields and v is not None}
     
     if not update_data:
         raise HTTPException(status_code=400, detail="No valid fields to update")
+    if "email" in update_data:
+        update_data["email"] = normalize_email(str(update_data["email"]))
+    
+    update_ops = {"$set": update_data}
+    # Tokens carry the email and name as claims, so changing them revokes the tokens;
+    # resubmitting the current values does not
+    claims_changed = token_version_registry_service.claims_changed(current_user, update_data)
+    if claims_changed:
+        token_version_registry_service.add_version_bump(update_ops)
     
-    # Update user in database
-    await db.users.update_one(
+    updated_user = await db.users.find_one_and_update(
         {"id": current_user["id"]},
-        {"$set": update_data}
+        update_ops,
+        projection={"_id": 0, "password": 0, "activation_token_hash": 0},
+        return_document=ReturnDocument.AFTER
     )
+    principal_cache_service.invalidate_user(current_user["id"])
     
-    # Get updated user
-    updated_user = await db.users.find_one({"id": current_user["id"]}, {"_id": 0, "password": 0})
-    
-    return {"message": "Profile updated successfully", "user": updated_user}
+    response = {"message": "Profile updated successfully", "user": updated_user}
+    if claims_changed:
+        token_version_registry_service.register(current_user["id"], updated_user["token_version"])
+        # Hand back a fresh token since the current one was just revoked
+        response["access_token"] = create_user_access_token(updated_user)
+    return response
 
 # ============ BATCH ROUTES ============
 
@@ -467,13 +788,12 @@ async def create_batch(
         tutor_name=tutor["name"]
     )
     
-    doc = batch.model_dump()
-    doc["start_date"] = doc["start_date"].isoformat()
-    doc["created_at"] = doc["created_at"].isoformat()
-    if doc["end_date"]:
-        doc["end_date"] = doc["end_date"].isoformat()
+    doc = document_codec_service.encode(batch)
     
     await db.batches.insert_one(doc)
+    await institute_stats_service.increment(db, batch.institute_id, total_batches=1)
+    principal_scope_service.invalidate_batch(batch.id, batch.tutor_id)
+    await collection_version_service.bump(db, batch.institute_id, "batches")
     
     # Blueprint: Create Slack channel
     # await notification_service.send_slack(f"batch-{batch.id}", f"Batch {batch.name} created!")
@@ -481,32 +801,20 @@ async def create_batch(
     return batch
 
 @api_router.get("/batches", response_model=List[Batch])
-async def get_batches(current_user: dict = Depends(get_current_user)):
-    query = {}
-    
-    if current_user["role"] == UserRole.TUTOR:
-        query["tutor_id"] = current_user["id"]
-    elif current_user["role"] == UserRole.STUDENT:
-        # Get student's batch
-        student = await db.students.find_one({"email": current_user["email"]}, {"_id": 0})
-        if student:
-            query["id"] = student["batch_id"]
-    else:
-        # Admin sees all
-        institute_id = current_user["institute_id"] or current_user["id"]
-        query["institute_id"] = institute_id
-    
-    batches = await db.batches.find(query, {"_id": 0}).to_list(1000)
-    
-    for batch in batches:
-        if isinstance(batch["start_date"], str):
-            batch["start_date"] = datetime.fromisoformat(batch["start_date"])
-        if batch.get("end_date") and isinstance(batch["end_date"], str):
-            batch["end_date"] = datetime.fromisoformat(batch["end_date"])
-        if isinstance(batch["created_at"], str):
-            batch["created_at"] = datetime.fromisoformat(batch["created_at"])
+async def get_batches(
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    query = await principal_scope_service.build_query(db, current_user, "batches")
     
-    return batches
+    return await paginate_collection(
+        response, db.batches, query, "created_at", DESCENDING, limit, cursor, include_total,
+        model=Batch, stream=stream
+    )
 
 @api_router.get("/batches/{batch_id}", response_model=Batch)
 async def get_batch(batch_id: str, current_user: dict = Depends(get_current_user)):
@@ -514,13 +822,6 @@ async def get_batch(batch_id: str, current_user: dict = Depends(get_current_user
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     
-    if isinstance(batch["start_date"], str):
-        batch["start_date"] = datetime.fromisoformat(batch["start_date"])
-    if batch.get("end_date") and isinstance(batch["end_date"], str):
-        batch["end_date"] = datetime.fromisoformat(batch["end_date"])
-    if isinstance(batch["created_at"], str):
-        batch["created_at"] = datetime.fromisoformat(batch["created_at"])
-    
     return Batch(**batch)
 
 @api_router.put("/batches/{batch_id}")
@@ -540,11 +841,16 @@ async def update_batch(
         if tutor:
             update_data["tutor_name"] = tutor["name"]
     
+    update_data["activity_updated_at"] = datetime.now(timezone.utc)
     result = await db.batches.update_one({"id": batch_id}, {"$set": update_data})
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Batch not found")
     
+    await collection_version_service.bump(db, current_user["institute_id"] or current_user["id"], "batches")
+    if "tutor_id" in update_data:
+        principal_scope_service.invalidate_batch(batch_id, update_data["tutor_id"])
+    
     return {"message": "Batch updated successfully"}
 
 @api_router.delete("/batches/{batch_id}")
@@ -552,64 +858,75 @@ async def delete_batch(
     batch_id: str,
     current_user: dict = Depends(require_role([UserRole.ADMIN]))
 ):
-    result = await db.batches.delete_one({"id": batch_id})
+    batch = await db.batches.find_one_and_delete({"id": batch_id}, projection={"_id": 0, "institute_id": 1})
     
-    if result.deleted_count == 0:
+    if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     
+    await institute_stats_service.increment(db, batch["institute_id"], total_batches=-1)
+    principal_scope_service.invalidate_batch(batch_id)
+    await collection_version_service.bump(db, batch["institute_id"], "batches")
+    
     return {"message": "Batch deleted successfully"}
 
 @api_router.get("/batches/{batch_id}/activities")
 async def get_batch_activities(
     batch_id: str,
+    request: Request,
+    response: Response,
+    classes_limit: Optional[int] = None,
+    classes_cursor: Optional[str] = None,
+    students_limit: Optional[int] = None,
+    students_cursor: Optional[str] = None,
+    materials_limit: Optional[int] = None,
+    materials_cursor: Optional[str] = None,
     current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.TUTOR]))
 ):
-    """Get all activities for a batch - classes, students, materials"""
+    """Get a page of each batch activity section - classes, students, materials"""
     batch = await db.batches.find_one({"id": batch_id}, {"_id": 0})
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
-    
-    # Get classes
-    classes = await db.classes.find({"batch_id": batch_id}, {"_id": 0}).to_list(1000)
-    for cls in classes:
-        if isinstance(cls["class_date"], str):
-            cls["class_date"] = datetime.fromisoformat(cls["class_date"])
-        if isinstance(cls["created_at"], str):
-            cls["created_at"] = datetime.fromisoformat(cls["created_at"])
-    
-    # Get students
-    students = await db.students.find({"batch_id": batch_id}, {"_id": 0}).to_list(1000)
-    for student in students:
-        if isinstance(student["created_at"], str):
-            student["created_at"] = datetime.fromisoformat(student["created_at"])
-    
-    # Get materials
-    materials = await db.materials.find({"batch_id": batch_id}, {"_id": 0}).to_list(1000)
-    for material in materials:
-        if isinstance(material["created_at"], str):
-            material["created_at"] = datetime.fromisoformat(material["created_at"])
-        if material.get("expiry_date") and isinstance(material["expiry_date"], str):
-            material["expiry_date"] = datetime.fromisoformat(material["expiry_date"])
-    
-    return {
-        "batch": batch,
-        "classes": classes,
-        "students": students,
-        "materials": materials
+
+    pages = {
+        "classes": (classes_limit, classes_cursor),
+        "students": (students_limit, students_cursor),
+        "materials": (materials_limit, materials_cursor),
     }
 
+    # Unchanged since the client's copy - skip the section queries entirely
+    etag = batch_activity_service.etag(batch, pages)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    try:
+        activity = await batch_activity_service.get_sections(db, batch_id, pages)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    response.headers.update(cache_headers)
+    batch.pop("activity_updated_at", None)
+    return {"batch": batch, **activity}
+
 # ============ TUTOR MANAGEMENT ROUTES ============
 
 @api_router.get("/tutors", response_model=List[User])
-async def get_tutors(current_user: dict = Depends(require_role([UserRole.ADMIN]))):
+async def get_tutors(
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
+    current_user: dict = Depends(require_role([UserRole.ADMIN]))
+):
     institute_id = current_user["institute_id"] or current_user["id"]
-    tutors = await db.users.find({"role": UserRole.TUTOR, "institute_id": institute_id}, {"_id": 0, "password": 0}).to_list(1000)
-    
-    for tutor in tutors:
-        if isinstance(tutor["created_at"], str):
-            tutor["created_at"] = datetime.fromisoformat(tutor["created_at"])
+    query = {"role": UserRole.TUTOR, "institute_id": institute_id}
     
-    return tutors
+    return await paginate_collection(
+        response, db.users, query, "name", ASCENDING, limit, cursor, include_total,
+        projection={"_id": 0, "password": 0, "activation_token_hash": 0},
+        model=User, stream=stream
+    )
 
 @api_router.post("/tutors", response_model=User)
 async def create_tutor(
@@ -624,15 +941,16 @@ async def create_tutor(
         raise HTTPException(status_code=400, detail="Email already registered")
     
     tutor_dict = tutor_data.model_dump()
-    hashed_pw = hash_password(tutor_dict.pop("password"))
+    hashed_pw = await hash_password(tutor_dict.pop("password"))
     tutor_dict["institute_id"] = current_user["institute_id"] or current_user["id"]
     
     tutor = User(**tutor_dict)
-    doc = tutor.model_dump()
+    doc = document_codec_service.encode(tutor)
     doc["password"] = hashed_pw
-    doc["created_at"] = doc["created_at"].isoformat()
     
     await db.users.insert_one(doc)
+    await institute_stats_service.increment(db, tutor.institute_id, total_tutors=1)
+    await collection_version_service.bump(db, tutor.institute_id, "users")
     return tutor
 
 @api_router.put("/tutors/{tutor_id}")
@@ -646,10 +964,29 @@ async def update_tutor(
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    result = await db.users.update_one({"id": tutor_id, "role": UserRole.TUTOR}, {"$set": update_data})
+    current = await db.users.find_one(
+        {"id": tutor_id, "role": UserRole.TUTOR},
+        {"_id": 0, **{field: 1 for field in TOKEN_CLAIM_FIELDS}}
+    )
+    if current is None:
+        raise HTTPException(status_code=404, detail="Tutor not found")
+    
+    update_ops = {"$set": update_data}
+    # Tokens carry the email and name as claims, so changing them revokes the tokens
+    if token_version_registry_service.claims_changed(current, update_data):
+        token_version_registry_service.add_version_bump(update_ops)
     
-    if result.modified_count == 0:
+    tutor = await db.users.find_one_and_update(
+        {"id": tutor_id, "role": UserRole.TUTOR},
+        update_ops,
+        projection={"_id": 0, "token_version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    principal_cache_service.invalidate_user(tutor_id)
+    
+    if tutor is None:
         raise HTTPException(status_code=404, detail="Tutor not found")
+    token_version_registry_service.register(tutor_id, tutor.get("token_version", 0))
     
     return {"message": "Tutor updated successfully"}
 
@@ -658,11 +995,20 @@ async def delete_tutor(
     tutor_id: str,
     current_user: dict = Depends(require_role([UserRole.ADMIN]))
 ):
-    result = await db.users.delete_one({"id": tutor_id, "role": UserRole.TUTOR})
+    tutor = await db.users.find_one_and_delete(
+        {"id": tutor_id, "role": UserRole.TUTOR},
+        projection={"_id": 0, "institute_id": 1}
+    )
+    principal_cache_service.invalidate_user(tutor_id)
+    await token_version_registry_service.revoke(db, tutor_id)
+    principal_scope_service.invalidate_user(tutor_id)
     
-    if result.deleted_count == 0:
+    if not tutor:
         raise HTTPException(status_code=404, detail="Tutor not found")
     
+    await institute_stats_service.increment(db, tutor.get("institute_id"), total_tutors=-1)
+    await collection_version_service.bump(db, tutor.get("institute_id"), "users")
+    
     return {"message": "Tutor deleted successfully"}
 
 # ============ STUDENT ROUTES ============
@@ -670,6 +1016,7 @@ async def delete_tutor(
 @api_router.post("/students", response_model=Student)
 async def create_student(
     student_data: StudentCreate,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.TUTOR]))
 ):
     # Get batch name
@@ -684,133 +1031,94 @@ async def create_student(
         paid_amount=0.0
     )
     
-    doc = student.model_dump()
-    doc["created_at"] = doc["created_at"].isoformat()
+    doc = document_codec_service.encode(student)
     
     await db.students.insert_one(doc)
-    
-    # Create student user account
-    user_data = UserCreate(
-        email=student.email,
-        password="Student@123",  # Static temporary password
-        name=student.name,
-        role=UserRole.STUDENT,
-        phone=student.phone,
-        whatsapp=student.whatsapp,
-        institute_id=student.institute_id,
-        must_change_password=True
+    await institute_stats_service.increment(
+        db, student.institute_id, total_students=1, pending_fees=student.total_fees
     )
+    await batch_activity_service.touch(db, student.batch_id)
+    principal_scope_service.invalidate_email(student.email)
+    await collection_version_service.bump(db, student.institute_id, "students", "users")
     
-    # Check if user already exists
+    # Create student user account, pending activation (temporary password works on first login)
     existing = await db.users.find_one({"email": student.email})
     if not existing:
-        user_dict = user_data.model_dump()
-        hashed_pw = hash_password(user_dict.pop("password"))
-        user = User(**user_dict)
-        user_doc = user.model_dump()
-        user_doc["password"] = hashed_pw
-        user_doc["created_at"] = user_doc["created_at"].isoformat()
+        user_doc, activation_token = build_student_user_document(student)
         await db.users.insert_one(user_doc)
+        background_tasks.add_task(
+            notification_service.send_email,
+            student.email,
+            "Activate your TutorHub account",
+            f"Your activation code: {activation_token}"
+        )
     
     # Blueprint: Send WhatsApp welcome message
     # await notification_service.send_whatsapp(student.phone, f"Welcome to {batch['name']}!")
     
     return student
 
-@api_router.post("/students/upload-excel")
+@api_router.post("/students/upload-excel", status_code=status.HTTP_202_ACCEPTED)
 async def upload_students_excel(
     file: UploadFile = File(...),
     batch_id: str = None,
     current_user: dict = Depends(require_role([UserRole.ADMIN]))
 ):
-    """Upload students via Excel file"""
-    try:
-        contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
-        
-        # Expected columns: name, email, phone, whatsapp, total_fees
-        required_cols = ["name", "email", "phone"]
-        if not all(col in df.columns for col in required_cols):
-            raise HTTPException(status_code=400, detail=f"Excel must have columns: {required_cols}")
-        
-        if not batch_id:
-            raise HTTPException(status_code=400, detail="batch_id is required")
-        
-        batch = await db.batches.find_one({"id": batch_id}, {"_id": 0})
-        if not batch:
-            raise HTTPException(status_code=404, detail="Batch not found")
+    """Upload students via Excel file; rows are imported by a background job"""
+    if not batch_id:
+        raise HTTPException(status_code=400, detail="batch_id is required")
+    
+    batch = await db.batches.find_one({"id": batch_id}, {"_id": 0})
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    institute_id = current_user["institute_id"] or current_user["id"]
+    
+    async def import_rows(row_batches):
+        report = await student_import_service.import_students(row_batches, batch, institute_id)
         
-        students_created = []
+        await institute_stats_service.increment(
+            db, institute_id,
+            total_students=report["created"],
+            pending_fees=report.pop("total_fees")
+        )
+        if report["created"]:
+            await batch_activity_service.touch(db, batch_id)
+            principal_scope_service.invalidate_role(UserRole.STUDENT)
+            await collection_version_service.bump(db, institute_id, "students", "users")
         
-        for _, row in df.iterrows():
-            student = Student(
-                name=str(row["name"]),
-                email=str(row["email"]),
-                phone=str(row["phone"]),
-                whatsapp=str(row.get("whatsapp", row["phone"])),
-                batch_id=batch_id,
-                batch_name=batch["name"],
-                total_fees=float(row.get("total_fees", 0.0)),
-                paid_amount=0.0,
-                institute_id=current_user["institute_id"] or current_user["id"]
+        # New accounts are pending activation - no per-row password hashing
+        for email, activation_token in report.pop("activations"):
+            await notification_service.send_email(
+                email,
+                "Activate your TutorHub account",
+                f"Your activation code: {activation_token}"
             )
-            
-            doc = student.model_dump()
-            doc["created_at"] = doc["created_at"].isoformat()
-            
-            await db.students.insert_one(doc)
-            students_created.append(student.name)
-            
-            # Create user account
-            existing = await db.users.find_one({"email": student.email})
-            if not existing:
-                user_data = UserCreate(
-                    email=student.email,
-                    password="Student@123",
-                    name=student.name,
-                    role=UserRole.STUDENT,
-                    phone=student.phone,
-                    whatsapp=student.whatsapp,
-                    institute_id=student.institute_id,
-                    must_change_password=True
-                )
-                user_dict = user_data.model_dump()
-                hashed_pw = hash_password(user_dict.pop("password"))
-                user = User(**user_dict)
-                user_doc = user.model_dump()
-                user_doc["password"] = hashed_pw
-                user_doc["created_at"] = user_doc["created_at"].isoformat()
-                await db.users.insert_one(user_doc)
-        
-        return {"message": f"Successfully added {len(students_created)} students", "students": students_created}
+        return report
     
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    # Expected columns: name, email, phone, whatsapp, total_fees
+    required_cols = ["name", "email", "phone"]
+    return await start_import_job(
+        file, ImportJobKindEnum.STUDENTS, required_cols, f"Excel must have columns: {required_cols}",
+        import_rows, current_user, batch_id
+    )
 
 @api_router.get("/students", response_model=List[Student])
-async def get_students(batch_id: Optional[str] = None, current_user: dict = Depends(get_current_user)):
-    query = {}
-    
-    if batch_id:
-        query["batch_id"] = batch_id
-    elif current_user["role"] == UserRole.TUTOR:
-        # Get batches assigned to tutor
-        batches = await db.batches.find({"tutor_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-        batch_ids = [b["id"] for b in batches]
-        query["batch_id"] = {"$in": batch_ids}
-    elif current_user["role"] == UserRole.STUDENT:
-        query["email"] = current_user["email"]
-    else:
-        institute_id = current_user["institute_id"] or current_user["id"]
-        query["institute_id"] = institute_id
-    
-    students = await db.students.find(query, {"_id": 0}).to_list(1000)
-    
-    for student in students:
-        if isinstance(student["created_at"], str):
-            student["created_at"] = datetime.fromisoformat(student["created_at"])
+async def get_students(
+    response: Response,
+    batch_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    query = await build_students_query(current_user, batch_id)
     
-    return students
+    return await paginate_collection(
+        response, db.students, query, "name", ASCENDING, limit, cursor, include_total,
+        model=Student, stream=stream
+    )
 
 @api_router.get("/students/{student_id}", response_model=Student)
 async def get_student(student_id: str, current_user: dict = Depends(get_current_user)):
@@ -818,9 +1126,6 @@ async def get_student(student_id: str, current_user: dict = Depends(get_current_
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    if isinstance(student["created_at"], str):
-        student["created_at"] = datetime.fromisoformat(student["created_at"])
-    
     return Student(**student)
 
 @api_router.put("/students/{student_id}")
@@ -840,17 +1145,46 @@ async def update_student(
         if batch:
             update_data["batch_name"] = batch["name"]
     
+    # Keep the previous email so the linked user account can be found afterwards
+    previous = await db.students.find_one(
+        {"id": student_id},
+        {"_id": 0, "email": 1, "institute_id": 1, "total_fees": 1, "batch_id": 1}
+    )
+    
     result = await db.students.update_one({"id": student_id}, {"$set": update_data})
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Student not found")
     
+    await batch_activity_service.touch(
+        db, [update_data.get("batch_id"), previous.get("batch_id") if previous else None]
+    )
+    if ("batch_id" in update_data or "email" in update_data) and previous:
+        principal_scope_service.invalidate_email(previous["email"], update_data.get("email"))
+    if previous:
+        await collection_version_service.bump(db, previous.get("institute_id"), "students")
+    
+    if "total_fees" in update_data:
+        await payment_ledger_service.refresh_status(student_id)
+    
+    if "total_fees" in update_data and previous:
+        await institute_stats_service.increment(
+            db, previous.get("institute_id"),
+            pending_fees=update_data["total_fees"] - previous.get("total_fees", 0.0)
+        )
+    
     # Also update user account if email changed
-    if "email" in update_data:
-        await db.users.update_one(
-            {"email": (await db.students.find_one({"id": student_id}))["email"], "role": UserRole.STUDENT},
-            {"$set": {"email": update_data["email"]}}
+    if previous and update_data.get("email", previous["email"]) != previous["email"]:
+        # Tokens carry the email as a claim, so the change revokes them
+        user = await db.users.find_one_and_update(
+            {"email": previous["email"], "role": UserRole.STUDENT},
+            token_version_registry_service.add_version_bump({"$set": {"email": update_data["email"]}}),
+            projection={"_id": 0, "id": 1, "token_version": 1},
+            return_document=ReturnDocument.AFTER
         )
+        principal_cache_service.invalidate_email(previous["email"])
+        if user:
+            token_version_registry_service.register(user["id"], user["token_version"])
     
     return {"message": "Student updated successfully"}
 
@@ -864,10 +1198,24 @@ async def delete_student(
         raise HTTPException(status_code=404, detail="Student not found")
     
     # Delete student record
-    await db.students.delete_one({"id": student_id})
+    result = await db.students.delete_one({"id": student_id})
+    if result.deleted_count:
+        await institute_stats_service.increment(
+            db, student["institute_id"], total_students=-1,
+            pending_fees=-(student["total_fees"] - student["paid_amount"])
+        )
+        await batch_activity_service.touch(db, student["batch_id"])
+        await collection_version_service.bump(db, student["institute_id"], "students", "users")
     
     # Delete user account
-    await db.users.delete_one({"email": student["email"], "role": UserRole.STUDENT})
+    user = await db.users.find_one_and_delete(
+        {"email": student["email"], "role": UserRole.STUDENT},
+        projection={"_id": 0, "id": 1}
+    )
+    principal_cache_service.invalidate_email(student["email"])
+    principal_scope_service.invalidate_email(student["email"])
+    if user:
+        await token_version_registry_service.revoke(db, user["id"])
     
     return {"message": "Student deleted successfully"}
 
@@ -876,20 +1224,16 @@ async def delete_student(
 @api_router.post("/enquiries", response_model=Enquiry)
 async def create_enquiry(enquiry_data: EnquiryCreate):
     """Public endpoint for website enquiries"""
-    # For public enquiries, we need to determine institute_id
-    # For now, use a default or first admin found
-    admin = await db.users.find_one({"role": UserRole.ADMIN}, {"_id": 0})
-    institute_id = admin["id"] if admin else "default"
+    # Public enquiries go to the first admin's institute (cached lookup)
+    institute_id = await enquiry_intake_service.resolve_institute(db)
     
     enquiry = Enquiry(
         **enquiry_data.model_dump(),
         institute_id=institute_id
     )
     
-    doc = enquiry.model_dump()
-    doc["created_at"] = doc["created_at"].isoformat()
-    
-    await db.enquiries.insert_one(doc)
+    # Buffered and written in batches by the intake flusher
+    await enquiry_intake_service.submit(db, document_codec_service.encode(enquiry))
     
     return enquiry
 
@@ -897,8 +1241,7 @@ async def create_enquiry(enquiry_data: EnquiryCreate):
 async def contact_form(contact_data: dict):
     """Public endpoint for contact form submissions"""
     # Store in enquiries collection
-    admin = await db.users.find_one({"role": UserRole.ADMIN}, {"_id": 0})
-    institute_id = admin["id"] if admin else "default"
+    institute_id = await enquiry_intake_service.resolve_institute(db)
     
     enquiry = Enquiry(
         id=str(uuid.uuid4()),
@@ -911,16 +1254,18 @@ async def contact_form(contact_data: dict):
         institute_id=institute_id
     )
     
-    doc = enquiry.model_dump()
-    doc["created_at"] = doc["created_at"].isoformat()
-    
-    await db.enquiries.insert_one(doc)
+    await enquiry_intake_service.submit(db, document_codec_service.encode(enquiry))
     
     return {"message": "Contact form submitted successfully", "id": enquiry.id}
 
 @api_router.get("/enquiries", response_model=List[Enquiry])
 async def get_enquiries(
+    response: Response,
     status: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
     current_user: dict = Depends(require_role([UserRole.ADMIN]))
 ):
     institute_id = current_user["institute_id"] or current_user["id"]
@@ -929,13 +1274,10 @@ async def get_enquiries(
     if status:
         query["status"] = status
     
-    enquiries = await db.enquiries.find(query, {"_id": 0}).to_list(1000)
-    
-    for enq in enquiries:
-        if isinstance(enq["created_at"], str):
-            enq["created_at"] = datetime.fromisoformat(enq["created_at"])
-    
-    return enquiries
+    return await paginate_collection(
+        response, db.enquiries, query, "created_at", DESCENDING, limit, cursor, include_total,
+        model=Enquiry, stream=stream
+    )
 
 @api_router.patch("/enquiries/{enquiry_id}")
 async def update_enquiry_status(
@@ -988,8 +1330,7 @@ async def create_invite(
         institute_id=current_user["institute_id"] or current_user["id"]
     )
     
-    doc = invite.model_dump()
-    doc["created_at"] = doc["created_at"].isoformat()
+    doc = document_codec_service.encode(invite)
     
     await db.invites.insert_one(doc)
     
@@ -1003,15 +1344,21 @@ async def create_invite(
     return invite
 
 @api_router.get("/invites", response_model=List[Invite])
-async def get_invites(current_user: dict = Depends(require_role([UserRole.ADMIN]))):
+async def get_invites(
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
+    current_user: dict = Depends(require_role([UserRole.ADMIN]))
+):
     institute_id = current_user["institute_id"] or current_user["id"]
-    invites = await db.invites.find({"institute_id": institute_id}, {"_id": 0}).to_list(1000)
-    
-    for invite in invites:
-        if isinstance(invite["created_at"], str):
-            invite["created_at"] = datetime.fromisoformat(invite["created_at"])
     
-    return invites
+    return await paginate_collection(
+        response, db.invites, {"institute_id": institute_id}, "created_at", DESCENDING,
+        limit, cursor, include_total,
+        model=Invite, stream=stream
+    )
 
 @api_router.post("/invites/accept/{invite_code}")
 async def accept_invite(invite_code: str, password: str):
@@ -1036,68 +1383,49 @@ async def accept_invite(invite_code: str, password: str):
     )
     
     user_dict = user_data.model_dump()
-    hashed_pw = hash_password(user_dict.pop("password"))
+    hashed_pw = await hash_password(user_dict.pop("password"))
     
     user = User(**user_dict)
-    doc = user.model_dump()
+    doc = document_codec_service.encode(user)
     doc["password"] = hashed_pw
-    doc["created_at"] = doc["created_at"].isoformat()
     
     await db.users.insert_one(doc)
+    token_version_registry_service.register(user.id)
+    if user.role == UserRole.TUTOR:
+        await institute_stats_service.increment(db, user.institute_id, total_tutors=1)
+        await collection_version_service.bump(db, user.institute_id, "users")
     
     # Update invite status
     await db.invites.update_one({"id": invite["id"]}, {"$set": {"status": "accepted"}})
     
     # Create token
-    token = create_access_token({"sub": user.id, "role": user.role})
-    
-    if isinstance(doc["created_at"], str):
-        doc["created_at"] = datetime.fromisoformat(doc["created_at"])
+    token = create_user_access_token(doc)
     
     return Token(access_token=token, token_type="bearer", user=User(**doc))
 
-@api_router.post("/invites/bulk")
+@api_router.post("/invites/bulk", status_code=status.HTTP_202_ACCEPTED)
 async def bulk_invite_students(
     batch_id: str,
     file: UploadFile = File(...),
     current_user: dict = Depends(require_role([UserRole.ADMIN]))
 ):
-    """Bulk invite students for a batch via CSV"""
+    """Bulk invite students for a batch via CSV; invites are created by a background job"""
     batch = await db.batches.find_one({"id": batch_id}, {"_id": 0})
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     
-    try:
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
-        
-        if "email" not in df.columns:
-            raise HTTPException(status_code=400, detail="CSV must have 'email' column")
-        
-        invites_created = []
-        
-        for _, row in df.iterrows():
-            email = str(row["email"]).strip()
-            
-            invite = Invite(
-                email=email,
-                role=UserRole.STUDENT,
-                batch_id=batch_id,
-                batch_name=batch["name"],
-                invite_code=generate_invite_code(),
-                institute_id=current_user["institute_id"] or current_user["id"]
-            )
-            
-            doc = invite.model_dump()
-            doc["created_at"] = doc["created_at"].isoformat()
-            
-            await db.invites.insert_one(doc)
-            invites_created.append(email)
-        
-        return {"message": f"Successfully sent {len(invites_created)} invites", "emails": invites_created}
+    async def import_rows(row_batches):
+        return await bulk_invite_service.create_invites(
+            row_batches,
+            UserRole.STUDENT,
+            current_user["institute_id"] or current_user["id"],
+            batch
+        )
     
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return await start_import_job(
+        file, ImportJobKindEnum.INVITES, ["email"], "CSV must have 'email' column",
+        import_rows, current_user, batch_id
+    )
 
 # ============ CLASS SCHEDULE CSV UPLOAD ============
 
@@ -1143,13 +1471,15 @@ async def download_invites_sample_csv():
         headers={"Content-Disposition": "attachment; filename=bulk_invites_sample.csv"}
     )
 
-@api_router.post("/schedule/upload-csv")
+@api_router.post("/schedule/upload-csv", status_code=status.HTTP_202_ACCEPTED)
 async def upload_class_schedule(
+    response: Response,
     file: UploadFile = File(...),
     batch_id: str = None,
+    dry_run: bool = False,
     current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.TUTOR]))
 ):
-    """Upload class schedule via CSV - dates are optional"""
+    """Upload class schedule via CSV - dates are optional; dry_run previews without saving"""
     if not batch_id:
         raise HTTPException(status_code=400, detail="batch_id is required")
     
@@ -1157,47 +1487,54 @@ async def upload_class_schedule(
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     
-    try:
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
-        
-        required_cols = ["time"]
-        if not all(col in df.columns for col in required_cols):
-            raise HTTPException(status_code=400, detail="CSV must have 'time' column at minimum")
+    institute_id = current_user["institute_id"] or current_user["id"]
+    required_cols = ["time"]
+    missing_columns_detail = "CSV must have 'time' column at minimum"
+    
+    if not dry_run:
+        async def import_rows(row_batches):
+            report = await class_schedule_service.import_rows(row_batches, batch, institute_id)
+            if report["valid"]:
+                await batch_activity_service.touch(db, batch_id)
+                await collection_version_service.bump(db, institute_id, "classes")
+            return report
         
-        classes_created = []
-        current_date = datetime.now(timezone.utc)
+        return await start_import_job(
+            file, ImportJobKindEnum.SCHEDULE, required_cols, missing_columns_detail,
+            import_rows, current_user, batch_id
+        )
+    
+    # Dry runs write nothing, so the preview is returned directly
+    response.status_code = status.HTTP_200_OK
+    try:
+        columns, rows, _ = await run_in_threadpool(upload_ingestion_service.open_rows, file)
         
-        for idx, row in df.iterrows():
-            # If date provided, use it; otherwise auto-schedule for next day
-            if "date" in df.columns and pd.notna(row["date"]):
-                class_date = datetime.strptime(str(row["date"]), "%Y-%m-%d")
-            else:
-                # Auto-schedule for the next day
-                class_date = current_date + timedelta(days=idx + 1)
-            
-            class_schedule = ClassSchedule(
-                batch_id=batch_id,
-                batch_name=batch["name"],
-                class_date=class_date,
-                class_time=str(row["time"]),
-                topic=str(row.get("topic", "")) if pd.notna(row.get("topic")) else None,
-                tutor_id=batch["tutor_id"],
-                institute_id=current_user["institute_id"] or current_user["id"]
-            )
-            
-            doc = class_schedule.model_dump()
-            doc["class_date"] = doc["class_date"].isoformat()
-            doc["created_at"] = doc["created_at"].isoformat()
-            
-            await db.classes.insert_one(doc)
-            classes_created.append(class_schedule.id)
+        if not all(col in columns for col in required_cols):
+            raise HTTPException(status_code=400, detail=missing_columns_detail)
         
-        return {"message": f"Successfully created {len(classes_created)} classes", "class_ids": classes_created}
+        report = await class_schedule_service.import_rows(
+            upload_ingestion_service.iter_batches(rows), batch, institute_id, dry_run=True
+        )
+        return {"message": f"{report['valid']} classes ready, {report['invalid']} rows need fixing", **report}
     
+    except HTTPException:
+        raise
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@api_router.get("/imports/{job_id}")
+async def get_import_job(
+    job_id: str,
+    current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.TUTOR]))
+):
+    """Get progress, row errors and final counts of an import job"""
+    job = await import_job_service.get_job(db, job_id, current_user["institute_id"] or current_user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
 @api_router.post("/schedule/generate-recurring")
 async def generate_recurring_schedule(
     batch_id: str,
@@ -1212,33 +1549,29 @@ async def generate_recurring_schedule(
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    
-    classes_created = []
-    current_date = start
-    
-    while current_date <= end:
-        if current_date.weekday() in days_of_week:
-            class_schedule = ClassSchedule(
-                batch_id=batch_id,
-                batch_name=batch["name"],
-                class_date=current_date,
-                class_time=class_time,
-                tutor_id=batch["tutor_id"],
-                institute_id=current_user["institute_id"] or current_user["id"]
-            )
-            
-            doc = class_schedule.model_dump()
-            doc["class_date"] = doc["class_date"].isoformat()
-            doc["created_at"] = doc["created_at"].isoformat()
-            
-            await db.classes.insert_one(doc)
-            classes_created.append(current_date.strftime("%Y-%m-%d"))
-        
-        current_date += timedelta(days=1)
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        result = await class_schedule_service.generate_recurring(
+            batch,
+            start,
+            end,
+            days_of_week,
+            class_time,
+            current_user["institute_id"] or current_user["id"]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return {"message": f"Successfully created {len(classes_created)} recurring classes", "dates": classes_created}
+    if result["created"]:
+        await batch_activity_service.touch(db, batch_id)
+        await collection_version_service.bump(db, batch["institute_id"], "classes")
+    
+    return {
+        "message": f"Successfully created {len(result['created'])} recurring classes",
+        "dates": result["created"],
+        "skipped_dates": result["skipped"]
+    }
 
 @api_router.patch("/classes/{class_id}/mark-absent")
 async def mark_class_absent(
@@ -1270,14 +1603,16 @@ async def mark_class_absent(
             notes="Rescheduled from cancelled class"
         )
         
-        doc = new_class.model_dump()
-        doc["class_date"] = doc["class_date"].isoformat()
-        doc["created_at"] = doc["created_at"].isoformat()
+        doc = document_codec_service.encode(new_class)
         
         await db.classes.insert_one(doc)
+        await batch_activity_service.touch(db, class_item["batch_id"])
+        await collection_version_service.bump(db, class_item["institute_id"], "classes")
         
         return {"message": "Class marked absent and rescheduled", "new_class_id": new_class.id}
     
+    await batch_activity_service.touch(db, class_item["batch_id"])
+    await collection_version_service.bump(db, class_item["institute_id"], "classes")
     return {"message": "Class marked as absent"}
 
 # ============ PAYMENT ROUTES ============
@@ -1299,27 +1634,18 @@ async def create_payment(
         student_name=student["name"]
     )
     
-    doc = payment.model_dump()
-    doc["payment_date"] = doc["payment_date"].isoformat()
-    doc["created_at"] = doc["created_at"].isoformat()
+    doc = document_codec_service.encode(payment)
     
     await db.payments.insert_one(doc)
-    
-    # Update student payment status
-    new_paid = student["paid_amount"] + payment.amount
-    total = student["total_fees"]
-    
-    status = "unpaid"
-    if new_paid >= total:
-        status = "paid"
-    elif new_paid > 0:
-        status = "partial"
-    
-    await db.students.update_one(
-        {"id": payment_data.student_id},
-        {"$set": {"paid_amount": new_paid, "payment_status": status}}
+    await institute_stats_service.increment(
+        db, payment.institute_id, total_revenue=payment.amount, pending_fees=-payment.amount
     )
     
+    # Update student payment status atomically - concurrent payments must not overwrite each other
+    await payment_ledger_service.apply_payment(payment_data.student_id, payment.amount)
+    await batch_activity_service.touch(db, student["batch_id"])
+    await collection_version_service.bump(db, payment.institute_id, "payments", "students")
+    
     # Blueprint: Send receipt via WhatsApp/Email
     # background_tasks.add_task(notification_service.send_whatsapp, student["phone"], f"Payment of ₹{payment.amount} received")
     
@@ -1327,37 +1653,21 @@ async def create_payment(
 
 @api_router.get("/payments", response_model=List[Payment])
 async def get_payments(
+    response: Response,
     student_id: Optional[str] = None,
     batch_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    
-    if student_id:
-        query["student_id"] = student_id
-    elif batch_id:
-        query["batch_id"] = batch_id
-    elif current_user["role"] == UserRole.STUDENT:
-        student = await db.students.find_one({"email": current_user["email"]}, {"_id": 0})
-        if student:
-            query["student_id"] = student["id"]
-    elif current_user["role"] == UserRole.TUTOR:
-        batches = await db.batches.find({"tutor_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-        batch_ids = [b["id"] for b in batches]
-        query["batch_id"] = {"$in": batch_ids}
-    else:
-        institute_id = current_user["institute_id"] or current_user["id"]
-        query["institute_id"] = institute_id
-    
-    payments = await db.payments.find(query, {"_id": 0}).to_list(1000)
+    query = await build_payments_query(current_user, student_id, batch_id)
     
-    for payment in payments:
-        if isinstance(payment["payment_date"], str):
-            payment["payment_date"] = datetime.fromisoformat(payment["payment_date"])
-        if isinstance(payment["created_at"], str):
-            payment["created_at"] = datetime.fromisoformat(payment["created_at"])
-    
-    return payments
+    return await paginate_collection(
+        response, db.payments, query, "payment_date", DESCENDING, limit, cursor, include_total,
+        model=Payment, stream=stream
+    )
 
 # ============ CLASS SCHEDULE ROUTES ============
 
@@ -1378,11 +1688,11 @@ async def create_class(
         institute_id=current_user["institute_id"] or current_user["id"]
     )
     
-    doc = class_schedule.model_dump()
-    doc["class_date"] = doc["class_date"].isoformat()
-    doc["created_at"] = doc["created_at"].isoformat()
+    doc = document_codec_service.encode(class_schedule)
     
     await db.classes.insert_one(doc)
+    await batch_activity_service.touch(db, class_schedule.batch_id)
+    await collection_version_service.bump(db, class_schedule.institute_id, "classes")
     
     # Blueprint: Send class reminders
     # students = await db.students.find({"batch_id": batch["id"]}, {"_id": 0}).to_list(1000)
@@ -1393,38 +1703,21 @@ async def create_class(
 
 @api_router.get("/classes", response_model=List[ClassSchedule])
 async def get_classes(
+    response: Response,
     batch_id: Optional[str] = None,
     date: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    
-    if batch_id:
-        query["batch_id"] = batch_id
-    elif current_user["role"] == UserRole.TUTOR:
-        query["tutor_id"] = current_user["id"]
-    elif current_user["role"] == UserRole.STUDENT:
-        student = await db.students.find_one({"email": current_user["email"]}, {"_id": 0})
-        if student:
-            query["batch_id"] = student["batch_id"]
-    else:
-        institute_id = current_user["institute_id"] or current_user["id"]
-        query["institute_id"] = institute_id
+    query = await build_classes_query(current_user, batch_id, date)
     
-    if date:
-        # Filter by date
-        date_obj = datetime.fromisoformat(date)
-        query["class_date"] = date_obj.isoformat()
-    
-    classes = await db.classes.find(query, {"_id": 0}).to_list(1000)
-    
-    for cls in classes:
-        if isinstance(cls["class_date"], str):
-            cls["class_date"] = datetime.fromisoformat(cls["class_date"])
-        if isinstance(cls["created_at"], str):
-            cls["created_at"] = datetime.fromisoformat(cls["created_at"])
-    
-    return classes
+    return await paginate_collection(
+        response, db.classes, query, "class_date", ASCENDING, limit, cursor, include_total,
+        model=ClassSchedule, stream=stream
+    )
 
 @api_router.patch("/classes/{class_id}")
 async def update_class(
@@ -1439,7 +1732,7 @@ async def update_class(
     if status:
         update_data["status"] = status
     if class_date:
-        update_data["class_date"] = class_date.isoformat()
+        update_data["class_date"] = document_codec_service.normalize_datetime(class_date)
     if class_time:
         update_data["class_time"] = class_time
     if topic:
@@ -1448,11 +1741,18 @@ async def update_class(
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    result = await db.classes.update_one({" id": class_id}, {"$set": update_data})
+    class_item = await db.classes.find_one_and_update(
+        {"id": class_id},
+        {"$set": update_data},
+        projection={"_id": 0, "batch_id": 1, "institute_id": 1}
+    )
     
-    if result.modified_count == 0:
+    if class_item is None:
         raise HTTPException(status_code=404, detail="Class not found")
     
+    await batch_activity_service.touch(db, class_item["batch_id"])
+    await collection_version_service.bump(db, class_item["institute_id"], "classes")
+    
     return {"message": "Class updated successfully"}
 
 # ============ STUDY MATERIAL ROUTES ============
@@ -1474,56 +1774,40 @@ async def create_material(
         institute_id=current_user["institute_id"] or current_user["id"]
     )
     
-    doc = material.model_dump()
-    doc["created_at"] = doc["created_at"].isoformat()
-    if doc["expiry_date"]:
-        doc["expiry_date"] = doc["expiry_date"].isoformat()
+    doc = document_codec_service.encode(material)
     
     await db.materials.insert_one(doc)
+    await batch_activity_service.touch(db, material.batch_id)
+    await collection_version_service.bump(db, material.institute_id, "materials")
     
     return material
 
 @api_router.get("/materials", response_model=List[StudyMaterial])
 async def get_materials(
+    response: Response,
     batch_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    
     if batch_id:
-        query["batch_id"] = batch_id
-    elif current_user["role"] == UserRole.STUDENT:
-        student = await db.students.find_one({"email": current_user["email"]}, {"_id": 0})
-        if student:
-            query["batch_id"] = student["batch_id"]
-    elif current_user["role"] == UserRole.TUTOR:
-        batches = await db.batches.find({"tutor_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-        batch_ids = [b["id"] for b in batches]
-        query["batch_id"] = {"$in": batch_ids}
+        query = {"batch_id": batch_id}
     else:
-        institute_id = current_user["institute_id"] or current_user["id"]
-        query["institute_id"] = institute_id
-    
-    materials = await db.materials.find(query, {"_id": 0}).to_list(1000)
-    
+        query = await principal_scope_service.build_query(db, current_user, "materials")
+
     # Filter out expired materials for students
-    now = datetime.now(timezone.utc)
-    filtered_materials = []
-    
-    for material in materials:
-        if isinstance(material["created_at"], str):
-            material["created_at"] = datetime.fromisoformat(material["created_at"])
-        if material.get("expiry_date") and isinstance(material["expiry_date"], str):
-            material["expiry_date"] = datetime.fromisoformat(material["expiry_date"])
-        
-        # Only filter for students
-        if current_user["role"] == UserRole.STUDENT:
-            if not material.get("expiry_date") or material["expiry_date"] > now:
-                filtered_materials.append(material)
-        else:
-            filtered_materials.append(material)
-    
-    return filtered_materials
+    if current_user["role"] == UserRole.STUDENT:
+        query["$or"] = [
+            {"expiry_date": None},
+            {"expiry_date": {"$gt": datetime.now(timezone.utc)}}
+        ]
+
+    return await paginate_collection(
+        response, db.materials, query, "created_at", DESCENDING, limit, cursor, include_total,
+        model=StudyMaterial, stream=stream
+    )
 
 # ============ HOMEWORK ROUTES ============
 
@@ -1543,42 +1827,32 @@ async def create_homework(
         institute_id=current_user["institute_id"] or current_user["id"]
     )
     
-    doc = homework.model_dump()
-    doc["due_date"] = doc["due_date"].isoformat()
-    doc["created_at"] = doc["created_at"].isoformat()
+    doc = document_codec_service.encode(homework)
     
     await db.homework.insert_one(doc)
+    await collection_version_service.bump(db, homework.institute_id, "homework")
     
     return homework
 
 @api_router.get("/homework", response_model=List[Homework])
 async def get_homework(
+    response: Response,
     batch_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    stream: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    query = {}
-    
     if batch_id:
-        query["batch_id"] = batch_id
-    elif current_user["role"] == UserRole.STUDENT:
-        student = await db.students.find_one({"email": current_user["email"]}, {"_id": 0})
-        if student:
-            query["batch_id"] = student["batch_id"]
-    elif current_user["role"] == UserRole.TUTOR:
-        query["tutor_id"] = current_user["id"]
+        query = {"batch_id": batch_id}
     else:
-        institute_id = current_user["institute_id"] or current_user["id"]
-        query["institute_id"] = institute_id
+        query = await principal_scope_service.build_query(db, current_user, "homework")
     
-    homework_list = await db.homework.find(query, {"_id": 0}).to_list(1000)
-    
-    for hw in homework_list:
-        if isinstance(hw["due_date"], str):
-            hw["due_date"] = datetime.fromisoformat(hw["due_date"])
-        if isinstance(hw["created_at"], str):
-            hw["created_at"] = datetime.fromisoformat(hw["created_at"])
-    
-    return homework_list
+    return await paginate_collection(
+        response, db.homework, query, "due_date", ASCENDING, limit, cursor, include_total,
+        model=Homework, stream=stream
+    )
 
 @api_router.post("/homework/submit", response_model=HomeworkSubmission)
 async def submit_homework(
@@ -1598,10 +1872,10 @@ async def submit_homework(
         institute_id=current_user["institute_id"] or current_user["id"]
     )
     
-    doc = submission.model_dump()
-    doc["submitted_at"] = doc["submitted_at"].isoformat()
+    doc = document_codec_service.encode(submission)
     
     await db.homework_submissions.insert_one(doc)
+    await collection_version_service.bump(db, submission.institute_id, "homework_submissions")
     
     return submission
 
@@ -1612,10 +1886,6 @@ async def get_homework_submissions(
 ):
     submissions = await db.homework_submissions.find({"homework_id": homework_id}, {"_id": 0}).to_list(1000)
     
-    for sub in submissions:
-        if isinstance(sub["submitted_at"], str):
-            sub["submitted_at"] = datetime.fromisoformat(sub["submitted_at"])
-    
     return submissions
 
 @api_router.patch("/homework/submissions/{submission_id}")
@@ -1634,8 +1904,60 @@ async def update_submission(
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Submission not found")
     
+    await collection_version_service.bump(db, current_user["institute_id"] or current_user["id"], "homework_submissions")
+    
     return {"message": "Submission updated successfully"}
 
+# ============ EXPORT ROUTES ============
+
+STUDENT_EXPORT_COLUMNS = ["name", "email", "phone", "whatsapp", "batch_name", "total_fees", "paid_amount", "payment_status", "created_at"]
+PAYMENT_EXPORT_COLUMNS = ["payment_date", "student_name", "amount", "payment_mode", "receipt_number", "notes", "batch_id", "student_id"]
+CLASS_EXPORT_COLUMNS = ["class_date", "class_time", "batch_name", "topic", "status", "notes"]
+ENQUIRY_EXPORT_COLUMNS = ["created_at", "name", "email", "phone", "whatsapp", "interested_subject", "status", "notes"]
+
+@api_router.get("/exports/students")
+async def export_students(
+    export_format: str = Query("csv", alias="format"),
+    batch_id: Optional[str] = None,
+    current_user: dict = Depends(require_role([UserRole.ADMIN, UserRole.TUTOR]))
+):
+    """Export students as CSV or Excel"""
+    query = await build_students_query(current_user, batch_id)
+    return export_collection(db.students, query, "name", ASCENDING, STUDENT_EXPORT_COLUMNS, export_format, "students")
+
+@api_router.get("/exports/payments")
+async def export_payments(
+    export_format: str = Query("csv", alias="format"),
+    student_id: Optional[str] = None,
+    batch_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Export payment history as CSV or Excel"""
+    query = await build_payments_query(current_user, student_id, batch_id)
+    return export_collection(db.payments, query, "payment_date", DESCENDING, PAYMENT_EXPORT_COLUMNS, export_format, "payments")
+
+@api_router.get("/exports/classes")
+async def export_classes(
+    export_format: str = Query("csv", alias="format"),
+    batch_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Export the class schedule as CSV or Excel"""
+    query = await build_classes_query(current_user, batch_id)
+    return export_collection(db.classes, query, "class_date", ASCENDING, CLASS_EXPORT_COLUMNS, export_format, "classes")
+
+@api_router.get("/exports/enquiries")
+async def export_enquiries(
+    export_format: str = Query("csv", alias="format"),
+    status: Optional[str] = None,
+    current_user: dict = Depends(require_role([UserRole.ADMIN]))
+):
+    """Export enquiries as CSV or Excel"""
+    query = {"institute_id": current_user["institute_id"] or current_user["id"]}
+    if status:
+        query["status"] = status
+    return export_collection(db.enquiries, query, "created_at", DESCENDING, ENQUIRY_EXPORT_COLUMNS, export_format, "enquiries")
+
 # ============ DASHBOARD STATS ============
 
 @api_router.get("/dashboard/stats")
@@ -1643,75 +1965,44 @@ async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
     institute_id = current_user["institute_id"] or current_user["id"]
     
     if current_user["role"] == UserRole.ADMIN:
-        total_batches = await db.batches.count_documents({"institute_id": institute_id})
-        total_students = await db.students.count_documents({"institute_id": institute_id})
-        total_tutors = await db.users.count_documents({"institute_id": institute_id, "role": UserRole.TUTOR})
-        
-        # Revenue calculation
-        payments = await db.payments.find({"institute_id": institute_id}, {"_id": 0}).to_list(10000)
-        total_revenue = sum(p["amount"] for p in payments)
-        
-        # Pending fees
-        students = await db.students.find({"institute_id": institute_id}, {"_id": 0}).to_list(10000)
-        pending_fees = sum(s["total_fees"] - s["paid_amount"] for s in students)
-        
-        return {
-            "total_batches": total_batches,
-            "total_students": total_students,
-            "total_tutors": total_tutors,
-            "total_revenue": total_revenue,
-            "pending_fees": pending_fees
-        }
-    
-    elif current_user["role"] == UserRole.TUTOR:
-        batches = await db.batches.find({"tutor_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-        batch_ids = [b["id"] for b in batches]
-        
-        total_students = await db.students.count_documents({"batch_id": {"$in": batch_ids}})
-        
-        # Today's classes
-        today = datetime.now(timezone.utc).date()
-        today_classes = await db.classes.find({
-            "tutor_id": current_user["id"],
-            "class_date": {"$gte": datetime.combine(today, datetime.min.time()).isoformat()}
-        }, {"_id": 0}).to_list(1000)
-        
-        return {
-            "total_batches": len(batches),
-            "total_students": total_students,
-            "today_classes": len(today_classes)
-        }
+        return await institute_stats_service.get_statistics(db, institute_id, tutor_role=UserRole.TUTOR)
+    
+    scope = await principal_scope_service.resolve(db, current_user)
+    # The ETag comes from version counters on the primary; figures served
+    # under it must not lag behind them on a secondary
+    stats_db = db if CacheConfig.CONDITIONAL_GET_ENABLED else analytics_db
+    
+    if current_user["role"] == UserRole.TUTOR:
+        return await dashboard_statistics_service.tutor_statistics(
+            stats_db, current_user["id"], batch_ids=scope.batch_ids
+        )
     
     elif current_user["role"] == UserRole.STUDENT:
-        student = await db.students.find_one({"email": current_user["email"]}, {"_id": 0})
+        student = None
+        if scope.student_id:
+            student = await stats_db.students.find_one({"id": scope.student_id}, {"_id": 0})
         if not student:
             return {"message": "Student profile not found"}
         
-        # Today's classes
-        today = datetime.now(timezone.utc).date()
-        today_classes = await db.classes.find({
-            "batch_id": student["batch_id"],
-            "class_date": {"$gte": datetime.combine(today, datetime.min.time()).isoformat()}
-        }, {"_id": 0}).to_list(1000)
-        
-        # Pending homework
-        homework_list = await db.homework.find({"batch_id": student["batch_id"]}, {"_id": 0}).to_list(1000)
-        submissions = await db.homework_submissions.find({"student_id": student["id"]}, {"_id": 0}).to_list(1000)
-        submitted_hw_ids = {s["homework_id"] for s in submissions}
-        pending_homework = [hw for hw in homework_list if hw["id"] not in submitted_hw_ids]
-        
-        return {
-            "batch_name": student["batch_name"],
-            "payment_status": student["payment_status"],
-            "total_fees": student["total_fees"],
-            "paid_amount": student["paid_amount"],
-            "pending_amount": student["total_fees"] - student["paid_amount"],
-            "today_classes": len(today_classes),
-            "pending_homework": len(pending_homework)
-        }
+        return await dashboard_statistics_service.student_statistics(stats_db, student)
     
     return {}
 
+# ============ SYSTEM ROUTES ============
+
+@api_router.get("/system/metrics")
+async def get_system_metrics(current_user: dict = Depends(require_role([UserRole.ADMIN]))):
+    """In-process cache and runtime counters for this worker"""
+    return {
+        "principal_cache": principal_cache_service.get_statistics(),
+        "principal_scopes": principal_scope_service.get_statistics(),
+        "password_hashing": password_hashing_pool_service.get_statistics(),
+        "token_versions": token_version_registry_service.get_statistics(),
+        "enquiry_intake": enquiry_intake_service.get_statistics(),
+        "collection_versions": collection_version_service.get_statistics(),
+        "connection_pool": db_connection.pool_monitor.get_statistics()
+    }
+
 # ============ ROOT ============
 
 @api_router.get("/")
@@ -1721,12 +2012,72 @@ async def root():
 # Include router
 app.include_router(api_router)
 
+@app.exception_handler(EnquiryBufferFullError)
+async def enquiry_buffer_full_handler(request: Request, exc: EnquiryBufferFullError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(EnquiryConfig.RETRY_AFTER_SECONDS)}
+    )
+
+@app.exception_handler(HashingPoolSaturatedError)
+async def hashing_pool_saturated_handler(request: Request, exc: HashingPoolSaturatedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(SecurityConfig.PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+    )
+
+# Polled GET endpoints and the collections their responses are built from;
+# unchanged responses are answered with 304 by ConditionalGetMiddleware
+CONDITIONAL_GET_RESOURCES = {
+    "/api/batches": ("batches", "students"),
+    "/api/students": ("students", "batches"),
+    "/api/payments": ("payments", "students", "batches"),
+    "/api/classes": ("classes", "students", "batches"),
+    "/api/dashboard/stats": (
+        "batches", "students", "users", "payments", "classes", "homework", "homework_submissions", "institute_stats"
+    ),
+}
+
+async def resolve_request_principal(request: Request) -> Optional[dict]:
+    """Authenticated user of a request, or None - for middleware outside route dependencies"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+    except HTTPException:
+        return None
+
+app.add_middleware(
+    ConditionalGetMiddleware,
+    database=db,
+    resources=CONDITIONAL_GET_RESOURCES,
+    resolve_principal=resolve_request_principal,
+    enabled=CacheConfig.CONDITIONAL_GET_ENABLED,
+)
+
+# Paths whose responses are never compressed; import progress polls are
+# tiny and latency-sensitive
+UNCOMPRESSED_PATHS = ("/api/imports/",)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=CompressionConfig.MINIMUM_SIZE,
+    gzip_level=CompressionConfig.GZIP_LEVEL,
+    brotli_quality=CompressionConfig.BROTLI_QUALITY,
+    excluded_paths=UNCOMPRESSED_PATHS + tuple(CompressionConfig.EXCLUDED_PATHS),
+    enabled=CompressionConfig.ENABLED,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
 )
 
 logging.basicConfig(
@@ -1735,6 +2086,3 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
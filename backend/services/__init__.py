@@ -5,6 +5,50 @@ from services.auth_service import (
     invite_code_service,
     user_authentication_service
 )
+from services.principal_cache_service import principal_cache_service
+from services.scope_service import (
+    PrincipalScope,
+    principal_scope_service
+)
+from services.hashing_pool_service import (
+    HashingPoolSaturatedError,
+    password_hashing_pool_service
+)
+from services.account_activation_service import account_activation_service
+from services.token_version_service import (
+    TOKEN_CLAIM_FIELDS,
+    token_version_registry_service
+)
+from services.index_service import index_management_service
+from services.document_codec_service import document_codec_service
+from services.date_migration_service import date_migration_service
+from services.email_migration_service import email_migration_service
+from services.pagination_service import (
+    InvalidCursorError,
+    keyset_pagination_service
+)
+from services.streaming_service import document_stream_service
+from services.export_service import document_export_service
+from services.batch_activity_service import batch_activity_service
+from services.collection_version_service import collection_version_service
+from services.dashboard_service import dashboard_statistics_service
+from services.institute_stats_service import institute_stats_service
+from services.payment_ledger_service import payment_ledger_service
+from services.upload_service import (
+    UploadTooLargeError,
+    upload_ingestion_service
+)
+from services.student_import_service import student_import_service
+from services.invite_service import bulk_invite_service
+from services.schedule_service import class_schedule_service
+from services.enquiry_intake_service import (
+    EnquiryBufferFullError,
+    enquiry_intake_service
+)
+from services.import_job_service import (
+    ImportJobLimitError,
+    import_job_service
+)
 from services.user_service import user_management_service
 from services.batch_service import batch_management_service
 from services.student_service import student_management_service
@@ -16,6 +60,36 @@ __all__ = [
     "jwt_token_service",
     "invite_code_service",
     "user_authentication_service",
+    "principal_cache_service",
+    "PrincipalScope",
+    "principal_scope_service",
+    "HashingPoolSaturatedError",
+    "password_hashing_pool_service",
+    "account_activation_service",
+    "TOKEN_CLAIM_FIELDS",
+    "token_version_registry_service",
+    "index_management_service",
+    "document_codec_service",
+    "date_migration_service",
+    "email_migration_service",
+    "InvalidCursorError",
+    "keyset_pagination_service",
+    "document_stream_service",
+    "document_export_service",
+    "batch_activity_service",
+    "collection_version_service",
+    "dashboard_statistics_service",
+    "institute_stats_service",
+    "payment_ledger_service",
+    "UploadTooLargeError",
+    "upload_ingestion_service",
+    "student_import_service",
+    "bulk_invite_service",
+    "class_schedule_service",
+    "EnquiryBufferFullError",
+    "enquiry_intake_service",
+    "ImportJobLimitError",
+    "import_job_service",
     "user_management_service",
     "batch_management_service",
     "student_management_service",
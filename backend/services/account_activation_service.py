@@ -0,0 +1,143 @@
+"""Deferred credential provisioning for bulk-created accounts."""
+import hashlib
+import hmac
+import secrets
+from typing import Optional, Tuple
+
+from config import SecurityConfig
+from database import database
+from models import UserAccountStatusEnum
+from .hashing_pool_service import password_hashing_pool_service
+from .principal_cache_service import principal_cache_service
+
+class AccountActivationService:
+    """Creates accounts without a password hash and provisions it on first use.
+
+    Pending accounts store only a SHA-256 digest of a one-time activation
+    token. The bcrypt hash is computed when the user first logs in with the
+    temporary password or activates with the token, so bulk creation does
+    no password hashing at all.
+    """
+
+    @staticmethod
+    def hash_activation_token(activation_token: str) -> str:
+        """Digest an activation token for storage and lookup."""
+        return hashlib.sha256(activation_token.encode("utf-8")).hexdigest()
+
+    def build_pending_credentials(self) -> Tuple[str, dict]:
+        """Generate a one-time activation token and the credential fields to store.
+
+        Returns:
+            Tuple of the plain activation token (to deliver to the user) and
+            the fields to merge into the user document
+        """
+        activation_token = secrets.token_urlsafe(32)
+
+        return activation_token, {
+            "password": None,
+            "account_status": UserAccountStatusEnum.PENDING_ACTIVATION,
+            "activation_token_hash": self.hash_activation_token(activation_token),
+            "must_change_password": True,
+        }
+
+    @staticmethod
+    def is_pending(user: dict) -> bool:
+        """Check whether a user document is still awaiting activation."""
+        return user.get("account_status") == UserAccountStatusEnum.PENDING_ACTIVATION
+
+    @staticmethod
+    def matches_temporary_password(plain_password: str) -> bool:
+        """Compare a password with the shared temporary password in constant time."""
+        return hmac.compare_digest(
+            plain_password.encode("utf-8"),
+            SecurityConfig.STUDENT_TEMPORARY_PASSWORD.encode("utf-8")
+        )
+
+    async def verify_user_password(self, user: dict, plain_password: str) -> bool:
+        """Verify a password for either a pending or an active account.
+
+        Args:
+            user: User document including credential fields
+            plain_password: Password supplied by the user
+
+        Returns:
+            True if the password is valid for this account
+        """
+        if self.is_pending(user):
+            return self.matches_temporary_password(plain_password)
+
+        if not user.get("password"):
+            return False
+
+        return await password_hashing_pool_service.verify_password(plain_password, user["password"])
+
+    async def complete_first_login(self, user: dict) -> None:
+        """Store the real hash of the temporary password on first login.
+
+        Args:
+            user: Pending user document that just authenticated
+        """
+        hashed_password = await password_hashing_pool_service.hash_password(
+            SecurityConfig.STUDENT_TEMPORARY_PASSWORD
+        )
+
+        await database.users.update_one(
+            {"id": user["id"], "account_status": UserAccountStatusEnum.PENDING_ACTIVATION},
+            {
+                "$set": {
+                    "password": hashed_password,
+                    "account_status": UserAccountStatusEnum.ACTIVE
+                },
+                "$unset": {"activation_token_hash": ""}
+            }
+        )
+        principal_cache_service.invalidate_user(user["id"])
+
+    async def activate_account(self, activation_token: str, new_password: str) -> Optional[dict]:
+        """Activate a pending account with its one-time token and a chosen password.
+
+        Args:
+            activation_token: Plain activation token delivered to the user
+            new_password: Password the user wants to use from now on
+
+        Returns:
+            The activated user document without credentials, or None if the
+            token is unknown or already used
+        """
+        token_hash = self.hash_activation_token(activation_token)
+        pending_filter = {
+            "activation_token_hash": token_hash,
+            "account_status": UserAccountStatusEnum.PENDING_ACTIVATION
+        }
+
+        user = await database.users.find_one(pending_filter, {"_id": 0, "id": 1})
+        if not user:
+            return None
+
+        hashed_password = await password_hashing_pool_service.hash_password(new_password)
+
+        result = await database.users.update_one(
+            {**pending_filter, "id": user["id"]},
+            {
+                "$set": {
+                    "password": hashed_password,
+                    "account_status": UserAccountStatusEnum.ACTIVE,
+                    "must_change_password": False
+                },
+                "$unset": {"activation_token_hash": ""}
+            }
+        )
+
+        # Another request consumed the token first
+        if result.modified_count == 0:
+            return None
+
+        principal_cache_service.invalidate_user(user["id"])
+
+        return await database.users.find_one(
+            {"id": user["id"]},
+            {"_id": 0, "password": 0, "activation_token_hash": 0}
+        )
+
+# Export service instance
+account_activation_service = AccountActivationService()
@@ -4,10 +4,15 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional
 import jwt
 import secrets
+from pymongo import ReturnDocument
 
 from config import SecurityConfig
 from database import database
-from models import UserResponseSchema
+from models import UserResponseSchema, UserAccountStatusEnum, normalize_email
+from .principal_cache_service import principal_cache_service
+from .hashing_pool_service import password_hashing_pool_service
+from .account_activation_service import account_activation_service
+from .token_version_service import token_version_registry_service
 
 class PasswordHashingService:
     """Service for password hashing and verification."""
@@ -25,6 +30,14 @@ class PasswordHashingService:
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
         return self.pwd_context.verify(plain_password, hashed_password)
+    
+    async def hash_password_async(self, plain_password: str) -> str:
+        """Hash a plain text password without blocking the event loop."""
+        return await password_hashing_pool_service.hash_password(plain_password)
+    
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash without blocking the event loop."""
+        return await password_hashing_pool_service.verify_password(plain_password, hashed_password)
 
 class JWTTokenService:
     """Service for creating and validating JWT tokens."""
@@ -41,15 +54,16 @@ class JWTTokenService:
             Encoded JWT token string
         """
         to_encode = user_data.copy()
+        issued_at = datetime.now(timezone.utc)
         
         if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
+            expire = issued_at + expires_delta
         else:
-            expire = datetime.now(timezone.utc) + timedelta(
+            expire = issued_at + timedelta(
                 minutes=SecurityConfig.ACCESS_TOKEN_EXPIRE_MINUTES
             )
         
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "iat": issued_at})
         
         return jwt.encode(
             to_encode,
@@ -57,6 +71,47 @@ class JWTTokenService:
             algorithm=SecurityConfig.JWT_ALGORITHM
         )
     
+    @staticmethod
+    def build_user_claims(user: dict) -> dict:
+        """Build self-contained JWT claims for a user.
+        
+        With stateless claims enabled these let role-gated endpoints authorize
+        without loading the user; ``token_version`` allows revocation.
+        
+        Args:
+            user: User document or dumped user schema
+            
+        Returns:
+            Claims dictionary to pass to create_access_token
+        """
+        return {
+            "sub": user["id"],
+            "role": user["role"],
+            "institute_id": user.get("institute_id"),
+            "email": user["email"],
+            "name": user["name"],
+            "token_version": user.get("token_version", 0),
+        }
+    
+    @staticmethod
+    def principal_from_claims(payload: dict) -> dict:
+        """Rebuild a minimal principal from self-contained token claims.
+        
+        Args:
+            payload: Decoded token payload
+            
+        Returns:
+            Principal dictionary with the fields role-gated endpoints use
+        """
+        return {
+            "id": payload["sub"],
+            "role": payload["role"],
+            "institute_id": payload.get("institute_id"),
+            "email": payload.get("email"),
+            "name": payload.get("name"),
+            "token_version": payload.get("token_version", 0),
+        }
+    
     @staticmethod
     def decode_access_token(token: str) -> dict:
         """Decode and validate a JWT token.
@@ -109,14 +164,18 @@ class UserAuthenticationService:
         Returns:
             User document if authentication successful, None otherwise
         """
-        user = await database.users.find_one({"email": email}, {"_id": 0})
+        user = await database.users.find_one({"email": normalize_email(email)}, {"_id": 0})
         
         if not user:
             return None
         
-        if not self.password_service.verify_password(password, user["password"]):
+        if not await account_activation_service.verify_user_password(user, password):
             return None
         
+        # Pending accounts get their real hash only now, on first login
+        if account_activation_service.is_pending(user):
+            await account_activation_service.complete_first_login(user)
+        
         return user
     
     async def get_user_by_id(self, user_id: str) -> Optional[dict]:
@@ -130,6 +189,20 @@ class UserAuthenticationService:
         """
         return await database.users.find_one({"id": user_id}, {"_id": 0})
     
+    async def get_principal_by_id(self, user_id: str) -> Optional[dict]:
+        """Retrieve a user by ID without the password hash.
+        
+        Args:
+            user_id: Unique user identifier
+            
+        Returns:
+            User document without the password field if found, None otherwise
+        """
+        return await database.users.find_one(
+            {"id": user_id},
+            {"_id": 0, "password": 0, "activation_token_hash": 0}
+        )
+    
     async def change_user_password(
         self,
         user_id: str,
@@ -151,18 +224,28 @@ class UserAuthenticationService:
         if not user:
             return False
         
-        if not self.password_service.verify_password(old_password, user["password"]):
+        if not await account_activation_service.verify_user_password(user, old_password):
             return False
         
-        new_hashed_password = self.password_service.hash_password(new_password)
+        new_hashed_password = await self.password_service.hash_password_async(new_password)
         
-        await database.users.update_one(
+        # Bumping the token version revokes every token issued before the change
+        updated_user = await database.users.find_one_and_update(
             {"id": user_id},
-            {"$set": {
-                "password": new_hashed_password,
-                "must_change_password": False
-            }}
+            token_version_registry_service.add_version_bump({
+                "$set": {
+                    "password": new_hashed_password,
+                    "must_change_password": False,
+                    "account_status": UserAccountStatusEnum.ACTIVE
+                },
+                "$unset": {"activation_token_hash": ""}
+            }),
+            projection={"_id": 0, "token_version": 1},
+            return_document=ReturnDocument.AFTER
         )
+        principal_cache_service.invalidate_user(user_id)
+        if updated_user:
+            token_version_registry_service.register(user_id, updated_user["token_version"])
         
         return True
 
@@ -0,0 +1,114 @@
+"""Paginated batch activity sections with change-stamp ETags."""
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from pymongo import ASCENDING, DESCENDING
+
+from .pagination_service import keyset_pagination_service
+
+# Section name -> (collection, sort field, direction); each order is served
+# by the collection's batch_id index
+ACTIVITY_SECTIONS = {
+    "classes": ("classes", "class_date", ASCENDING),
+    "students": ("students", "name", ASCENDING),
+    "materials": ("materials", "created_at", DESCENDING),
+}
+
+# Requested (limit, cursor) per section
+SectionPages = Dict[str, Tuple[Optional[int], Optional[str]]]
+
+class BatchActivityService:
+    """Serves a batch's classes, students and materials page by page.
+
+    Every write to a batch or to a class, student or material belonging to
+    it stamps ``activity_updated_at`` on the batch document. The ETag of an
+    activity response is derived from that stamp and the requested pages,
+    so a revisit is answered from the batch lookup alone. When the content
+    did change, the three sections are read concurrently, each with its
+    own keyset cursor.
+    """
+
+    async def touch(self, database, batch_ids: Union[str, Iterable[Optional[str]]]) -> None:
+        """Record that the activity of one or more batches changed.
+
+        Args:
+            database: Motor database holding ``batches``
+            batch_ids: Batch id, or ids; empty values are ignored
+        """
+        if isinstance(batch_ids, str):
+            batch_ids = [batch_ids]
+        batch_ids = list({batch_id for batch_id in batch_ids if batch_id})
+        if not batch_ids:
+            return
+
+        await database.batches.update_many(
+            {"id": {"$in": batch_ids}},
+            {"$set": {"activity_updated_at": datetime.now(timezone.utc)}}
+        )
+
+    @staticmethod
+    def last_modified(batch: dict) -> Optional[datetime]:
+        """When the batch or its activity last changed.
+
+        Batches not written since stamping was introduced fall back to their
+        creation time.
+        """
+        return batch.get("activity_updated_at") or batch.get("created_at")
+
+    def etag(self, batch: dict, pages: SectionPages) -> str:
+        """Weak ETag of an activity response.
+
+        Args:
+            batch: Batch document including its change stamp
+            pages: Requested (limit, cursor) per section
+
+        Returns:
+            Quoted weak entity tag
+        """
+        requested = [
+            (section, keyset_pagination_service.resolve_limit(limit), cursor or "")
+            for section, (limit, cursor) in sorted(pages.items())
+        ]
+        key = repr((batch["id"], str(self.last_modified(batch)), requested))
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+    async def get_sections(self, database, batch_id: str, pages: SectionPages) -> dict:
+        """Read one page of every activity section concurrently.
+
+        Args:
+            database: Motor database to read
+            batch_id: Batch whose activity is read
+            pages: Requested (limit, cursor) per section
+
+        Returns:
+            Each section's documents plus ``next_cursors`` and ``totals``
+            keyed by section; a cursor is None on a section's last page
+
+        Raises:
+            InvalidCursorError: If a section cursor is malformed
+        """
+        sections = list(ACTIVITY_SECTIONS)
+        query = {"batch_id": batch_id}
+        results = await asyncio.gather(
+            *(
+                keyset_pagination_service.fetch_page(
+                    database[collection], query, sort_field, direction, *pages.get(section, (None, None))
+                )
+                for section, (collection, sort_field, direction) in ACTIVITY_SECTIONS.items()
+            ),
+            *(
+                keyset_pagination_service.count(database[collection], query)
+                for collection, _, _ in ACTIVITY_SECTIONS.values()
+            )
+        )
+        section_pages, totals = results[:len(sections)], results[len(sections):]
+
+        activity = {section: documents for section, (documents, _) in zip(sections, section_pages)}
+        activity["next_cursors"] = {section: next_cursor for section, (_, next_cursor) in zip(sections, section_pages)}
+        activity["totals"] = dict(zip(sections, totals))
+        return activity
+
+# Export service instance
+batch_activity_service = BatchActivityService()
@@ -8,6 +8,7 @@ from models import (
     BatchResponseSchema,
     BatchUpdateSchema
 )
+from .document_codec_service import document_codec_service
 
 class BatchManagementService:
     """Service for managing batch CRUD operations."""
@@ -36,11 +37,7 @@ class BatchManagementService:
             tutor_name=tutor_name
         )
         
-        document = batch_response.model_dump()
-        document["start_date"] = document["start_date"].isoformat()
-        document["created_at"] = document["created_at"].isoformat()
-        if document.get("end_date"):
-            document["end_date"] = document["end_date"].isoformat()
+        document = document_codec_service.encode(batch_response)
         
         await database.batches.insert_one(document)
         
@@ -0,0 +1,112 @@
+"""Per-institute collection version counters for conditional GETs."""
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from config import CacheConfig
+from .principal_cache_service import TimedLRUCache
+
+class CollectionVersionService:
+    """Counts writes per (institute, collection) in ``collection_versions``.
+
+    Write handlers bump the counters of the collections they changed after
+    the write succeeds. Readers fold the current counters into an ETag: as
+    long as none moved, a response cannot have changed and the client's
+    copy is still good. Counters read from MongoDB are cached for
+    ``cache_ttl_seconds``; bumps made by this worker evict its own cache
+    entries at once, bumps made by other workers are seen within the TTL.
+    """
+
+    def __init__(
+        self,
+        cache_ttl_seconds: float = CacheConfig.VERSION_CACHE_TTL_SECONDS,
+        cache_max_entries: int = CacheConfig.VERSION_CACHE_MAX_ENTRIES
+    ):
+        self.versions = TimedLRUCache(cache_max_entries, cache_ttl_seconds)
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "bumps": 0}
+
+    async def bump(self, database, institute_id: Optional[str], *collections: str) -> None:
+        """Advance the counters of collections an institute just wrote to.
+
+        Args:
+            database: Motor database holding ``collection_versions``
+            institute_id: Institute whose data changed
+            *collections: Names of the changed collections
+        """
+        collections = sorted(set(collections))
+        if not institute_id or not collections:
+            return
+
+        now = datetime.now(timezone.utc)
+        await database.collection_versions.bulk_write([
+            UpdateOne(
+                {"institute_id": institute_id, "collection": collection},
+                {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+                upsert=True
+            )
+            for collection in collections
+        ], ordered=False)
+
+        for collection in collections:
+            self.versions.pop((institute_id, collection))
+        self.counters["bumps"] += 1
+
+    async def get_versions(self, database, institute_id: str, collections: Iterable[str]) -> Dict[str, int]:
+        """Current counters of an institute's collections, served from cache when fresh.
+
+        Args:
+            database: Motor database holding ``collection_versions``
+            institute_id: Institute to read
+            collections: Collection names
+
+        Returns:
+            Collection name to version; never-written collections are 0
+        """
+        versions = {}
+        missing: List[str] = []
+        for collection in collections:
+            version = self.versions.get((institute_id, collection))
+            if version is None:
+                missing.append(collection)
+            else:
+                versions[collection] = version
+
+        if not missing:
+            self.counters["hits"] += 1
+            return versions
+
+        self.counters["misses"] += 1
+        stored = {
+            document["collection"]: document["version"]
+            async for document in database.collection_versions.find(
+                {"institute_id": institute_id, "collection": {"$in": missing}},
+                {"_id": 0, "collection": 1, "version": 1}
+            )
+        }
+        for collection in missing:
+            versions[collection] = stored.get(collection, 0)
+            self.versions.set((institute_id, collection), versions[collection])
+        return versions
+
+    @staticmethod
+    def etag(versions: Dict[str, int], *vary: object) -> str:
+        """Weak ETag over collection versions and whatever else the response depends on.
+
+        Args:
+            versions: Collection name to version
+            *vary: Other inputs of the response, e.g. the principal and the query string
+
+        Returns:
+            Quoted weak entity tag
+        """
+        key = repr((sorted(versions.items()), vary))
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+    def get_statistics(self) -> dict:
+        """Return cache hit/miss and bump counters."""
+        return {**self.counters, "cached_versions": len(self.versions)}
+
+# Export service instance
+collection_version_service = CollectionVersionService()
@@ -1,9 +1,25 @@
 """CSV import/export services."""
-import pandas as pd
+import csv
 import io
-from typing import List, Dict
+from typing import List, Dict, Iterable
 from datetime import datetime
 
+def _write_csv(rows: Iterable[Dict], fieldnames: List[str]) -> bytes:
+    """Render rows as CSV bytes with a header line."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+def _read_csv(file_content: bytes) -> List[Dict]:
+    """Parse CSV bytes into row dictionaries; empty cells become None."""
+    reader = csv.DictReader(io.StringIO(file_content.decode("utf-8-sig"), newline=""))
+    return [
+        {key: (value if value != "" else None) for key, value in row.items()}
+        for row in reader
+    ]
+
 class CSVProcessingService:
     """Service for CSV file import and export operations."""
     
@@ -14,20 +30,14 @@ class CSVProcessingService:
         Returns:
             CSV file content as bytes
         """
-        sample_data = {
-            "name": ["John Doe", "Jane Smith"],
-            "email": ["john@example.com", "jane@example.com"],
-            "phone": ["+1234567890", "+0987654321"],
-            "whatsapp": ["+1234567890", "+0987654321"],
-            "batch_id": ["batch-id-here", "batch-id-here"],
-            "total_fees": [5000, 6000]
-        }
+        sample_data = [
+            {"name": "John Doe", "email": "john@example.com", "phone": "+1234567890",
+             "whatsapp": "+1234567890", "batch_id": "batch-id-here", "total_fees": 5000},
+            {"name": "Jane Smith", "email": "jane@example.com", "phone": "+0987654321",
+             "whatsapp": "+0987654321", "batch_id": "batch-id-here", "total_fees": 6000},
+        ]
         
-        df = pd.DataFrame(sample_data)
-        buffer = io.BytesIO()
-        df.to_csv(buffer, index=False)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return _write_csv(sample_data, list(sample_data[0]))
     
     @staticmethod
     def generate_sample_class_schedule_csv() -> bytes:
@@ -36,17 +46,12 @@ class CSVProcessingService:
         Returns:
             CSV file content as bytes
         """
-        sample_data = {
-            "class_date": ["2024-01-15", "2024-01-17"],
-            "class_time": ["10:00 AM", "02:00 PM"],
-            "topic": ["Introduction to Python", "Advanced Functions"]
-        }
+        sample_data = [
+            {"class_date": "2024-01-15", "class_time": "10:00 AM", "topic": "Introduction to Python"},
+            {"class_date": "2024-01-17", "class_time": "02:00 PM", "topic": "Advanced Functions"},
+        ]
         
-        df = pd.DataFrame(sample_data)
-        buffer = io.BytesIO()
-        df.to_csv(buffer, index=False)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return _write_csv(sample_data, list(sample_data[0]))
     
     @staticmethod
     def parse_student_csv(file_content: bytes) -> List[Dict]:
@@ -58,8 +63,7 @@ class CSVProcessingService:
         Returns:
             List of student dictionaries
         """
-        df = pd.read_csv(io.BytesIO(file_content))
-        return df.to_dict('records')
+        return _read_csv(file_content)
     
     @staticmethod
     def parse_class_schedule_csv(file_content: bytes) -> List[Dict]:
@@ -71,12 +75,14 @@ class CSVProcessingService:
         Returns:
             List of class schedule dictionaries
         """
-        df = pd.read_csv(io.BytesIO(file_content))
+        records = _read_csv(file_content)
         
         # Convert date strings to datetime
-        df['class_date'] = pd.to_datetime(df['class_date'])
+        for record in records:
+            if record.get('class_date'):
+                record['class_date'] = datetime.fromisoformat(record['class_date'])
         
-        return df.to_dict('records')
+        return records
     
     @staticmethod
     def export_students_to_csv(students: List[Dict]) -> bytes:
@@ -88,11 +94,9 @@ class CSVProcessingService:
         Returns:
             CSV file content as bytes
         """
-        df = pd.DataFrame(students)
-        buffer = io.BytesIO()
-        df.to_csv(buffer, index=False)
-        buffer.seek(0)
-        return buffer.getvalue()
+        # Columns follow first appearance across all rows, like a DataFrame would
+        fieldnames = list(dict.fromkeys(key for student in students for key in student))
+        return _write_csv(students, fieldnames)
 
 # Export service instance
 csv_processing_service = CSVProcessingService()
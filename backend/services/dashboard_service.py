@@ -0,0 +1,130 @@
+"""Dashboard statistics computed with server-side aggregation."""
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional
+
+class DashboardStatisticsService:
+    """Builds the per-role dashboard figures.
+
+    Totals are computed by MongoDB ``$group`` stages and independent queries
+    run concurrently, so latency depends on the slowest single query rather
+    than on how many documents an institute holds.
+    """
+
+    @staticmethod
+    def start_of_today() -> datetime:
+        """Midnight UTC of the current day."""
+        return datetime.combine(datetime.now(timezone.utc).date(), datetime.min.time(), tzinfo=timezone.utc)
+
+    @staticmethod
+    async def _group_totals(collection, match: dict, totals: dict) -> dict:
+        """Run a single ``$group`` over the matching documents.
+
+        Args:
+            collection: Motor collection to aggregate
+            match: Filter for the ``$match`` stage
+            totals: Accumulator expressions keyed by output field
+
+        Returns:
+            The accumulated values, or zeros when nothing matched
+        """
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": None, **totals}},
+        ]
+        results = await collection.aggregate(pipeline).to_list(1)
+        if not results:
+            return {field: 0 for field in totals}
+        results[0].pop("_id", None)
+        return results[0]
+
+    async def admin_statistics(self, database, institute_id: str, tutor_role: str = "tutor") -> dict:
+        """Institute-wide totals for the admin dashboard.
+
+        Args:
+            database: Motor database to read from
+            institute_id: Institute the admin belongs to
+            tutor_role: Role value identifying tutors
+
+        Returns:
+            Batch, student and tutor counts, collected revenue and pending fees
+        """
+        total_batches, student_totals, total_tutors, payment_totals = await asyncio.gather(
+            database.batches.count_documents({"institute_id": institute_id}),
+            self._group_totals(database.students, {"institute_id": institute_id}, {
+                "count": {"$sum": 1},
+                "pending_fees": {"$sum": {"$subtract": ["$total_fees", "$paid_amount"]}},
+            }),
+            database.users.count_documents({"institute_id": institute_id, "role": tutor_role}),
+            self._group_totals(database.payments, {"institute_id": institute_id}, {
+                "total_revenue": {"$sum": "$amount"},
+            }),
+        )
+
+        return {
+            "total_batches": total_batches,
+            "total_students": student_totals["count"],
+            "total_tutors": total_tutors,
+            "total_revenue": payment_totals["total_revenue"],
+            "pending_fees": student_totals["pending_fees"]
+        }
+
+    async def tutor_statistics(self, database, tutor_id: str, batch_ids: Optional[List[str]] = None) -> dict:
+        """Totals for a tutor's own batches.
+
+        Args:
+            database: Motor database to read from
+            tutor_id: Tutor user ID
+            batch_ids: The tutor's batch IDs if already known, e.g. from a cached scope
+
+        Returns:
+            Batch and student counts and the number of classes from today on
+        """
+        if batch_ids is None:
+            batch_ids = await database.batches.distinct("id", {"tutor_id": tutor_id})
+
+        total_students, today_classes = await asyncio.gather(
+            database.students.count_documents({"batch_id": {"$in": list(batch_ids)}}),
+            database.classes.count_documents({
+                "tutor_id": tutor_id,
+                "class_date": {"$gte": self.start_of_today()}
+            }),
+        )
+
+        return {
+            "total_batches": len(batch_ids),
+            "total_students": total_students,
+            "today_classes": today_classes
+        }
+
+    async def student_statistics(self, database, student: dict) -> dict:
+        """Fee, class and homework summary for a student.
+
+        Args:
+            database: Motor database to read from
+            student: The student's record
+
+        Returns:
+            Payment figures, upcoming class count and pending homework count
+        """
+        today_classes, homework_ids, submitted_ids = await asyncio.gather(
+            database.classes.count_documents({
+                "batch_id": student["batch_id"],
+                "class_date": {"$gte": self.start_of_today()}
+            }),
+            database.homework.distinct("id", {"batch_id": student["batch_id"]}),
+            database.homework_submissions.distinct("homework_id", {"student_id": student["id"]}),
+        )
+
+        return {
+            "batch_name": student["batch_name"],
+            "payment_status": student["payment_status"],
+            "total_fees": student["total_fees"],
+            "paid_amount": student["paid_amount"],
+            "pending_amount": student["total_fees"] - student["paid_amount"],
+            "today_classes": today_classes,
+            "pending_homework": len(set(homework_ids) - set(submitted_ids))
+        }
+
+# Export service instance
+dashboard_statistics_service = DashboardStatisticsService()
@@ -0,0 +1,127 @@
+"""Resumable online migration of ISO-string dates to BSON datetimes."""
+import logging
+from typing import Dict, List
+
+from pymongo import UpdateOne
+
+from .document_codec_service import document_codec_service
+
+logger = logging.getLogger(__name__)
+
+# Date fields that older code stored as isoformat() strings
+DATE_FIELDS: Dict[str, List[str]] = {
+    "users": ["created_at"],
+    "batches": ["start_date", "end_date", "created_at"],
+    "students": ["created_at"],
+    "payments": ["payment_date", "created_at"],
+    "classes": ["class_date", "created_at"],
+    "materials": ["expiry_date", "created_at"],
+    "homework": ["due_date", "created_at"],
+    "homework_submissions": ["submitted_at"],
+    "enquiries": ["created_at"],
+    "invites": ["created_at"],
+}
+
+CHECKPOINT_COLLECTION = "migrations"
+CHECKPOINT_PREFIX = "bson_dates"
+
+class DateMigrationService:
+    """Converts string dates in place, in batches, while the app keeps running.
+
+    Progress for every collection/field pair is checkpointed in the
+    ``migrations`` collection by last processed ``_id``, so an interrupted
+    run resumes where it stopped. Each update is guarded by the original
+    string value, so concurrent writes are never overwritten.
+    """
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+
+    async def migrate_field(self, database, collection_name: str, field: str) -> dict:
+        """Convert one field of one collection.
+
+        Args:
+            database: Motor database to migrate
+            collection_name: Collection holding the field
+            field: Name of the date field
+
+        Returns:
+            Counts of converted and unparseable values for this field
+        """
+        checkpoints = database[CHECKPOINT_COLLECTION]
+        checkpoint_id = f"{CHECKPOINT_PREFIX}:{collection_name}.{field}"
+        checkpoint = await checkpoints.find_one({"_id": checkpoint_id}) or {}
+
+        if checkpoint.get("completed"):
+            return {"converted": checkpoint.get("converted", 0), "failed": checkpoint.get("failed", 0)}
+
+        collection = database[collection_name]
+        last_id = checkpoint.get("last_id")
+        converted = checkpoint.get("converted", 0)
+        failed = checkpoint.get("failed", 0)
+
+        while True:
+            query = {field: {"$type": "string"}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            batch = await collection.find(query, {"_id": 1, field: 1}).sort("_id", 1).to_list(self.batch_size)
+            if not batch:
+                break
+
+            operations = []
+            for document in batch:
+                parsed = document_codec_service.parse_legacy_datetime(document[field])
+                if parsed is None:
+                    failed += 1
+                    continue
+                operations.append(UpdateOne(
+                    {"_id": document["_id"], field: document[field]},
+                    {"$set": {field: parsed}}
+                ))
+
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                converted += result.modified_count
+
+            last_id = batch[-1]["_id"]
+            await checkpoints.update_one(
+                {"_id": checkpoint_id},
+                {"$set": {"last_id": last_id, "converted": converted, "failed": failed}},
+                upsert=True
+            )
+
+        await checkpoints.update_one(
+            {"_id": checkpoint_id},
+            {"$set": {"completed": True, "converted": converted, "failed": failed}},
+            upsert=True
+        )
+        logger.info("Migrated %s.%s: %d converted, %d unparseable", collection_name, field, converted, failed)
+
+        return {"converted": converted, "failed": failed}
+
+    async def migrate_all(self, database) -> dict:
+        """Convert every registered date field.
+
+        Args:
+            database: Motor database to migrate
+
+        Returns:
+            Per-field conversion counts keyed by ``collection.field``
+        """
+        summary = {}
+        for collection_name, fields in DATE_FIELDS.items():
+            for field in fields:
+                summary[f"{collection_name}.{field}"] = await self.migrate_field(
+                    database, collection_name, field
+                )
+        return summary
+
+    async def reset_checkpoints(self, database) -> None:
+        """Forget saved progress so the next run rescans every field."""
+        await database[CHECKPOINT_COLLECTION].delete_many(
+            {"_id": {"$regex": f"^{CHECKPOINT_PREFIX}:"}}
+        )
+
+# Export service instance
+date_migration_service = DateMigrationService()
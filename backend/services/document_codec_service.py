@@ -0,0 +1,60 @@
+"""Storage codec that keeps dates as native BSON datetimes."""
+from datetime import date, datetime, time, timezone
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+class DocumentCodecService:
+    """Converts models into MongoDB documents with native date values.
+
+    Naive datetimes are taken to be UTC, and bare dates become midnight UTC,
+    so range filters and indexes on date fields compare real dates instead
+    of ISO strings.
+    """
+
+    @staticmethod
+    def normalize_datetime(value: datetime) -> datetime:
+        """Return a timezone-aware UTC datetime."""
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def encode_value(self, value: Any) -> Any:
+        """Encode a single value for storage, recursing into containers."""
+        if isinstance(value, datetime):
+            return self.normalize_datetime(value)
+        if isinstance(value, date):
+            return datetime.combine(value, time.min, tzinfo=timezone.utc)
+        if isinstance(value, dict):
+            return {key: self.encode_value(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.encode_value(item) for item in value]
+        return value
+
+    def encode(self, model: BaseModel) -> dict:
+        """Dump a model into a storage document.
+
+        Args:
+            model: Pydantic model to store
+
+        Returns:
+            Document dictionary with BSON-ready datetimes
+        """
+        return self.encode_value(model.model_dump())
+
+    def parse_legacy_datetime(self, value: str) -> Optional[datetime]:
+        """Parse a date stored by older code as an ISO string.
+
+        Args:
+            value: ISO 8601 string as written by ``datetime.isoformat()``
+
+        Returns:
+            UTC datetime, or None if the string cannot be parsed
+        """
+        try:
+            return self.normalize_datetime(datetime.fromisoformat(value))
+        except ValueError:
+            return None
+
+# Export service instance
+document_codec_service = DocumentCodecService()
@@ -0,0 +1,126 @@
+"""Resumable online migration of stored emails to their normalized form."""
+import logging
+from typing import List
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models import normalize_email
+
+logger = logging.getLogger(__name__)
+
+# Collections whose ``email`` field identifies an account
+EMAIL_COLLECTIONS: List[str] = ["users", "students", "invites"]
+
+# Matches stored emails that normalize_email() would change
+UNNORMALIZED_EMAIL = r"[A-Z]|^\s|\s$"
+
+CHECKPOINT_COLLECTION = "migrations"
+CHECKPOINT_PREFIX = "normalized_emails"
+
+DUPLICATE_KEY_ERROR = 11000
+
+class EmailMigrationService:
+    """Rewrites emails typed in mixed case before emails were normalized.
+
+    Works like the date migration: batches ordered by ``_id``, a checkpoint
+    per collection in ``migrations``, and every update guarded by the
+    original value. A user whose normalized email already belongs to
+    another account is left unchanged and counted as a conflict, since the
+    two accounts have to be merged by hand.
+    """
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+
+    async def migrate_collection(self, database, collection_name: str) -> dict:
+        """Normalize the emails of one collection.
+
+        Args:
+            database: Motor database to migrate
+            collection_name: Collection holding an ``email`` field
+
+        Returns:
+            Counts of normalized emails and unresolved conflicts
+        """
+        checkpoints = database[CHECKPOINT_COLLECTION]
+        checkpoint_id = f"{CHECKPOINT_PREFIX}:{collection_name}"
+        checkpoint = await checkpoints.find_one({"_id": checkpoint_id}) or {}
+
+        if checkpoint.get("completed"):
+            return {"normalized": checkpoint.get("normalized", 0), "conflicts": checkpoint.get("conflicts", 0)}
+
+        collection = database[collection_name]
+        last_id = checkpoint.get("last_id")
+        normalized = checkpoint.get("normalized", 0)
+        conflicts = checkpoint.get("conflicts", 0)
+
+        while True:
+            query = {"email": {"$type": "string", "$regex": UNNORMALIZED_EMAIL}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            batch = await collection.find(query, {"_id": 1, "email": 1}).sort("_id", 1).to_list(self.batch_size)
+            if not batch:
+                break
+
+            operations = [
+                UpdateOne(
+                    {"_id": document["_id"], "email": document["email"]},
+                    {"$set": {"email": normalize_email(document["email"])}}
+                )
+                for document in batch
+            ]
+            try:
+                result = await collection.bulk_write(operations, ordered=False)
+                normalized += result.modified_count
+            except BulkWriteError as error:
+                normalized += error.details.get("nModified", 0)
+                for write_error in error.details.get("writeErrors", []):
+                    if write_error.get("code") != DUPLICATE_KEY_ERROR:
+                        raise
+                    conflicts += 1
+                    logger.warning(
+                        "%s email %r differs from an existing account only in case; merge them by hand",
+                        collection_name, batch[write_error["index"]]["email"]
+                    )
+
+            last_id = batch[-1]["_id"]
+            await checkpoints.update_one(
+                {"_id": checkpoint_id},
+                {"$set": {"last_id": last_id, "normalized": normalized, "conflicts": conflicts}},
+                upsert=True
+            )
+
+        await checkpoints.update_one(
+            {"_id": checkpoint_id},
+            {"$set": {"completed": True, "normalized": normalized, "conflicts": conflicts}},
+            upsert=True
+        )
+        if normalized or conflicts:
+            logger.info("Normalized %d %s emails, %d conflicts", normalized, collection_name, conflicts)
+
+        return {"normalized": normalized, "conflicts": conflicts}
+
+    async def migrate_all(self, database) -> dict:
+        """Normalize the emails of every registered collection.
+
+        Args:
+            database: Motor database to migrate
+
+        Returns:
+            Per-collection counts keyed by collection name
+        """
+        return {
+            collection_name: await self.migrate_collection(database, collection_name)
+            for collection_name in EMAIL_COLLECTIONS
+        }
+
+    async def reset_checkpoints(self, database) -> None:
+        """Forget saved progress so the next run rescans every collection."""
+        await database[CHECKPOINT_COLLECTION].delete_many(
+            {"_id": {"$regex": f"^{CHECKPOINT_PREFIX}:"}}
+        )
+
+# Export service instance
+email_migration_service = EmailMigrationService()
@@ -0,0 +1,195 @@
+"""Write-behind intake of public enquiry and contact form submissions."""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from config import EnquiryConfig
+from models import UserRoleEnum
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+DEFAULT_INSTITUTE_ID = "default"
+
+class EnquiryBufferFullError(Exception):
+    """Raised when the enquiry buffer stays full for the whole enqueue timeout."""
+
+class EnquiryIntakeService:
+    """Accepts public submissions without a database round trip per request.
+
+    The institute a public enquiry belongs to is looked up once and cached.
+    Enquiry documents are queued in memory and a background task writes
+    them with ``insert_many`` every ``flush_interval_ms`` or as soon as
+    ``flush_max_records`` are waiting. When ``max_pending`` documents are
+    queued, submitters wait for a flush and are rejected with
+    ``EnquiryBufferFullError`` if none makes room in time. Stopping the
+    service drains the queue; documents accepted by a worker that dies
+    without shutting down are lost, which is the trade-off of write-behind.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = EnquiryConfig.WRITE_BEHIND_ENABLED,
+        flush_interval_ms: int = EnquiryConfig.FLUSH_INTERVAL_MS,
+        flush_max_records: int = EnquiryConfig.FLUSH_MAX_RECORDS,
+        max_pending: int = EnquiryConfig.BUFFER_MAX_PENDING,
+        enqueue_timeout_seconds: float = EnquiryConfig.ENQUEUE_TIMEOUT_SECONDS,
+        institute_cache_seconds: int = EnquiryConfig.INSTITUTE_CACHE_SECONDS
+    ):
+        self.enabled = enabled
+        self.flush_interval_seconds = flush_interval_ms / 1000
+        self.flush_max_records = max(1, flush_max_records)
+        self.max_pending = max(self.flush_max_records, max_pending)
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self.institute_cache_seconds = institute_cache_seconds
+        self._pending: Deque[dict] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._room_available: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._institute_id: Optional[str] = None
+        self._institute_expires_at = 0.0
+        self.counters: Dict[str, int] = {
+            "accepted": 0,
+            "written": 0,
+            "dropped": 0,
+            "rejected": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def resolve_institute(self, database) -> str:
+        """Institute that receives public submissions.
+
+        The first admin's id is cached for ``institute_cache_seconds``; the
+        ``default`` fallback is not cached so the first admin to sign up is
+        picked up immediately.
+        """
+        if self._institute_id and self._institute_expires_at > time.monotonic():
+            return self._institute_id
+
+        admin = await database.users.find_one({"role": UserRoleEnum.ADMIN}, {"_id": 0, "id": 1})
+        if not admin:
+            return DEFAULT_INSTITUTE_ID
+
+        self._institute_id = admin["id"]
+        self._institute_expires_at = time.monotonic() + self.institute_cache_seconds
+        return self._institute_id
+
+    async def _wait_for_room(self) -> None:
+        while len(self._pending) >= self.max_pending:
+            self._room_available.clear()
+            self._flush_requested.set()
+            await self._room_available.wait()
+
+    async def submit(self, database, document: dict) -> None:
+        """Queue an enquiry document for the next flush.
+
+        Written immediately when write-behind is disabled or the flusher is
+        not running.
+
+        Args:
+            database: Motor database holding ``enquiries``
+            document: Encoded enquiry document
+
+        Raises:
+            EnquiryBufferFullError: If the buffer stays full for the enqueue timeout
+        """
+        if not self.is_running:
+            await database.enquiries.insert_one(document)
+            self.counters["written"] += 1
+            return
+
+        if len(self._pending) >= self.max_pending:
+            try:
+                await asyncio.wait_for(self._wait_for_room(), self.enqueue_timeout_seconds)
+            except asyncio.TimeoutError:
+                self.counters["rejected"] += 1
+                raise EnquiryBufferFullError("Too many submissions, please retry shortly")
+
+        self._pending.append(document)
+        self.counters["accepted"] += 1
+        if len(self._pending) >= self.flush_max_records:
+            self._flush_requested.set()
+
+    async def flush(self, database) -> bool:
+        """Write every queued document in ``insert_many`` batches.
+
+        Documents rejected by MongoDB are logged and dropped; duplicates of
+        an already written document (from a retried batch) are ignored. On
+        any other error the batch goes back to the front of the queue.
+
+        Returns:
+            True if the queue was drained, False if a batch has to be retried
+        """
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.flush_max_records))]
+            try:
+                await database.enquiries.insert_many(batch, ordered=False)
+                self.counters["written"] += len(batch)
+            except BulkWriteError as error:
+                rejected = [
+                    write_error for write_error in error.details.get("writeErrors", [])
+                    if write_error.get("code") != DUPLICATE_KEY_ERROR
+                ]
+                self.counters["written"] += len(batch) - len(rejected)
+                self.counters["dropped"] += len(rejected)
+                if rejected:
+                    logger.error("Dropped %d enquiries rejected by MongoDB: %s", len(rejected), rejected[0].get("errmsg"))
+            except PyMongoError:
+                self._pending.extendleft(reversed(batch))
+                self.counters["failed_flushes"] += 1
+                logger.exception("Writing %d enquiries failed; %d queued for retry", len(batch), len(self._pending))
+                return False
+            finally:
+                self._room_available.set()
+            self.counters["flushes"] += 1
+        return True
+
+    async def _run(self, database) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush(database)
+            except Exception:
+                logger.exception("Enquiry flush failed")
+
+    def start(self, database) -> None:
+        """Start the background flusher on the running event loop."""
+        if not self.enabled or self.is_running:
+            return
+        self._stopping = False
+        self._flush_requested = asyncio.Event()
+        self._room_available = asyncio.Event()
+        self._task = asyncio.create_task(self._run(database))
+
+    async def stop(self, database) -> None:
+        """Stop the flusher and write whatever is still queued."""
+        if not self.is_running:
+            return
+        self._stopping = True
+        self._flush_requested.set()
+        await self._task
+        self._task = None
+
+        if not await self.flush(database):
+            logger.error("Shutting down with %d unwritten enquiries", len(self._pending))
+
+    def get_statistics(self) -> dict:
+        """Return intake counters and the current queue depth."""
+        return {**self.counters, "pending": len(self._pending), "running": self.is_running}
+
+# Export service instance
+enquiry_intake_service = EnquiryIntakeService()
@@ -0,0 +1,129 @@
+"""Bounded worker pool that runs password hashing off the event loop."""
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from passlib.context import CryptContext
+
+from config import SecurityConfig
+
+logger = logging.getLogger(__name__)
+
+# Module-level so the functions below can be pickled into process workers
+_pwd_context = CryptContext(
+    schemes=SecurityConfig.PASSWORD_HASH_SCHEMES,
+    deprecated="auto"
+)
+
+def _hash_password(plain_password: str) -> str:
+    return _pwd_context.hash(plain_password)
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _pwd_context.verify(plain_password, hashed_password)
+
+class HashingPoolSaturatedError(Exception):
+    """Raised when the hashing queue is full and the request is shed."""
+
+class PasswordHashingPoolService:
+    """Runs bcrypt in a thread or process pool with a bounded queue.
+
+    At most ``max_workers`` hashes run at once and at most ``max_queue_depth``
+    more may wait; anything beyond that raises HashingPoolSaturatedError so
+    the API can answer 503 instead of stalling every other request.
+    """
+
+    def __init__(
+        self,
+        executor_kind: str = SecurityConfig.PASSWORD_HASH_POOL_KIND,
+        max_workers: int = SecurityConfig.PASSWORD_HASH_POOL_WORKERS,
+        max_queue_depth: int = SecurityConfig.PASSWORD_HASH_MAX_QUEUE_DEPTH
+    ):
+        self.executor_kind = executor_kind
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self.counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "peak_queue_depth": 0,
+        }
+        self._total_latency_ms = 0.0
+        self._max_latency_ms = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hashing"
+                )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted jobs waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    async def _run(self, func: Callable, *args):
+        if self._in_flight >= self.max_workers + self.max_queue_depth:
+            self.counters["rejected"] += 1
+            logger.warning("Password hashing pool saturated, shedding request")
+            raise HashingPoolSaturatedError("Password hashing capacity exhausted")
+
+        self._in_flight += 1
+        self.counters["submitted"] += 1
+        self.counters["peak_queue_depth"] = max(self.counters["peak_queue_depth"], self.queue_depth)
+        started = time.perf_counter()
+
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+            self.counters["completed"] += 1
+            return result
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            latency_ms = (time.perf_counter() - started) * 1000
+            self._total_latency_ms += latency_ms
+            self._max_latency_ms = max(self._max_latency_ms, latency_ms)
+
+    async def hash_password(self, plain_password: str) -> str:
+        """Hash a plain text password in the pool."""
+        return await self._run(_hash_password, plain_password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash in the pool."""
+        return await self._run(_verify_password, plain_password, hashed_password)
+
+    def get_statistics(self) -> dict:
+        """Return queue, throughput and latency metrics for the pool."""
+        finished = self.counters["completed"] + self.counters["failed"]
+
+        return {
+            **self.counters,
+            "executor": self.executor_kind,
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "avg_latency_ms": self._total_latency_ms / finished if finished else 0.0,
+            "max_latency_ms": self._max_latency_ms,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the underlying executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Export service instance
+password_hashing_pool_service = PasswordHashingPoolService()
@@ -0,0 +1,211 @@
+"""Background import jobs with progress tracking."""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterable, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from config import ImportConfig
+from models import ImportJobResponseSchema, ImportJobStatusEnum
+from .document_codec_service import document_codec_service
+from .upload_service import SheetRows, upload_ingestion_service
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = [ImportJobStatusEnum.QUEUED, ImportJobStatusEnum.RUNNING]
+
+# Importer coroutine: consumes row batches and returns its report
+ImportRunner = Callable[[AsyncIterable[List[Tuple[int, Dict]]]], Awaitable[dict]]
+
+class ImportJobLimitError(Exception):
+    """Raised when an institute already runs the maximum number of imports."""
+
+class ImportJobService:
+    """Runs uploaded sheet imports in the background and records progress.
+
+    Each job is a document in ``import_jobs`` so any worker can answer a
+    progress request. The importer runs as a task on the event loop that
+    accepted the upload, reading rows from a private copy of the file in
+    batches and updating ``processed_rows`` after each one. Jobs that stop
+    reporting progress (for example because their worker died) are marked
+    failed when read and no longer count towards the per-institute limit.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int = ImportConfig.MAX_CONCURRENT_JOBS,
+        stale_seconds: int = ImportConfig.JOB_STALE_SECONDS,
+        max_stored_errors: int = ImportConfig.JOB_MAX_STORED_ERRORS
+    ):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.stale_seconds = stale_seconds
+        self.max_stored_errors = max_stored_errors
+        self._tasks = set()
+        self._submit_locks: Dict[str, asyncio.Lock] = {}
+
+    def _stale_before(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)
+
+    @staticmethod
+    def summarize(report: dict) -> Tuple[Dict[str, float], List[dict]]:
+        """Split an importer report into numeric counts and row errors.
+
+        Row reports with a status other than ``created`` are kept as errors,
+        together with any entries of the report's ``errors`` list.
+
+        Returns:
+            Tuple of (counts, row errors)
+        """
+        counts = {
+            key: value for key, value in report.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        errors = [row for row in report.get("rows", []) if row.get("status") != "created"]
+        errors.extend(report.get("errors", []))
+        return counts, errors
+
+    async def _update(self, database, job_id: str, fields: dict) -> None:
+        await database.import_jobs.update_one(
+            {"id": job_id},
+            {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}}
+        )
+
+    async def _track_progress(
+        self,
+        database,
+        job_id: str,
+        row_batches: AsyncIterable[List[Tuple[int, Dict]]]
+    ) -> AsyncIterator[List[Tuple[int, Dict]]]:
+        processed = 0
+        async for rows in row_batches:
+            yield rows
+            processed += len(rows)
+            await self._update(database, job_id, {"processed_rows": processed})
+
+    async def _run(self, database, job_id: str, sheet: SheetRows, file: BinaryIO, runner: ImportRunner) -> None:
+        try:
+            await self._update(database, job_id, {
+                "status": ImportJobStatusEnum.RUNNING,
+                "started_at": datetime.now(timezone.utc)
+            })
+            report = await runner(self._track_progress(
+                database, job_id, upload_ingestion_service.iter_batches(sheet.rows)
+            ))
+            counts, errors = self.summarize(report)
+            await self._update(database, job_id, {
+                "status": ImportJobStatusEnum.COMPLETED,
+                "counts": counts,
+                "errors": errors[:self.max_stored_errors],
+                "errors_truncated": len(errors) > self.max_stored_errors,
+                "finished_at": datetime.now(timezone.utc)
+            })
+        except asyncio.CancelledError:
+            await self._update(database, job_id, {
+                "status": ImportJobStatusEnum.FAILED,
+                "error": "Import was interrupted by a server shutdown",
+                "finished_at": datetime.now(timezone.utc)
+            })
+            raise
+        except Exception as error:
+            logger.exception("Import job %s failed", job_id)
+            await self._update(database, job_id, {
+                "status": ImportJobStatusEnum.FAILED,
+                "error": str(error),
+                "finished_at": datetime.now(timezone.utc)
+            })
+        finally:
+            file.close()
+
+    async def submit(
+        self,
+        database,
+        kind: str,
+        file: BinaryIO,
+        sheet: SheetRows,
+        runner: ImportRunner,
+        institute_id: str,
+        created_by: str,
+        filename: Optional[str] = None,
+        batch_id: Optional[str] = None
+    ) -> ImportJobResponseSchema:
+        """Record a job and start importing in the background.
+
+        The job takes ownership of ``file`` and closes it when it finishes,
+        or immediately if the job is rejected.
+
+        Args:
+            database: Motor database holding ``import_jobs``
+            kind: What is being imported, see ``ImportJobKindEnum``
+            file: Spooled copy of the upload
+            sheet: Rows opened from ``file``
+            runner: Importer coroutine consuming row batches
+            institute_id: Institute the import belongs to
+            created_by: User who uploaded the file
+            filename: Original file name
+            batch_id: Batch the rows are imported into, if any
+
+        Returns:
+            The queued job
+
+        Raises:
+            ImportJobLimitError: If the institute is already at its limit
+        """
+        lock = self._submit_locks.setdefault(institute_id, asyncio.Lock())
+        async with lock:
+            active = await database.import_jobs.count_documents({
+                "institute_id": institute_id,
+                "status": {"$in": ACTIVE_STATUSES},
+                "updated_at": {"$gte": self._stale_before()}
+            })
+            if active >= self.max_concurrent_jobs:
+                file.close()
+                raise ImportJobLimitError(
+                    f"{active} import(s) already running for this institute; wait for one to finish before starting another"
+                )
+
+            job = ImportJobResponseSchema(
+                kind=kind,
+                filename=filename,
+                batch_id=batch_id,
+                institute_id=institute_id,
+                created_by=created_by,
+                total_rows=sheet.total_rows
+            )
+            await database.import_jobs.insert_one(document_codec_service.encode(job))
+
+        task = asyncio.create_task(self._run(database, job.id, sheet, file, runner))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info("Started %s import job %s for institute %s", kind, job.id, institute_id)
+        return job
+
+    async def get_job(self, database, job_id: str, institute_id: str) -> Optional[dict]:
+        """Read a job's progress, failing it if its worker stopped reporting.
+
+        Args:
+            database: Motor database holding ``import_jobs``
+            job_id: Job identifier
+            institute_id: Institute of the caller; other institutes' jobs are not returned
+
+        Returns:
+            The job document, or None if it does not exist
+        """
+        job = await database.import_jobs.find_one({"id": job_id, "institute_id": institute_id}, {"_id": 0})
+        if job and job["status"] in ACTIVE_STATUSES and job["updated_at"] < self._stale_before():
+            fields = {
+                "status": ImportJobStatusEnum.FAILED,
+                "error": "Import stopped reporting progress",
+                "finished_at": datetime.now(timezone.utc)
+            }
+            await self._update(database, job_id, fields)
+            job.update(fields)
+        return job
+
+    async def stop(self) -> None:
+        """Cancel running imports, marking their jobs failed."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Export service instance
+import_job_service = ImportJobService()
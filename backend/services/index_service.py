@@ -0,0 +1,224 @@
+"""Declarative MongoDB index registry and index maintenance."""
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from config import SecurityConfig
+
+logger = logging.getLogger(__name__)
+
+# Every index the application relies on, per collection. Names are explicit
+# so that reports can compare what exists against what is declared. List
+# indexes end in the keyset sort order used by the paginated endpoints.
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("institute_id", ASCENDING), ("role", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)], name="institute_role_name"),
+        IndexModel([("role", ASCENDING)], name="role"),
+        IndexModel([("token_version", ASCENDING)], name="token_version_bumped", partialFilterExpression={"token_version": {"$gt": 0}}),
+        IndexModel([("token_version_updated_at", ASCENDING)], name="token_version_updated", sparse=True),
+    ],
+    "batches": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("institute_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="institute_created"),
+        IndexModel([("tutor_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="tutor_created"),
+    ],
+    "students": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("institute_id", ASCENDING), ("batch_id", ASCENDING)], name="institute_batch"),
+        IndexModel([("institute_id", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)], name="institute_name"),
+        IndexModel([("batch_id", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)], name="batch_name"),
+        IndexModel([("email", ASCENDING)], name="email"),
+    ],
+    "payments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("institute_id", ASCENDING), ("payment_date", DESCENDING), ("id", DESCENDING)], name="institute_payment_date_id"),
+        IndexModel([("student_id", ASCENDING), ("payment_date", DESCENDING), ("id", DESCENDING)], name="student_payment_date"),
+        IndexModel([("batch_id", ASCENDING), ("payment_date", DESCENDING), ("id", DESCENDING)], name="batch_payment_date"),
+    ],
+    "classes": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("batch_id", ASCENDING), ("class_date", ASCENDING), ("id", ASCENDING)], name="batch_class_date_id"),
+        IndexModel([("tutor_id", ASCENDING), ("class_date", ASCENDING), ("id", ASCENDING)], name="tutor_class_date_id"),
+        IndexModel([("institute_id", ASCENDING), ("class_date", ASCENDING), ("id", ASCENDING)], name="institute_class_date_id"),
+    ],
+    "materials": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("batch_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="batch_created"),
+        IndexModel([("institute_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="institute_created"),
+    ],
+    "homework": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("batch_id", ASCENDING), ("due_date", ASCENDING), ("id", ASCENDING)], name="batch_due_date"),
+        IndexModel([("tutor_id", ASCENDING), ("due_date", ASCENDING), ("id", ASCENDING)], name="tutor_due_date"),
+        IndexModel([("institute_id", ASCENDING), ("due_date", ASCENDING), ("id", ASCENDING)], name="institute_due_date"),
+    ],
+    "homework_submissions": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("student_id", ASCENDING), ("homework_id", ASCENDING)], name="student_homework"),
+        IndexModel([("homework_id", ASCENDING)], name="homework"),
+    ],
+    "enquiries": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("institute_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="institute_created"),
+        IndexModel([("institute_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="institute_status_created"),
+    ],
+    "invites": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("invite_code", ASCENDING)], name="invite_code_unique", unique=True),
+        IndexModel([("institute_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="institute_created"),
+        IndexModel([("email", ASCENDING), ("status", ASCENDING)], name="email_status"),
+    ],
+    "institute_stats": [
+        IndexModel([("institute_id", ASCENDING)], name="institute_unique", unique=True),
+    ],
+    "import_jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("institute_id", ASCENDING), ("status", ASCENDING), ("updated_at", ASCENDING)], name="institute_status_updated"),
+    ],
+    "collection_versions": [
+        IndexModel([("institute_id", ASCENDING), ("collection", ASCENDING)], name="institute_collection_unique", unique=True),
+    ],
+    "token_revocations": [
+        IndexModel([("user_id", ASCENDING)], name="user_unique", unique=True),
+        # Revocations are only needed while the tokens they cover can still be valid
+        IndexModel([("revoked_at", ASCENDING)], name="revoked_ttl", expireAfterSeconds=SecurityConfig.ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+    ],
+}
+
+# Representative filters of the hottest queries in server.py, used to check
+# with explain() that each one is answered by an index scan.
+HOT_QUERIES: List[Tuple[str, dict]] = [
+    ("users", {"id": "sample"}),
+    ("users", {"email": "sample@example.com"}),
+    ("users", {"role": "tutor", "institute_id": "sample"}),
+    ("batches", {"institute_id": "sample"}),
+    ("batches", {"tutor_id": "sample"}),
+    ("students", {"institute_id": "sample"}),
+    ("students", {"batch_id": "sample"}),
+    ("students", {"email": "sample@example.com"}),
+    ("payments", {"institute_id": "sample"}),
+    ("payments", {"student_id": "sample"}),
+    ("classes", {"batch_id": "sample", "class_date": {"$gte": datetime(2024, 1, 1, tzinfo=timezone.utc)}}),
+    ("classes", {"tutor_id": "sample", "class_date": {"$gte": datetime(2024, 1, 1, tzinfo=timezone.utc)}}),
+    ("materials", {"batch_id": "sample"}),
+    ("homework", {"batch_id": "sample"}),
+    ("homework_submissions", {"student_id": "sample"}),
+    ("homework_submissions", {"homework_id": "sample"}),
+    ("enquiries", {"institute_id": "sample"}),
+    ("invites", {"invite_code": "sample", "status": "pending"}),
+    ("invites", {"institute_id": "sample"}),
+]
+
+def _collect_stages(plan: dict) -> List[str]:
+    """Flatten the stage names of an explain() plan tree."""
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(_collect_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_collect_stages(child))
+    return stages
+
+class IndexManagementService:
+    """Applies the index registry and reports drift against the live database."""
+
+    def __init__(self, registry: Optional[Dict[str, List[IndexModel]]] = None):
+        self.registry = registry if registry is not None else INDEX_REGISTRY
+
+    async def apply_indexes(self, database, drop_extra: bool = False) -> dict:
+        """Create every declared index, optionally dropping undeclared ones.
+
+        Args:
+            database: Motor database to apply the registry to
+            drop_extra: Whether to drop indexes that are not declared
+
+        Returns:
+            Created index names and failures per collection
+        """
+        summary = {"created": {}, "dropped": {}, "failed": {}}
+
+        for collection_name, index_models in self.registry.items():
+            collection = database[collection_name]
+            try:
+                summary["created"][collection_name] = await collection.create_indexes(index_models)
+            except PyMongoError as error:
+                # e.g. duplicate emails blocking a unique index - keep serving
+                logger.error("Could not create indexes on %s: %s", collection_name, error)
+                summary["failed"][collection_name] = str(error)
+
+        if drop_extra:
+            report = await self.report_indexes(database)
+            for collection_name, extra_names in report["extra"].items():
+                for index_name in extra_names:
+                    await database[collection_name].drop_index(index_name)
+                summary["dropped"][collection_name] = extra_names
+
+        return summary
+
+    async def report_indexes(self, database) -> dict:
+        """Compare declared indexes with the ones present in the database.
+
+        Args:
+            database: Motor database to inspect
+
+        Returns:
+            Missing and extra index names per collection, plus declared
+            indexes whose keys differ from the live definition
+        """
+        report = {"missing": {}, "extra": {}, "mismatched": {}}
+
+        for collection_name, index_models in self.registry.items():
+            declared = {model.document["name"]: dict(model.document["key"]) for model in index_models}
+            existing = {}
+            async for index in database[collection_name].list_indexes():
+                existing[index["name"]] = dict(index["key"])
+            existing.pop("_id_", None)
+
+            missing = [name for name in declared if name not in existing]
+            extra = [name for name in existing if name not in declared]
+            mismatched = [
+                name for name in declared
+                if name in existing and list(existing[name].items()) != list(declared[name].items())
+            ]
+
+            if missing:
+                report["missing"][collection_name] = missing
+            if extra:
+                report["extra"][collection_name] = extra
+            if mismatched:
+                report["mismatched"][collection_name] = mismatched
+
+        return report
+
+    async def verify_hot_queries(self, database) -> List[dict]:
+        """Run explain() on the hot queries and check they use an index scan.
+
+        Args:
+            database: Motor database to explain against
+
+        Returns:
+            One entry per hot query with its plan stages and an ``uses_index`` flag
+        """
+        results = []
+
+        for collection_name, query_filter in HOT_QUERIES:
+            explanation = await database[collection_name].find(query_filter).explain()
+            winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+            stages = _collect_stages(winning_plan)
+
+            results.append({
+                "collection": collection_name,
+                "filter": query_filter,
+                "stages": stages,
+                "uses_index": ("IXSCAN" in stages or "IDHACK" in stages) and "COLLSCAN" not in stages,
+            })
+
+        return results
+
+# Export service instance
+index_management_service = IndexManagementService()
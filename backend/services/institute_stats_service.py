@@ -0,0 +1,135 @@
+"""Materialized per-institute dashboard counters."""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from config import DatabaseConfig
+from .collection_version_service import collection_version_service
+from .dashboard_service import dashboard_statistics_service
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ("total_batches", "total_students", "total_tutors", "total_revenue", "pending_fees")
+
+class InstituteStatsService:
+    """Keeps one ``institute_stats`` document per institute.
+
+    Writers adjust the counters with ``$inc`` as part of each mutation, so
+    the admin dashboard reads a single document. A document is seeded from
+    a full aggregation the first time it is read, and a periodic reconciler
+    recomputes every document to correct drift from failed or concurrent
+    writes, advancing the ``institute_stats`` collection version when it
+    changes a figure.
+    """
+
+    def __init__(self, reconcile_interval_seconds: int = DatabaseConfig.INSTITUTE_STATS_RECONCILE_SECONDS):
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    async def increment(self, database, institute_id: Optional[str], **deltas) -> None:
+        """Atomically adjust an institute's counters.
+
+        Institutes without a stats document are skipped; their document is
+        built from scratch on first read.
+
+        Args:
+            database: Motor database to write to
+            institute_id: Institute whose counters change
+            **deltas: Counter name to signed amount, e.g. ``total_students=1``
+        """
+        deltas = {field: amount for field, amount in deltas.items() if amount}
+        if not institute_id or not deltas:
+            return
+
+        await database.institute_stats.update_one(
+            {"institute_id": institute_id},
+            {"$inc": deltas, "$set": {"updated_at": datetime.now(timezone.utc)}}
+        )
+
+    async def reconcile(self, database, institute_id: str, tutor_role: str = "tutor") -> dict:
+        """Recompute an institute's counters from the source collections.
+
+        Args:
+            database: Motor database to read and write
+            institute_id: Institute to recompute
+            tutor_role: Role value identifying tutors
+
+        Returns:
+            The recomputed counters
+        """
+        totals = await dashboard_statistics_service.admin_statistics(database, institute_id, tutor_role)
+        now = datetime.now(timezone.utc)
+
+        previous = await database.institute_stats.find_one_and_update(
+            {"institute_id": institute_id},
+            {"$set": {**totals, "reconciled_at": now, "updated_at": now}},
+            projection={"_id": 0, **{field: 1 for field in COUNTER_FIELDS}},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+        # Corrected drift changes what the dashboard shows, so cached copies must go
+        if previous is not None and any(previous.get(field, 0) != totals[field] for field in COUNTER_FIELDS):
+            await collection_version_service.bump(database, institute_id, "institute_stats")
+        return totals
+
+    async def reconcile_all(self, database) -> int:
+        """Recompute every materialized stats document.
+
+        Returns:
+            Number of institutes reconciled
+        """
+        institute_ids = await database.institute_stats.distinct("institute_id")
+        for institute_id in institute_ids:
+            await self.reconcile(database, institute_id)
+        return len(institute_ids)
+
+    async def get_statistics(self, database, institute_id: str, tutor_role: str = "tutor") -> dict:
+        """Read an institute's dashboard counters, seeding them if needed.
+
+        Args:
+            database: Motor database to read from
+            institute_id: Institute to read
+            tutor_role: Role value identifying tutors
+
+        Returns:
+            Batch, student and tutor counts, collected revenue and pending fees
+        """
+        stats = await database.institute_stats.find_one(
+            {"institute_id": institute_id},
+            {"_id": 0, **{field: 1 for field in COUNTER_FIELDS}}
+        )
+        if stats is None:
+            return await self.reconcile(database, institute_id, tutor_role)
+        return {field: stats.get(field, 0) for field in COUNTER_FIELDS}
+
+    async def _reconcile_periodically(self, database) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval_seconds)
+            try:
+                count = await self.reconcile_all(database)
+                logger.info("Reconciled dashboard counters for %d institutes", count)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Institute stats reconciliation failed")
+
+    def start(self, database) -> None:
+        """Start the periodic reconciler on the running event loop."""
+        if self._reconcile_task is None and self.reconcile_interval_seconds > 0:
+            self._reconcile_task = asyncio.create_task(self._reconcile_periodically(database))
+
+    async def stop(self) -> None:
+        """Cancel the periodic reconciler."""
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+
+# Export service instance
+institute_stats_service = InstituteStatsService()
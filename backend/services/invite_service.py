@@ -0,0 +1,162 @@
+"""Bulk invite pipeline."""
+import logging
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from pymongo.errors import BulkWriteError
+
+from config import ImportConfig
+from database import database
+from models import InviteResponseSchema, InviteStatusEnum, normalize_email
+from .auth_service import invite_code_service
+from .document_codec_service import document_codec_service
+from .upload_service import chunked, clean_cell
+
+logger = logging.getLogger(__name__)
+
+email_adapter = TypeAdapter(EmailStr)
+
+class BulkInviteService:
+    """Creates a sheet of invites one bounded batch at a time.
+
+    Addresses are normalized and deduplicated in memory, each batch is
+    checked against existing users and pending invites with one ``$in``
+    query each, and the remaining invites are written with ``insert_many``.
+    """
+
+    def __init__(self, chunk_size: int = ImportConfig.INSERT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def normalize_email(value: Any) -> Optional[str]:
+        """Validate an address and return it in the form emails are stored in.
+
+        Args:
+            value: Raw cell value
+
+        Returns:
+            The normalized address, or None if it is blank or invalid
+        """
+        email = clean_cell(value)
+        if email is None:
+            return None
+        try:
+            return normalize_email(email_adapter.validate_python(email))
+        except ValidationError:
+            return None
+
+    def prepare_emails(self, rows: Iterable[Tuple[int, Dict]], seen: set) -> tuple:
+        """Normalize and deduplicate raw addresses.
+
+        Args:
+            rows: (row_number, row) pairs with an ``email`` column
+            seen: Normalized addresses from earlier rows; updated in place
+
+        Returns:
+            Tuple of (unique (row_number, email) pairs, per-row reports for
+            invalid and repeated addresses)
+        """
+        unique = []
+        reports = []
+
+        for row_number, row in rows:
+            value = row.get("email")
+            email = self.normalize_email(value)
+            if email is None:
+                reports.append({"row": row_number, "email": clean_cell(value), "status": "invalid", "error": "Invalid email address"})
+            elif email in seen:
+                reports.append({"row": row_number, "email": email, "status": "skipped", "error": "Duplicate email in file"})
+            else:
+                seen.add(email)
+                unique.append((row_number, email))
+
+        return unique, reports
+
+    async def _matching_emails(self, collection, query: dict, emails: List[str]) -> set:
+        matches = set()
+        for email_chunk in chunked(emails, self.chunk_size):
+            cursor = collection.find({**query, "email": {"$in": email_chunk}}, {"_id": 0, "email": 1})
+            async for document in cursor:
+                matches.add(document["email"])
+        return matches
+
+    async def _create_batch(self, unique: List[Tuple[int, str]], role: str, institute_id: str, batch: Optional[dict], report: dict) -> None:
+        emails = [email for _, email in unique]
+        registered = await self._matching_emails(database.users, {}, emails)
+        pending = await self._matching_emails(
+            database.invites,
+            {"institute_id": institute_id, "status": InviteStatusEnum.PENDING},
+            emails
+        )
+
+        invites = []
+        for row_number, email in unique:
+            if email in registered:
+                report["rows"].append({"row": row_number, "email": email, "status": "skipped", "error": "User already exists"})
+            elif email in pending:
+                report["rows"].append({"row": row_number, "email": email, "status": "skipped", "error": "Invite already pending"})
+            else:
+                invites.append((row_number, InviteResponseSchema(
+                    email=email,
+                    role=role,
+                    batch_id=batch["id"] if batch else None,
+                    batch_name=batch["name"] if batch else None,
+                    invite_code=invite_code_service.generate_invite_code(),
+                    institute_id=institute_id
+                )))
+
+        if not invites:
+            return
+
+        failed = set()
+        try:
+            await database.invites.insert_many(
+                [document_codec_service.encode(invite) for _, invite in invites],
+                ordered=False
+            )
+        except BulkWriteError as error:
+            # Unordered inserts keep going past a failure; only the listed rows were not saved
+            failed = {write_error["index"] for write_error in error.details.get("writeErrors", [])}
+
+        for index, (row_number, invite) in enumerate(invites):
+            if index in failed:
+                report["rows"].append({"row": row_number, "email": invite.email, "status": "error", "error": "Could not save invite"})
+            else:
+                report["rows"].append({"row": row_number, "email": invite.email, "status": "created"})
+                report["emails"].append(invite.email)
+
+    async def create_invites(self, row_batches: AsyncIterable[List[Tuple[int, Dict]]], role: str, institute_id: str, batch: Optional[dict] = None) -> dict:
+        """Invite every new address in a sheet.
+
+        Args:
+            row_batches: Batches of (row_number, row) pairs with an ``email`` column
+            role: Role the invitees will get
+            institute_id: Institute identifier
+            batch: Batch the invitees join, if any
+
+        Returns:
+            Report with created/skipped/invalid/failed counts, per-row results and
+            the invited addresses
+        """
+        report = {"rows": [], "emails": []}
+        seen = set()
+
+        async for rows in row_batches:
+            unique, row_reports = self.prepare_emails(rows, seen)
+            report["rows"].extend(row_reports)
+            for unique_chunk in chunked(unique, self.chunk_size):
+                await self._create_batch(unique_chunk, role, institute_id, batch, report)
+
+        report["rows"].sort(key=lambda row_report: row_report["row"])
+        logger.info("Created %d invites for institute %s", len(report["emails"]), institute_id)
+
+        return {
+            "created": len(report["emails"]),
+            "skipped": sum(1 for row_report in report["rows"] if row_report["status"] == "skipped"),
+            "invalid": sum(1 for row_report in report["rows"] if row_report["status"] == "invalid"),
+            "failed": sum(1 for row_report in report["rows"] if row_report["status"] == "error"),
+            **report,
+        }
+
+# Export service instance
+bulk_invite_service = BulkInviteService()
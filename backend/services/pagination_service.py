@@ -0,0 +1,180 @@
+"""Keyset (cursor) pagination over MongoDB collections."""
+import base64
+from datetime import timezone
+from typing import Any, List, Optional, Tuple
+
+from bson import json_util
+from bson.json_util import JSONOptions
+from pymongo import ASCENDING, DESCENDING
+
+from config import PaginationConfig
+
+_CURSOR_JSON_OPTIONS = JSONOptions(tz_aware=True, tzinfo=timezone.utc)
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+class KeysetPaginationService:
+    """Pages through a collection by ``(sort_key, id)`` instead of skip/limit.
+
+    Every page is sorted by the sort key with ``id`` as tie-breaker, so the
+    order is stable and each request costs one index range scan regardless
+    of how deep into the collection the client is.
+    """
+
+    def __init__(
+        self,
+        default_limit: int = PaginationConfig.DEFAULT_PAGE_SIZE,
+        max_limit: int = PaginationConfig.MAX_PAGE_SIZE
+    ):
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def resolve_limit(self, limit: Optional[int]) -> int:
+        """Clamp a requested page size to the configured bounds."""
+        if limit is None:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def encode_cursor(self, sort_value: Any, document_id: str) -> str:
+        """Build an opaque cursor pointing just past a document.
+
+        Args:
+            sort_value: Sort key value of the last document on the page
+            document_id: ``id`` of the last document on the page
+
+        Returns:
+            URL-safe cursor string
+        """
+        payload = json_util.dumps([sort_value, document_id])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> Tuple[Any, str]:
+        """Decode a cursor produced by :meth:`encode_cursor`.
+
+        Args:
+            cursor: Cursor string from a previous page
+
+        Returns:
+            Tuple of (sort_value, document_id)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            sort_value, document_id = json_util.loads(
+                base64.urlsafe_b64decode(padded.encode()).decode(),
+                json_options=_CURSOR_JSON_OPTIONS
+            )
+        except (ValueError, TypeError) as error:
+            raise InvalidCursorError("Invalid pagination cursor") from error
+
+        if not isinstance(document_id, str):
+            raise InvalidCursorError("Invalid pagination cursor")
+        return sort_value, document_id
+
+    def build_query(self, query: dict, sort_field: str, direction: int, cursor: Optional[str]) -> dict:
+        """Restrict a query to documents after the cursor position.
+
+        Args:
+            query: Base filter of the list endpoint
+            sort_field: Field the page is sorted by
+            direction: ASCENDING or DESCENDING
+            cursor: Cursor from the previous page, if any
+
+        Returns:
+            Filter selecting the next page
+        """
+        if not cursor:
+            return query
+
+        sort_value, document_id = self.decode_cursor(cursor)
+        operator = "$gt" if direction == ASCENDING else "$lt"
+        after_cursor = {"$or": [
+            {sort_field: {operator: sort_value}},
+            {sort_field: sort_value, "id": {operator: document_id}},
+        ]}
+        return {"$and": [query, after_cursor]} if query else after_cursor
+
+    def open_cursor(
+        self,
+        collection,
+        query: dict,
+        sort_field: str,
+        direction: int = DESCENDING,
+        cursor: Optional[str] = None,
+        projection: Optional[dict] = None
+    ):
+        """Open a Motor cursor positioned after ``cursor`` in keyset order.
+
+        Args:
+            collection: Motor collection to read
+            query: Base filter of the list endpoint
+            sort_field: Field the results are sorted by
+            direction: ASCENDING or DESCENDING
+            cursor: Cursor from the previous page, if any
+            projection: Projection passed to find()
+
+        Returns:
+            Unbounded Motor cursor; callers apply their own limit
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        return collection.find(
+            self.build_query(query, sort_field, direction, cursor),
+            projection if projection is not None else {"_id": 0}
+        ).sort([(sort_field, direction), ("id", direction)])
+
+    async def fetch_page(
+        self,
+        collection,
+        query: dict,
+        sort_field: str,
+        direction: int = DESCENDING,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        projection: Optional[dict] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Fetch one page of documents.
+
+        Args:
+            collection: Motor collection to read
+            query: Base filter of the list endpoint
+            sort_field: Field the page is sorted by
+            direction: ASCENDING or DESCENDING
+            limit: Requested page size
+            cursor: Cursor from the previous page, if any
+            projection: Projection passed to find()
+
+        Returns:
+            Tuple of (documents, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        page_size = self.resolve_limit(limit)
+        documents = await self.open_cursor(
+            collection, query, sort_field, direction, cursor, projection
+        ).to_list(page_size + 1)
+
+        next_cursor = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            last = documents[-1]
+            next_cursor = self.encode_cursor(last.get(sort_field), last["id"])
+
+        return documents, next_cursor
+
+    async def count(self, collection, query: dict) -> int:
+        """Count the documents matching a list filter.
+
+        An unfiltered count uses collection metadata instead of a scan.
+        """
+        if not query:
+            return await collection.estimated_document_count()
+        return await collection.count_documents(query)
+
+# Export service instance
+keyset_pagination_service = KeysetPaginationService()
@@ -0,0 +1,81 @@
+"""Atomic student fee ledger updates."""
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+from database import database
+
+# Pipeline stage deriving payment_status from paid_amount and total_fees
+PAYMENT_STATUS_STAGE = {
+    "$set": {
+        "payment_status": {
+            "$switch": {
+                "branches": [
+                    {"case": {"$gte": ["$paid_amount", "$total_fees"]}, "then": "paid"},
+                    {"case": {"$gt": ["$paid_amount", 0]}, "then": "partial"},
+                ],
+                "default": "unpaid"
+            }
+        }
+    }
+}
+
+class PaymentLedgerService:
+    """Applies payments to a student's running total in a single write.
+
+    Each payment increments ``paid_amount`` and re-derives ``payment_status``
+    inside one pipeline update, so concurrent payments for the same student
+    never overwrite each other and no payment history is re-aggregated.
+    """
+
+    async def apply_payment(self, student_id: str, amount: float) -> Optional[dict]:
+        """Add a payment (or a negative reversal) to a student's total.
+
+        Args:
+            student_id: Student identifier
+            amount: Amount paid; negative to reverse a payment
+
+        Returns:
+            Updated ``paid_amount``, ``total_fees`` and ``payment_status``,
+            or None if the student does not exist
+        """
+        return await database.students.find_one_and_update(
+            {"id": student_id},
+            [
+                {"$set": {"paid_amount": {"$add": [{"$ifNull": ["$paid_amount", 0]}, amount]}}},
+                PAYMENT_STATUS_STAGE,
+            ],
+            projection={"_id": 0, "paid_amount": 1, "total_fees": 1, "payment_status": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def refresh_status(self, student_id: str) -> None:
+        """Re-derive ``payment_status`` after a fee change."""
+        await database.students.update_one({"id": student_id}, [PAYMENT_STATUS_STAGE])
+
+    async def rebuild_student_total(self, student_id: str) -> float:
+        """Recompute a student's total from the payments collection.
+
+        Only needed to repair a total; the regular path is :meth:`apply_payment`.
+
+        Args:
+            student_id: Student identifier
+
+        Returns:
+            The recomputed paid amount
+        """
+        pipeline = [
+            {"$match": {"student_id": student_id}},
+            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        ]
+        result = await database.payments.aggregate(pipeline).to_list(length=1)
+        total_paid = result[0]["total"] if result else 0.0
+
+        await database.students.update_one(
+            {"id": student_id},
+            [{"$set": {"paid_amount": total_paid}}, PAYMENT_STATUS_STAGE]
+        )
+        return total_paid
+
+# Export service instance
+payment_ledger_service = PaymentLedgerService()
@@ -4,7 +4,8 @@ from datetime import datetime
 
 from database import database
 from models import PaymentCreateSchema, PaymentResponseSchema
-from .student_service import student_management_service
+from .payment_ledger_service import payment_ledger_service
+from .document_codec_service import document_codec_service
 
 class PaymentManagementService:
     """Service for managing payment CRUD operations."""
@@ -33,38 +34,15 @@ class PaymentManagementService:
             student_name=student_name
         )
         
-        document = payment_response.model_dump()
-        document["payment_date"] = document["payment_date"].isoformat()
-        document["created_at"] = document["created_at"].isoformat()
+        document = document_codec_service.encode(payment_response)
         
         await database.payments.insert_one(document)
         
         # Update student payment status
-        await self._update_student_payment_total(payment_data.student_id)
+        await payment_ledger_service.apply_payment(payment_data.student_id, payment_response.amount)
         
         return payment_response
     
-    async def _update_student_payment_total(self, student_id: str) -> None:
-        """Recalculate and update student's total paid amount.
-        
-        Args:
-            student_id: Student identifier
-        """
-        # Calculate total paid by student
-        pipeline = [
-            {"$match": {"student_id": student_id}},
-            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
-        ]
-        
-        result = await database.payments.aggregate(pipeline).to_list(length=1)
-        total_paid = result[0]["total"] if result else 0.0
-        
-        # Update student payment status
-        await student_management_service.update_student_payment_status(
-            student_id,
-            total_paid
-        )
-    
     async def get_payment_by_id(self, payment_id: str) -> Optional[dict]:
         """Retrieve payment by ID.
         
@@ -137,9 +115,9 @@ class PaymentManagementService:
         
         result = await database.payments.delete_one({"id": payment_id})
         
-        # Update student payment status
+        # Reverse the payment on the student's total
         if result.deleted_count > 0:
-            await self._update_student_payment_total(payment["student_id"])
+            await payment_ledger_service.apply_payment(payment["student_id"], -payment["amount"])
         
         return result.deleted_count > 0
 
@@ -0,0 +1,178 @@
+"""In-process caching of authenticated principals and decoded access tokens."""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from config import SecurityConfig
+
+class TimedLRUCache:
+    """Size-bounded LRU cache whose entries expire after a time-to-live."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove a key and return its value if it was cached."""
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def items(self):
+        """Iterate over (key, value) pairs, including not-yet-purged expired ones."""
+        return [(key, value) for key, (_, value) in self._entries.items()]
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class PrincipalCacheService:
+    """Caches user documents by ID and decoded JWT payloads by token hash.
+
+    Entries are short-lived so that changes made by other workers become
+    visible within the TTL; writes in this process invalidate explicitly.
+    """
+
+    def __init__(
+        self,
+        principal_ttl_seconds: float = SecurityConfig.PRINCIPAL_CACHE_TTL_SECONDS,
+        principal_max_entries: int = SecurityConfig.PRINCIPAL_CACHE_MAX_ENTRIES,
+        token_max_entries: int = SecurityConfig.TOKEN_CACHE_MAX_ENTRIES
+    ):
+        self.principals = TimedLRUCache(principal_max_entries, principal_ttl_seconds)
+        self.tokens = TimedLRUCache(token_max_entries, principal_ttl_seconds)
+        self.counters: Dict[str, int] = {
+            "principal_hits": 0,
+            "principal_misses": 0,
+            "token_hits": 0,
+            "token_misses": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def decode_token(self, token: str, decoder: Callable[[str], dict]) -> dict:
+        """Return the decoded payload for a token, decoding it at most once per TTL.
+
+        Args:
+            token: Raw bearer token
+            decoder: Function that validates and decodes the token
+
+        Returns:
+            Decoded token payload
+
+        Raises:
+            Whatever the decoder raises for expired or invalid tokens
+        """
+        key = self._token_key(token)
+        payload = self.tokens.get(key)
+
+        if payload is not None:
+            self.counters["token_hits"] += 1
+            return payload
+
+        self.counters["token_misses"] += 1
+        payload = decoder(token)
+
+        # Never keep a payload around past the token's own expiry
+        ttl = None
+        if isinstance(payload.get("exp"), (int, float)):
+            ttl = payload["exp"] - time.time()
+        self.tokens.set(key, payload, ttl)
+
+        return payload
+
+    async def get_principal(
+        self,
+        user_id: str,
+        loader: Callable[[str], Awaitable[Optional[dict]]]
+    ) -> Optional[dict]:
+        """Return the user document for an ID, loading it on a cache miss.
+
+        Args:
+            user_id: Unique user identifier
+            loader: Coroutine function fetching the user document from the database
+
+        Returns:
+            A copy of the user document, or None if the user does not exist
+        """
+        principal = self.principals.get(user_id)
+
+        if principal is not None:
+            self.counters["principal_hits"] += 1
+            return dict(principal)
+
+        self.counters["principal_misses"] += 1
+        principal = await loader(user_id)
+
+        if principal is None:
+            return None
+
+        principal.pop("password", None)
+        self.principals.set(user_id, dict(principal))
+        return principal
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop the cached principal for a user ID."""
+        self.counters["invalidations"] += 1
+        self.principals.pop(user_id)
+
+    def invalidate_email(self, email: str) -> None:
+        """Drop any cached principal registered under an email address."""
+        self.counters["invalidations"] += 1
+        for user_id, principal in self.principals.items():
+            if principal.get("email") == email:
+                self.principals.pop(user_id)
+
+    def clear(self) -> None:
+        """Drop every cached principal and token."""
+        self.principals.clear()
+        self.tokens.clear()
+
+    def get_statistics(self) -> dict:
+        """Return hit/miss counters and current cache sizes."""
+        principal_lookups = self.counters["principal_hits"] + self.counters["principal_misses"]
+
+        return {
+            **self.counters,
+            "principal_hit_ratio": (
+                self.counters["principal_hits"] / principal_lookups if principal_lookups else 0.0
+            ),
+            "cached_principals": len(self.principals),
+            "cached_tokens": len(self.tokens),
+        }
+
+# Export service instance
+principal_cache_service = PrincipalCacheService()
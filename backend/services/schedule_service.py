@@ -0,0 +1,278 @@
+"""Class schedule generation."""
+import heapq
+import logging
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple, Union
+
+from config import ImportConfig
+from database import database
+from models import ClassScheduleResponseSchema
+from .document_codec_service import document_codec_service
+from .upload_service import FIRST_DATA_ROW, chunked, clean_cell
+
+logger = logging.getLogger(__name__)
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+TIME_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})(?:\s*([AaPp][Mm]))?$")
+
+class ClassScheduleService:
+    """Builds class schedules and writes them in bulk.
+
+    Recurring dates are produced by striding a week at a time from the
+    first occurrence of each weekday instead of testing every calendar day,
+    already scheduled ``(batch_id, class_date)`` pairs are filtered out with
+    one range query, and the rest are written with ``insert_many``.
+    """
+
+    def __init__(self, chunk_size: int = ImportConfig.INSERT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def weekday_dates(start: date, end: date, days_of_week: Iterable[int]) -> List[date]:
+        """List the dates between two days (inclusive) falling on given weekdays.
+
+        Args:
+            start: First day of the range
+            end: Last day of the range
+            days_of_week: Weekdays to keep, 0=Monday ... 6=Sunday
+
+        Returns:
+            Matching dates in ascending order
+
+        Raises:
+            ValueError: If a weekday is out of range or ``end`` precedes ``start``
+        """
+        weekdays = set(days_of_week)
+        if any(day not in range(7) for day in weekdays):
+            raise ValueError("days_of_week must contain values from 0 (Monday) to 6 (Sunday)")
+        if end < start:
+            raise ValueError("end_date must not be before start_date")
+
+        total_days = (end - start).days + 1
+        series = []
+        for weekday in weekdays:
+            first_offset = (weekday - start.weekday()) % 7
+            series.append(start + timedelta(days=offset) for offset in range(first_offset, total_days, 7))
+        return list(heapq.merge(*series))
+
+    async def _scheduled_dates(self, batch_id: str, first: datetime, last: datetime) -> set:
+        cursor = database.classes.find(
+            {"batch_id": batch_id, "class_date": {"$gte": first, "$lte": last}},
+            {"_id": 0, "class_date": 1}
+        )
+        return {document_codec_service.normalize_datetime(document["class_date"]) async for document in cursor}
+
+    async def generate_recurring(
+        self,
+        batch: dict,
+        start: date,
+        end: date,
+        days_of_week: Iterable[int],
+        class_time: str,
+        institute_id: str
+    ) -> dict:
+        """Schedule a batch's classes on the given weekdays of a date range.
+
+        Dates that already have a class for the batch are skipped, so
+        running the generator again does not duplicate the schedule.
+
+        Args:
+            batch: Batch being scheduled
+            start: First day of the range
+            end: Last day of the range
+            days_of_week: Weekdays to schedule, 0=Monday ... 6=Sunday
+            class_time: Time of day shown for each class
+            institute_id: Institute identifier
+
+        Returns:
+            Created and skipped dates as ``YYYY-MM-DD`` strings
+
+        Raises:
+            ValueError: If a weekday is out of range or ``end`` precedes ``start``
+        """
+        class_dates = [
+            datetime.combine(day, time.min, tzinfo=timezone.utc)
+            for day in self.weekday_dates(start, end, days_of_week)
+        ]
+        if not class_dates:
+            return {"created": [], "skipped": []}
+
+        scheduled = await self._scheduled_dates(batch["id"], class_dates[0], class_dates[-1])
+        new_dates = [class_date for class_date in class_dates if class_date not in scheduled]
+
+        for date_chunk in chunked(new_dates, self.chunk_size):
+            await database.classes.insert_many([
+                document_codec_service.encode(ClassScheduleResponseSchema(
+                    batch_id=batch["id"],
+                    batch_name=batch["name"],
+                    class_date=class_date,
+                    class_time=class_time,
+                    tutor_id=batch["tutor_id"],
+                    institute_id=institute_id
+                ))
+                for class_date in date_chunk
+            ])
+
+        logger.info("Scheduled %d recurring classes for batch %s", len(new_dates), batch["id"])
+        return {
+            "created": [class_date.strftime("%Y-%m-%d") for class_date in new_dates],
+            "skipped": [class_date.strftime("%Y-%m-%d") for class_date in class_dates if class_date in scheduled],
+        }
+
+    @staticmethod
+    def _parse_dates(values: List[Any]) -> List[Union[date, None, str]]:
+        """Parse a date column; blanks become None and bad cells an error message."""
+        parsed = []
+        for value in values:
+            if isinstance(value, datetime):
+                parsed.append(value.date())
+            elif isinstance(value, date):
+                parsed.append(value)
+            else:
+                text = clean_cell(value)
+                if text is None:
+                    parsed.append(None)
+                elif DATE_PATTERN.match(text):
+                    try:
+                        parsed.append(date.fromisoformat(text))
+                    except ValueError:
+                        parsed.append(f"'{text}' is not a valid date")
+                else:
+                    parsed.append(f"'{text}' is not in YYYY-MM-DD format")
+        return parsed
+
+    @staticmethod
+    def _parse_times(values: List[Any]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Validate a time column into (time, error) pairs."""
+        parsed = []
+        for value in values:
+            if isinstance(value, time):
+                parsed.append((value.strftime("%H:%M"), None))
+                continue
+            text = clean_cell(value)
+            match = TIME_PATTERN.match(text or "")
+            if match is None:
+                parsed.append((None, f"'{text}' is not a valid time" if text else "time is required"))
+                continue
+            hour, minute, meridiem = int(match.group(1)), int(match.group(2)), match.group(3)
+            max_hour = 12 if meridiem else 23
+            if minute > 59 or hour > max_hour or (meridiem and hour == 0):
+                parsed.append((None, f"'{text}' is not a valid time"))
+            else:
+                parsed.append((text, None))
+        return parsed
+
+    def validate_rows(self, rows: List[Tuple[int, Dict]], start_from: datetime) -> tuple:
+        """Validate a batch of schedule rows column by column.
+
+        Each column is parsed in a single pass and rows without a date get
+        consecutive days after ``start_from``, based on their position in
+        the sheet.
+
+        Args:
+            rows: (row_number, row) pairs with ``time`` and optional
+                ``date`` and ``topic`` columns
+            start_from: Moment the missing-date fallbacks count from
+
+        Returns:
+            Tuple of (valid entries with row, class_date, class_time, topic
+            and date_source, per-row errors)
+        """
+        row_numbers = [row_number for row_number, _ in rows]
+        dates = self._parse_dates([row.get("date") for _, row in rows])
+        times = self._parse_times([row.get("time") for _, row in rows])
+        topics = [clean_cell(row.get("topic")) for _, row in rows]
+        fallbacks = [start_from + timedelta(days=row_number - FIRST_DATA_ROW + 1) for row_number in row_numbers]
+
+        entries = []
+        errors = []
+        for row_number, parsed_date, (class_time, time_error), topic, fallback in zip(row_numbers, dates, times, topics, fallbacks):
+            row_errors = []
+            if isinstance(parsed_date, str):
+                row_errors.append({"row": row_number, "field": "date", "error": parsed_date})
+            if time_error:
+                row_errors.append({"row": row_number, "field": "time", "error": time_error})
+            if row_errors:
+                errors.extend(row_errors)
+                continue
+
+            entries.append({
+                "row": row_number,
+                "class_date": datetime.combine(parsed_date, time.min, tzinfo=timezone.utc) if parsed_date else fallback,
+                "class_time": class_time,
+                "topic": topic,
+                "date_source": "file" if parsed_date else "auto",
+            })
+
+        return entries, errors
+
+    async def import_rows(
+        self,
+        row_batches: AsyncIterable[List[Tuple[int, Dict]]],
+        batch: dict,
+        institute_id: str,
+        dry_run: bool = False
+    ) -> dict:
+        """Create classes from uploaded schedule rows, one batch at a time.
+
+        Rows without a ``date`` are scheduled on consecutive days starting
+        tomorrow, in sheet order. Invalid rows are reported and skipped.
+
+        Args:
+            row_batches: Batches of (row_number, row) pairs with ``time`` and
+                optional ``date`` and ``topic`` columns
+            batch: Batch being scheduled
+            institute_id: Institute identifier
+            dry_run: Validate and preview without writing anything
+
+        Returns:
+            Report with valid/invalid counts, per-row errors and either the
+            normalized preview (dry run) or the created class IDs
+        """
+        start_from = datetime.now(timezone.utc)
+        report = {"valid": 0, "invalid_rows": set(), "errors": [], "preview": [], "class_ids": []}
+
+        async for rows in row_batches:
+            entries, errors = self.validate_rows(rows, start_from)
+            report["valid"] += len(entries)
+            report["errors"].extend(errors)
+            report["invalid_rows"].update(error["row"] for error in errors)
+
+            if dry_run:
+                report["preview"].extend({
+                    **entry,
+                    "class_date": entry["class_date"].strftime("%Y-%m-%d"),
+                } for entry in entries)
+                continue
+
+            if entries:
+                classes = [
+                    ClassScheduleResponseSchema.model_construct(
+                        batch_id=batch["id"],
+                        batch_name=batch["name"],
+                        class_date=entry["class_date"],
+                        class_time=entry["class_time"],
+                        topic=entry["topic"],
+                        tutor_id=batch["tutor_id"],
+                        institute_id=institute_id
+                    )
+                    for entry in entries
+                ]
+                await database.classes.insert_many([document_codec_service.encode(item) for item in classes])
+                report["class_ids"].extend(item.id for item in classes)
+
+        result = {
+            "dry_run": dry_run,
+            "valid": report["valid"],
+            "invalid": len(report["invalid_rows"]),
+            "errors": report["errors"],
+        }
+        if dry_run:
+            result["preview"] = report["preview"]
+        else:
+            result["class_ids"] = report["class_ids"]
+        return result
+
+# Export service instance
+class_schedule_service = ClassScheduleService()
@@ -0,0 +1,178 @@
+"""Cached per-principal visibility scopes for role-based list queries."""
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from config import SecurityConfig
+from models import UserRoleEnum
+from .principal_cache_service import TimedLRUCache
+
+# How tutors and students are restricted in each collection:
+# role -> (document field, PrincipalScope attribute). Every other role sees
+# its whole institute.
+SCOPE_RULES: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "batches": {
+        UserRoleEnum.TUTOR: ("tutor_id", "user_id"),
+        UserRoleEnum.STUDENT: ("id", "batch_ids"),
+    },
+    "students": {
+        UserRoleEnum.TUTOR: ("batch_id", "batch_ids"),
+        UserRoleEnum.STUDENT: ("email", "email"),
+    },
+    "payments": {
+        UserRoleEnum.TUTOR: ("batch_id", "batch_ids"),
+        UserRoleEnum.STUDENT: ("student_id", "student_id"),
+    },
+    "classes": {
+        UserRoleEnum.TUTOR: ("tutor_id", "user_id"),
+        UserRoleEnum.STUDENT: ("batch_id", "batch_ids"),
+    },
+    "materials": {
+        UserRoleEnum.TUTOR: ("batch_id", "batch_ids"),
+        UserRoleEnum.STUDENT: ("batch_id", "batch_ids"),
+    },
+    "homework": {
+        UserRoleEnum.TUTOR: ("tutor_id", "user_id"),
+        UserRoleEnum.STUDENT: ("batch_id", "batch_ids"),
+    },
+}
+
+class PrincipalScope(NamedTuple):
+    """What a principal may see: its own ids plus the batches it belongs to."""
+    user_id: str
+    role: str
+    email: Optional[str]
+    institute_id: str
+    batch_ids: Tuple[str, ...]  # tutor: batches taught; student: batch enrolled in
+    student_id: Optional[str]  # student record of a student user, if any
+
+class PrincipalScopeService:
+    """Resolves and caches each principal's scope.
+
+    A tutor's batch ids and a student's record are looked up once and then
+    served from a TTL-bounded LRU cache keyed by user id. Batch and student
+    writes in this process invalidate the affected entries; changes made by
+    other workers become visible within the TTL.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SecurityConfig.SCOPE_CACHE_TTL_SECONDS,
+        max_entries: int = SecurityConfig.SCOPE_CACHE_MAX_ENTRIES
+    ):
+        self.scopes = TimedLRUCache(max_entries, ttl_seconds)
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    async def _load(self, database, principal: dict) -> PrincipalScope:
+        batch_ids: Tuple[str, ...] = ()
+        student_id = None
+
+        if principal["role"] == UserRoleEnum.TUTOR:
+            batch_ids = tuple(await database.batches.distinct("id", {"tutor_id": principal["id"]}))
+        elif principal["role"] == UserRoleEnum.STUDENT:
+            student = await database.students.find_one(
+                {"email": principal["email"]}, {"_id": 0, "id": 1, "batch_id": 1}
+            )
+            if student:
+                student_id = student["id"]
+                batch_ids = (student["batch_id"],)
+
+        return PrincipalScope(
+            user_id=principal["id"],
+            role=principal["role"],
+            email=principal.get("email"),
+            institute_id=principal.get("institute_id") or principal["id"],
+            batch_ids=batch_ids,
+            student_id=student_id
+        )
+
+    async def resolve(self, database, principal: dict) -> PrincipalScope:
+        """Return the scope of an authenticated principal, loading it on a cache miss.
+
+        Args:
+            database: Motor database to read batches and students from
+            principal: Authenticated user with ``id``, ``role``, ``email`` and ``institute_id``
+
+        Returns:
+            The principal's scope
+        """
+        scope = self.scopes.get(principal["id"])
+        if scope is not None and scope.role == principal["role"]:
+            self.counters["hits"] += 1
+            return scope
+
+        self.counters["misses"] += 1
+        scope = await self._load(database, principal)
+        self.scopes.set(principal["id"], scope)
+        return scope
+
+    @staticmethod
+    def build_filter(scope: PrincipalScope, collection: str) -> dict:
+        """Filter restricting a collection to what the scope may see.
+
+        Args:
+            scope: Resolved principal scope
+            collection: Collection name, see ``SCOPE_RULES``
+
+        Returns:
+            A new filter dict the caller may extend
+        """
+        rule = SCOPE_RULES[collection].get(scope.role)
+        if rule is None:
+            return {"institute_id": scope.institute_id}
+
+        field, attribute = rule
+        value = getattr(scope, attribute)
+        if isinstance(value, tuple):
+            return {field: {"$in": list(value)}}
+        # A student without a record has no student_id and matches nothing
+        return {field: value} if value is not None else {field: {"$in": []}}
+
+    async def build_query(self, database, principal: dict, collection: str) -> dict:
+        """Resolve a principal's scope and build its filter; see :meth:`build_filter`."""
+        return self.build_filter(await self.resolve(database, principal), collection)
+
+    def _drop(self, predicate) -> None:
+        self.counters["invalidations"] += 1
+        for user_id, scope in self.scopes.items():
+            if predicate(scope):
+                self.scopes.pop(user_id)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop the cached scope of a user."""
+        self.counters["invalidations"] += 1
+        self.scopes.pop(user_id)
+
+    def invalidate_batch(self, batch_id: str, tutor_id: Optional[str] = None) -> None:
+        """Drop scopes that include a batch, plus the scope of its (new) tutor.
+
+        Call after a batch is created, deleted or moved to another tutor.
+        """
+        self._drop(lambda scope: batch_id in scope.batch_ids or scope.user_id == tutor_id)
+
+    def invalidate_email(self, *emails: Optional[str]) -> None:
+        """Drop the scopes of users with any of the given emails.
+
+        Call after a student record is created, deleted, moved to another
+        batch or given a new email.
+        """
+        emails = {email for email in emails if email}
+        self._drop(lambda scope: scope.email in emails)
+
+    def invalidate_role(self, role: str) -> None:
+        """Drop every cached scope of a role, e.g. after a bulk student import."""
+        self._drop(lambda scope: scope.role == role)
+
+    def clear(self) -> None:
+        """Drop every cached scope."""
+        self.scopes.clear()
+
+    def get_statistics(self) -> dict:
+        """Return hit/miss counters and the current cache size."""
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": self.counters["hits"] / lookups if lookups else 0.0,
+            "cached_scopes": len(self.scopes),
+        }
+
+# Export service instance
+principal_scope_service = PrincipalScopeService()
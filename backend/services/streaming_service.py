@@ -0,0 +1,81 @@
+"""Incremental JSON / NDJSON encoding of MongoDB cursors."""
+from typing import AsyncIterator, Optional, Type
+
+from pydantic import BaseModel, TypeAdapter
+
+from config import PaginationConfig
+
+# Supported ``stream`` modes and the media type each is served with
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+class DocumentStreamService:
+    """Encodes documents from a Motor cursor as they arrive.
+
+    Documents are validated against the endpoint's response model one at a
+    time and flushed in small chunks, so memory stays bounded by the chunk
+    size and the first bytes go out as soon as MongoDB returns the first
+    batch.
+    """
+
+    def __init__(self, chunk_size: int = PaginationConfig.STREAM_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def is_supported(mode: Optional[str]) -> bool:
+        """Whether ``mode`` is a known stream format."""
+        return mode in STREAM_MEDIA_TYPES
+
+    @staticmethod
+    def media_type(mode: str) -> str:
+        """Media type for a stream format."""
+        return STREAM_MEDIA_TYPES[mode]
+
+    async def iter_encoded(
+        self,
+        cursor,
+        model: Type[BaseModel],
+        mode: str
+    ) -> AsyncIterator[bytes]:
+        """Yield the cursor's documents encoded in ``mode``.
+
+        Args:
+            cursor: Motor cursor to drain
+            model: Response model each document is validated against
+            mode: ``ndjson`` for one document per line, ``json`` for an array
+
+        Yields:
+            Encoded chunks of up to ``chunk_size`` documents
+        """
+        adapter = TypeAdapter(model)
+        separator = b"\n" if mode == "ndjson" else b","
+        chunk = []
+        first = True
+
+        if mode == "json":
+            yield b"["
+
+        async for document in cursor.batch_size(self.chunk_size):
+            chunk.append(adapter.dump_json(adapter.validate_python(document)))
+            if len(chunk) >= self.chunk_size:
+                yield self._join(chunk, separator, mode, first)
+                first = False
+                chunk = []
+
+        if chunk:
+            yield self._join(chunk, separator, mode, first)
+
+        if mode == "json":
+            yield b"]"
+
+    @staticmethod
+    def _join(chunk: list, separator: bytes, mode: str, first: bool) -> bytes:
+        body = separator.join(chunk)
+        if mode == "ndjson":
+            return body + b"\n"
+        return body if first else b"," + body
+
+# Export service instance
+document_stream_service = DocumentStreamService()
@@ -0,0 +1,202 @@
+"""Bulk student import pipeline."""
+import logging
+from typing import AsyncIterable, Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from config import ImportConfig
+from database import database
+from models import StudentResponseSchema, UserResponseSchema, UserRoleEnum, normalize_email
+from .account_activation_service import account_activation_service
+from .document_codec_service import document_codec_service
+from .upload_service import chunked, clean_cell
+
+logger = logging.getLogger(__name__)
+
+# Write error code MongoDB reports for a unique index violation
+DUPLICATE_KEY_ERROR = 11000
+
+class StudentImportService:
+    """Validates and writes a student sheet one bounded batch at a time.
+
+    Each batch of rows is validated before any of it is written; existing
+    users and enrolments are looked up with one ``$in`` query per batch;
+    students and their pending user accounts are written with unordered
+    ``insert_many`` calls. Failures are reported per row instead of
+    aborting the import.
+    """
+
+    def __init__(self, chunk_size: int = ImportConfig.INSERT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def validate_rows(self, rows: Iterable[Tuple[int, Dict]], batch: dict, institute_id: str, seen_emails: set) -> tuple:
+        """Build student records from raw rows.
+
+        Args:
+            rows: (row_number, row) pairs, rows keyed by column name
+            batch: Batch the students join
+            institute_id: Institute identifier
+            seen_emails: Normalized emails from earlier rows; updated in place
+
+        Returns:
+            Tuple of (valid rows as (row_number, student) pairs, per-row error reports)
+        """
+        valid = []
+        errors = []
+
+        for row_number, row in rows:
+            phone = clean_cell(row.get("phone"))
+            email = normalize_email(clean_cell(row.get("email")) or "")
+
+            if email in seen_emails:
+                errors.append({"row": row_number, "email": email, "status": "error", "error": "Duplicate email in file"})
+                continue
+
+            try:
+                total_fees = clean_cell(row.get("total_fees"))
+                student = StudentResponseSchema(
+                    name=clean_cell(row.get("name")) or "",
+                    email=email,
+                    phone=phone or "",
+                    whatsapp=clean_cell(row.get("whatsapp")) or phone,
+                    batch_id=batch["id"],
+                    batch_name=batch["name"],
+                    total_fees=float(total_fees) if total_fees is not None else 0.0,
+                    paid_amount=0.0,
+                    institute_id=institute_id
+                )
+                if not student.name or not student.phone:
+                    raise ValueError("name and phone are required")
+            except (ValidationError, ValueError) as error:
+                message = error.errors()[0]["msg"] if isinstance(error, ValidationError) else str(error)
+                errors.append({"row": row_number, "email": email or None, "status": "error", "error": message})
+                continue
+
+            seen_emails.add(email)
+            valid.append((row_number, student))
+
+        return valid, errors
+
+    async def _existing_emails(self, collection, query: dict, emails: List[str]) -> set:
+        existing = set()
+        for email_chunk in chunked(emails, self.chunk_size):
+            cursor = collection.find({**query, "email": {"$in": email_chunk}}, {"_id": 0, "email": 1})
+            async for document in cursor:
+                existing.add(document["email"])
+        return existing
+
+    async def _insert_chunks(self, collection, documents: List[dict]) -> Dict[int, int]:
+        """Insert documents unordered in chunks; return the error code of each index that failed."""
+        failed = {}
+        for chunk_start in range(0, len(documents), self.chunk_size):
+            chunk = documents[chunk_start:chunk_start + self.chunk_size]
+            try:
+                await collection.insert_many(chunk, ordered=False)
+            except BulkWriteError as error:
+                for write_error in error.details.get("writeErrors", []):
+                    failed[chunk_start + write_error["index"]] = write_error.get("code")
+        return failed
+
+    async def _import_batch(self, valid: List[Tuple[int, StudentResponseSchema]], batch: dict, institute_id: str, report: dict) -> None:
+        emails = [student.email for _, student in valid]
+        enrolled = await self._existing_emails(database.students, {"batch_id": batch["id"]}, emails)
+        existing_users = await self._existing_emails(database.users, {}, emails)
+
+        to_insert = []
+        for row_number, student in valid:
+            if student.email in enrolled:
+                report["rows"].append({"row": row_number, "email": student.email, "status": "skipped", "error": "Already enrolled in this batch"})
+            else:
+                to_insert.append((row_number, student))
+
+        student_documents = [document_codec_service.encode(student) for _, student in to_insert]
+        failed_students = await self._insert_chunks(database.students, student_documents)
+
+        created = []
+        user_documents = []
+        activations = []
+        for index, (row_number, student) in enumerate(to_insert):
+            if index in failed_students:
+                report["rows"].append({"row": row_number, "email": student.email, "status": "error", "error": "Could not save student"})
+                continue
+            created.append((row_number, student))
+            if student.email not in existing_users:
+                user = UserResponseSchema(
+                    email=student.email,
+                    name=student.name,
+                    role=UserRoleEnum.STUDENT,
+                    phone=student.phone,
+                    whatsapp=student.whatsapp,
+                    institute_id=institute_id
+                )
+                activation_token, credentials = account_activation_service.build_pending_credentials()
+                user_document = document_codec_service.encode(user)
+                user_document.update(credentials)
+                user_documents.append(user_document)
+                activations.append((student.email, activation_token))
+
+        # A unique email index makes a concurrently created account fail here instead of duplicating
+        failed_users = await self._insert_chunks(database.users, user_documents)
+        concurrent_user_emails = {
+            user_documents[index]["email"] for index, code in failed_users.items() if code == DUPLICATE_KEY_ERROR
+        }
+        unsaved_user_emails = {
+            user_documents[index]["email"] for index, code in failed_users.items() if code != DUPLICATE_KEY_ERROR
+        }
+
+        # A student left without an account could never sign in, so undo it
+        orphaned_ids = [student.id for _, student in created if student.email in unsaved_user_emails]
+        if orphaned_ids:
+            await database.students.delete_many({"id": {"$in": orphaned_ids}})
+
+        for row_number, student in created:
+            if student.email in unsaved_user_emails:
+                report["rows"].append({"row": row_number, "email": student.email, "status": "error", "error": "Could not create user account"})
+                continue
+            row_report = {"row": row_number, "email": student.email, "status": "created"}
+            if student.email in existing_users or student.email in concurrent_user_emails:
+                row_report["note"] = "Existing user account kept"
+            report["rows"].append(row_report)
+            report["students"].append(student.name)
+            report["total_fees"] += student.total_fees
+
+        report["activations"].extend(
+            activation for activation in activations
+            if activation[0] not in concurrent_user_emails and activation[0] not in unsaved_user_emails
+        )
+
+    async def import_students(self, row_batches: AsyncIterable[List[Tuple[int, Dict]]], batch: dict, institute_id: str) -> dict:
+        """Import a sheet of students into a batch.
+
+        Args:
+            row_batches: Batches of (row_number, row) pairs, rows keyed by column name
+            batch: Batch the students join
+            institute_id: Institute identifier
+
+        Returns:
+            Report with created/skipped/failed counts, per-row results, the
+            created students' names and total fees, and the activation
+            tokens to deliver
+        """
+        report = {"rows": [], "students": [], "total_fees": 0.0, "activations": []}
+        seen_emails = set()
+
+        async for rows in row_batches:
+            valid, errors = self.validate_rows(rows, batch, institute_id, seen_emails)
+            report["rows"].extend(errors)
+            if valid:
+                await self._import_batch(valid, batch, institute_id, report)
+
+        report["rows"].sort(key=lambda row_report: row_report["row"])
+        logger.info("Imported %d students into batch %s", len(report["students"]), batch["id"])
+
+        return {
+            "created": len(report["students"]),
+            "skipped": sum(1 for row_report in report["rows"] if row_report["status"] == "skipped"),
+            "failed": sum(1 for row_report in report["rows"] if row_report["status"] == "error"),
+            **report,
+        }
+
+# Export service instance
+student_import_service = StudentImportService()
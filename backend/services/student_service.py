@@ -1,16 +1,21 @@
 """Student management services."""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+from pymongo import ReturnDocument
 
 from database import database
 from models import (
     StudentCreateSchema,
     StudentResponseSchema,
     StudentUpdateSchema,
-    UserCreateSchema,
+    UserResponseSchema,
     UserRoleEnum
 )
 from .user_service import user_management_service
+from .principal_cache_service import principal_cache_service
+from .token_version_service import TOKEN_CLAIM_FIELDS, token_version_registry_service
+from .document_codec_service import document_codec_service
+from .payment_ledger_service import PAYMENT_STATUS_STAGE, payment_ledger_service
 
 class StudentManagementService:
     """Service for managing student CRUD operations."""
@@ -19,29 +24,30 @@ class StudentManagementService:
         self,
         student_data: StudentCreateSchema,
         institute_id: str
-    ) -> StudentResponseSchema:
+    ) -> Tuple[StudentResponseSchema, str]:
         """Create a new student with associated user account.
         
+        The account stays pending until the student activates it, so the
+        caller must deliver the returned activation token to the student.
+        
         Args:
             student_data: Student creation data
             institute_id: Institute identifier
             
         Returns:
-            Created student response schema
+            Tuple of the created student and its one-time activation token
         """
-        # Create user account for student with temporary password
-        user_data = UserCreateSchema(
+        # Create student user account; the password is provisioned on first login
+        user_data = UserResponseSchema(
             email=student_data.email,
-            password="Student@123",
             name=student_data.name,
             role=UserRoleEnum.STUDENT,
             phone=student_data.phone,
             whatsapp=student_data.whatsapp,
-            institute_id=institute_id,
-            must_change_password=True
+            institute_id=institute_id
         )
         
-        created_user = await user_management_service.create_user(user_data, institute_id)
+        created_user, activation_token = await user_management_service.create_pending_user(user_data)
         
         # Get batch name
         batch = await database.batches.find_one({"id": student_data.batch_id})
@@ -55,12 +61,11 @@ class StudentManagementService:
             batch_name=batch_name
         )
         
-        document = student_response.model_dump()
-        document["created_at"] = document["created_at"].isoformat()
+        document = document_codec_service.encode(student_response)
         
         await database.students.insert_one(document)
         
-        return student_response
+        return student_response, activation_token
     
     async def get_student_by_id(self, student_id: str) -> Optional[dict]:
         """Retrieve student by ID.
@@ -125,6 +130,9 @@ class StudentManagementService:
             {"$set": update_dict}
         )
         
+        if "total_fees" in update_dict:
+            await payment_ledger_service.refresh_status(student_id)
+        
         # Update user record if email/name/phone changed
         user_updates = {}
         if "email" in update_dict:
@@ -135,10 +143,24 @@ class StudentManagementService:
             user_updates["phone"] = update_dict["phone"]
         
         if user_updates:
-            await database.users.update_one(
+            current = await database.users.find_one(
+                {"id": student_id},
+                {"_id": 0, **{field: 1 for field in TOKEN_CLAIM_FIELDS}}
+            ) or {}
+            user_operations = {"$set": user_updates}
+            # Tokens carry the email and name as claims, so changing them revokes the tokens
+            if token_version_registry_service.claims_changed(current, user_updates):
+                token_version_registry_service.add_version_bump(user_operations)
+            
+            updated_user = await database.users.find_one_and_update(
                 {"id": student_id},
-                {"$set": user_updates}
+                user_operations,
+                projection={"_id": 0, "token_version": 1},
+                return_document=ReturnDocument.AFTER
             )
+            principal_cache_service.invalidate_user(student_id)
+            if updated_user:
+                token_version_registry_service.register(student_id, updated_user.get("token_version", 0))
         
         return result.modified_count > 0
     
@@ -156,6 +178,8 @@ class StudentManagementService:
         
         # Delete user account
         await database.users.delete_one({"id": student_id})
+        principal_cache_service.invalidate_user(student_id)
+        await token_version_registry_service.revoke(database, student_id)
         
         return student_result.deleted_count > 0
     
@@ -166,26 +190,9 @@ class StudentManagementService:
             student_id: Student identifier
             paid_amount: Total amount paid
         """
-        student = await self.get_student_by_id(student_id)
-        
-        if not student:
-            return
-        
-        total_fees = student.get("total_fees", 0.0)
-        
-        if paid_amount >= total_fees:
-            payment_status = "paid"
-        elif paid_amount > 0:
-            payment_status = "partial"
-        else:
-            payment_status = "unpaid"
-        
         await database.students.update_one(
             {"id": student_id},
-            {"$set": {
-                "paid_amount": paid_amount,
-                "payment_status": payment_status
-            }}
+            [{"$set": {"paid_amount": paid_amount}}, PAYMENT_STATUS_STAGE]
         )
 
 # Export service instance
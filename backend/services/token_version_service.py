@@ -0,0 +1,193 @@
+"""In-memory token version registry backing stateless JWT authorization."""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import SecurityConfig
+
+logger = logging.getLogger(__name__)
+
+# User fields copied into access token claims; changing one must revoke old tokens
+TOKEN_CLAIM_FIELDS = ("email", "name")
+
+# Incremental refreshes re-read this much history before the previous refresh,
+# covering clock skew between workers and writes that committed late
+REFRESH_OVERLAP_SECONDS = 30
+
+class TokenVersionRegistryService:
+    """Tracks the ``token_version`` of users whose tokens were revoked.
+
+    Tokens embed the version they were issued with. Bumping a user's version
+    (password change, claim change) or deleting the user makes older tokens
+    invalid. Only users whose version was ever bumped are held in memory;
+    everyone else is at version 0. Deletions are recorded in
+    ``token_revocations``. Every few seconds the registry reads the bumps
+    and revocations made since its last refresh, so revocations made by
+    other workers take effect within one interval.
+    """
+
+    def __init__(self, refresh_interval_seconds: float = SecurityConfig.TOKEN_VERSION_REFRESH_SECONDS):
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._versions: Dict[str, int] = {}
+        self._revoked: Dict[str, float] = {}
+        self._last_refresh: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.counters = {
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "accepted": 0,
+            "rejected": 0,
+        }
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the registry has completed at least one refresh."""
+        return self._last_refresh is not None
+
+    @staticmethod
+    def add_version_bump(update_operations: dict) -> dict:
+        """Extend a ``users`` update so it revokes the user's existing tokens.
+
+        Args:
+            update_operations: Update document, modified in place
+
+        Returns:
+            The same update document
+        """
+        update_operations.setdefault("$inc", {})["token_version"] = 1
+        update_operations.setdefault("$set", {})["token_version_updated_at"] = datetime.now(timezone.utc)
+        return update_operations
+
+    @staticmethod
+    def claims_changed(user: dict, update_data: dict) -> bool:
+        """Whether an update changes a value embedded in the user's tokens.
+
+        Args:
+            user: Current user document, or the fields of it in ``TOKEN_CLAIM_FIELDS``
+            update_data: Fields about to be set
+
+        Returns:
+            True if a token claim gets a new value
+        """
+        return any(
+            field in update_data and update_data[field] != user.get(field)
+            for field in TOKEN_CLAIM_FIELDS
+        )
+
+    async def refresh(self, database) -> None:
+        """Load token version bumps and revocations from the database.
+
+        The first refresh reads every bumped user and every unexpired
+        revocation; later ones read only what changed since the previous
+        refresh.
+
+        Args:
+            database: Motor database holding ``users`` and ``token_revocations``
+        """
+        started_at = time.time()
+
+        if self._last_refresh is None:
+            user_filter = {"token_version": {"$gt": 0}}
+            revocation_filter = {}
+        else:
+            since = datetime.fromtimestamp(self._last_refresh - REFRESH_OVERLAP_SECONDS, timezone.utc)
+            user_filter = {"token_version_updated_at": {"$gte": since}}
+            revocation_filter = {"revoked_at": {"$gte": since}}
+
+        async for user in database.users.find(user_filter, {"_id": 0, "id": 1, "token_version": 1}):
+            version = user.get("token_version", 0)
+            if version > self._versions.get(user["id"], 0):
+                self._versions[user["id"]] = version
+
+        async for revocation in database.token_revocations.find(revocation_filter, {"_id": 0, "user_id": 1}):
+            self._versions.pop(revocation["user_id"], None)
+            self._revoked.setdefault(revocation["user_id"], started_at)
+
+        # Tokens issued before a revocation have expired once the token lifetime passed
+        expired_before = started_at - SecurityConfig.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        self._revoked = {
+            user_id: revoked_at for user_id, revoked_at in self._revoked.items() if revoked_at >= expired_before
+        }
+
+        self._last_refresh = started_at
+        self.counters["refreshes"] += 1
+
+    def is_token_current(self, user_id: str, token_version: int) -> bool:
+        """Check whether a token's version is still the user's current one.
+
+        Args:
+            user_id: User identifier from the ``sub`` claim
+            token_version: Version embedded in the token
+
+        Returns:
+            True if the token has not been revoked
+        """
+        accepted = user_id not in self._revoked and token_version == self._versions.get(user_id, 0)
+
+        self.counters["accepted" if accepted else "rejected"] += 1
+        return accepted
+
+    def register(self, user_id: str, token_version: int = 0) -> None:
+        """Record a user's current version after a create or a version bump in this process."""
+        if token_version:
+            self._versions[user_id] = token_version
+        else:
+            self._versions.pop(user_id, None)
+        self._revoked.pop(user_id, None)
+
+    async def revoke(self, database, user_id: str) -> None:
+        """Invalidate every token of a deleted user, in every worker.
+
+        Args:
+            database: Motor database holding ``token_revocations``
+            user_id: Deleted user's identifier
+        """
+        self._versions.pop(user_id, None)
+        self._revoked[user_id] = time.time()
+        await database.token_revocations.update_one(
+            {"user_id": user_id},
+            {"$set": {"revoked_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def _refresh_periodically(self, database) -> None:
+        while True:
+            try:
+                await self.refresh(database)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.counters["refresh_failures"] += 1
+                logger.exception("Token version refresh failed")
+            await asyncio.sleep(self.refresh_interval_seconds)
+
+    def start(self, database) -> None:
+        """Start the periodic refresh task on the running event loop."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_periodically(database))
+
+    async def stop(self) -> None:
+        """Cancel the periodic refresh task."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def get_statistics(self) -> dict:
+        """Return refresh and validation counters."""
+        return {
+            **self.counters,
+            "tracked_users": len(self._versions),
+            "revoked_users": len(self._revoked),
+            "seconds_since_refresh": (
+                time.time() - self._last_refresh if self._last_refresh is not None else None
+            ),
+        }
+
+# Export service instance
+token_version_registry_service = TokenVersionRegistryService()
@@ -0,0 +1,217 @@
+"""Incremental parsing of uploaded CSV and Excel sheets."""
+import csv
+import io
+import shutil
+import tempfile
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from config import ImportConfig
+
+# Spreadsheet row numbers start at 1 and row 1 is the header
+FIRST_DATA_ROW = 2
+
+# Leading bytes of .xlsx/.xlsm workbooks (zip archives) and legacy .xls (OLE2) files
+XLSX_SIGNATURE = b"PK\x03\x04"
+XLS_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size or row limit."""
+
+class UnsupportedUploadError(ValueError):
+    """Raised when an upload is not a CSV file or an .xlsx workbook."""
+
+class SheetRows(NamedTuple):
+    """An opened sheet: its header, a lazy row iterator and the row count if known."""
+    columns: List[str]
+    rows: Iterator[Tuple[int, dict]]
+    total_rows: Optional[int]
+
+def clean_cell(value: Any) -> Optional[str]:
+    """Normalize a spreadsheet cell to a stripped string, or None if empty.
+
+    Whole-number floats (how Excel hands back phone numbers) lose their
+    trailing ``.0``; NaN, None and blank strings become None.
+    """
+    if value is None or value != value:  # NaN is the only value not equal to itself
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return text or None
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into consecutive lists of at most ``size`` items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class UploadIngestionService:
+    """Reads uploaded sheets row by row from the spooled request file.
+
+    Starlette spools uploads to a temporary file, so sheets are never
+    loaded into memory whole: CSV files are streamed through the standard
+    library ``csv`` reader and Excel workbooks are opened in openpyxl
+    read-only mode. openpyxl is only imported when a workbook is uploaded,
+    which keeps it out of worker start-up. Size and row limits are checked
+    before any row is handed to an importer.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = ImportConfig.MAX_UPLOAD_BYTES,
+        max_rows: int = ImportConfig.MAX_ROWS,
+        batch_size: int = ImportConfig.INSERT_CHUNK_SIZE
+    ):
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+
+    @staticmethod
+    def is_excel(file: BinaryIO, filename: Optional[str] = None) -> bool:
+        """Whether an upload should be parsed as an Excel workbook.
+
+        The type is read from the file's leading bytes rather than its name,
+        since renamed and extension-less uploads are common.
+
+        Raises:
+            UnsupportedUploadError: If the file is a legacy .xls workbook
+        """
+        signature = file.read(len(XLS_SIGNATURE))
+        file.seek(0)
+        if signature.startswith(XLS_SIGNATURE):
+            raise UnsupportedUploadError(
+                f"{filename or 'File'} is a legacy .xls workbook, which is not supported; save it as .xlsx or CSV"
+            )
+        return signature.startswith(XLSX_SIGNATURE)
+
+    def _check_size(self, file: BinaryIO) -> None:
+        file.seek(0, io.SEEK_END)
+        size = file.tell()
+        file.seek(0)
+        if size > self.max_bytes:
+            raise UploadTooLargeError(f"File is larger than the {self.max_bytes / (1024 * 1024):g} MB upload limit")
+
+    def _check_row_count(self, row_count: Optional[int]) -> None:
+        if row_count is not None and row_count > self.max_rows:
+            raise UploadTooLargeError(f"File has more than the {self.max_rows} row limit")
+
+    def _limit_rows(self, rows: Iterator[Tuple[int, dict]]) -> Iterator[Tuple[int, dict]]:
+        for count, row in enumerate(rows, start=1):
+            self._check_row_count(count)
+            yield row
+
+    def _count_csv_rows(self, file: BinaryIO) -> int:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            # Blank lines are skipped when rows are read, so they do not count either
+            return max(sum(1 for record in csv.reader(text) if record) - 1, 0)
+        finally:
+            text.detach()
+            file.seek(0)
+
+    def _open_csv(self, file: BinaryIO) -> SheetRows:
+        total_rows = self._count_csv_rows(file)
+        self._check_row_count(total_rows)
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            text.detach()
+            raise ValueError("File is empty")
+        columns = [column.strip() for column in header]
+
+        def rows():
+            try:
+                for row_number, record in enumerate(reader, start=FIRST_DATA_ROW):
+                    if record:
+                        yield row_number, dict(zip(columns, record))
+            finally:
+                text.detach()
+
+        return SheetRows(columns, rows(), total_rows)
+
+    def _open_excel(self, file: BinaryIO) -> SheetRows:
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        sheet = workbook.active
+        total_rows = sheet.max_row - 1 if sheet.max_row is not None else None
+        self._check_row_count(total_rows)
+
+        values = sheet.iter_rows(values_only=True)
+        header = next(values, None) or ()
+        columns = [clean_cell(column) or "" for column in header]
+
+        def rows():
+            try:
+                for row_number, record in enumerate(values, start=FIRST_DATA_ROW):
+                    if any(cell is not None for cell in record):
+                        yield row_number, dict(zip(columns, record))
+            finally:
+                workbook.close()
+
+        return SheetRows(columns, rows(), total_rows)
+
+    def open_file(self, file: BinaryIO, filename: Optional[str]) -> SheetRows:
+        """Check a sheet's limits and start reading its rows.
+
+        Blocking; call it from a worker thread.
+
+        Args:
+            file: Seekable binary file holding the sheet
+            filename: Original file name, used in error messages
+
+        Returns:
+            The sheet's columns, (row_number, row) iterator and row count
+
+        Raises:
+            UploadTooLargeError: If the file exceeds the size or row limit
+            UnsupportedUploadError: If the file is a legacy .xls workbook
+        """
+        self._check_size(file)
+        sheet = self._open_excel(file) if self.is_excel(file, filename) else self._open_csv(file)
+        return sheet._replace(rows=self._limit_rows(sheet.rows))
+
+    def open_rows(self, upload: UploadFile) -> SheetRows:
+        """Open an upload in place; see :meth:`open_file`."""
+        return self.open_file(upload.file, upload.filename)
+
+    def spool(self, upload: UploadFile) -> BinaryIO:
+        """Copy an upload to a private temporary file that outlives the request.
+
+        Blocking; call it from a worker thread.
+
+        Raises:
+            UploadTooLargeError: If the file exceeds the size limit
+        """
+        self._check_size(upload.file)
+        spooled = tempfile.TemporaryFile()
+        shutil.copyfileobj(upload.file, spooled)
+        spooled.seek(0)
+        return spooled
+
+    async def iter_batches(self, rows: Iterator[Tuple[int, dict]]) -> AsyncIterator[List[Tuple[int, dict]]]:
+        """Yield rows in bounded batches, parsing each batch in a worker thread.
+
+        Args:
+            rows: Iterator returned by :meth:`open_rows`
+
+        Yields:
+            Lists of at most ``batch_size`` (row_number, row) pairs
+        """
+        batches = chunked(rows, self.batch_size)
+        while True:
+            batch = await run_in_threadpool(next, batches, None)
+            if batch is None:
+                return
+            yield batch
+
+# Export service instance
+upload_ingestion_service = UploadIngestionService()
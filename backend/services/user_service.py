@@ -1,10 +1,15 @@
 """User management services."""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+from pymongo import ReturnDocument
 
 from database import database
-from models import UserCreateSchema, UserResponseSchema, TutorUpdateSchema
+from models import UserCreateSchema, UserResponseSchema, TutorUpdateSchema, normalize_email
 from .auth_service import password_hashing_service
+from .account_activation_service import account_activation_service
+from .principal_cache_service import principal_cache_service
+from .token_version_service import TOKEN_CLAIM_FIELDS, token_version_registry_service
+from .document_codec_service import document_codec_service
 
 class UserManagementService:
     """Service for managing user CRUD operations."""
@@ -21,20 +26,40 @@ class UserManagementService:
         """
         user_dict = user_data.model_dump()
         plain_password = user_dict.pop("password")
-        hashed_password = password_hashing_service.hash_password(plain_password)
+        hashed_password = await password_hashing_service.hash_password_async(plain_password)
         
         user_response = UserResponseSchema(**user_dict)
         user_response.institute_id = institute_id
         
-        document = user_response.model_dump()
+        document = document_codec_service.encode(user_response)
         document["password"] = hashed_password
         document["must_change_password"] = user_data.must_change_password
-        document["created_at"] = document["created_at"].isoformat()
         
         await database.users.insert_one(document)
         
         return user_response
     
+    async def create_pending_user(
+        self,
+        user_data: UserResponseSchema
+    ) -> Tuple[UserResponseSchema, str]:
+        """Create a user account awaiting activation, without hashing a password.
+        
+        Args:
+            user_data: User profile to store
+            
+        Returns:
+            Tuple of the created user and its one-time activation token
+        """
+        activation_token, credentials = account_activation_service.build_pending_credentials()
+        
+        document = document_codec_service.encode(user_data)
+        document.update(credentials)
+        
+        await database.users.insert_one(document)
+        
+        return user_data, activation_token
+    
     async def check_email_exists(self, email: str) -> bool:
         """Check if an email is already registered.
         
@@ -44,7 +69,7 @@ class UserManagementService:
         Returns:
             True if email exists, False otherwise
         """
-        existing_user = await database.users.find_one({"email": email})
+        existing_user = await database.users.find_one({"email": normalize_email(email)})
         return existing_user is not None
     
     async def get_user_by_id(self, user_id: str) -> Optional[dict]:
@@ -89,12 +114,31 @@ class UserManagementService:
         if not update_dict:
             return False
         
-        result = await database.users.update_one(
+        current = await database.users.find_one(
+            {"id": tutor_id},
+            {"_id": 0, **{field: 1 for field in TOKEN_CLAIM_FIELDS}}
+        )
+        if not current:
+            return False
+        
+        update_operations = {"$set": update_dict}
+        # Tokens carry the email and name as claims, so changing them revokes the tokens
+        if token_version_registry_service.claims_changed(current, update_dict):
+            token_version_registry_service.add_version_bump(update_operations)
+        
+        updated_user = await database.users.find_one_and_update(
             {"id": tutor_id},
-            {"$set": update_dict}
+            update_operations,
+            projection={"_id": 0, "token_version": 1},
+            return_document=ReturnDocument.AFTER
         )
+        principal_cache_service.invalidate_user(tutor_id)
+        
+        if not updated_user:
+            return False
         
-        return result.modified_count > 0
+        token_version_registry_service.register(tutor_id, updated_user.get("token_version", 0))
+        return True
     
     async def delete_user(self, user_id: str) -> bool:
         """Delete a user account.
@@ -106,6 +150,8 @@ class UserManagementService:
             True if deletion successful
         """
         result = await database.users.delete_one({"id": user_id})
+        principal_cache_service.invalidate_user(user_id)
+        await token_version_registry_service.revoke(database, user_id)
         return result.deleted_count > 0
 
 # Export service instance
@@ -35,4 +35,30 @@ api.interceptors.response.use(
   }
 );
 
+// Follows keyset pagination cursors until every page of a list is loaded
+export const getAllPages = async (url, config = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await api.get(url, {
+      ...config,
+      params: { ...config.params, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return { data: items };
+};
+
+// Polls a background import job until it completes or fails
+export const waitForImport = async (jobId, { intervalMs = 1000 } = {}) => {
+  for (;;) {
+    const { data: job } = await api.get(`/imports/${jobId}`);
+    if (job.status === 'completed' || job.status === 'failed') {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
+
 export default api;
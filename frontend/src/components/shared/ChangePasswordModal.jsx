@@ -5,6 +5,7 @@ import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import { toast } from 'sonner';
 import api from '@/api/axios';
+import useAuthStore from '@/store/authStore';
 
 export default function ChangePasswordModal({ open, onSuccess, canClose = false }) {
   const [formData, setFormData] = useState({
@@ -29,10 +30,16 @@ export default function ChangePasswordModal({ open, onSuccess, canClose = false
 
     setLoading(true);
     try {
-      await api.post('/auth/change-password', {
+      const { data } = await api.post('/auth/change-password', {
         old_password: formData.old_password,
         new_password: formData.new_password,
       });
+
+      // Changing the password revokes the old token; keep the session on the new one
+      if (data?.access_token) {
+        const { user, setAuth } = useAuthStore.getState();
+        setAuth(user, data.access_token);
+      }
       
       toast.success('Password changed successfully!');
       setFormData({ old_password: '', new_password: '', confirm_password: '' });
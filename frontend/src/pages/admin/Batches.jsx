@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
 import ConfirmDialog from '@/components/shared/ConfirmDialog';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -38,7 +38,7 @@ export default function AdminBatches() {
 
   const fetchBatches = async () => {
     try {
-      const response = await api.get('/batches');
+      const response = await getAllPages('/batches');
       setBatches(response.data);
     } catch (error) {
       toast.error('Failed to fetch batches');
@@ -49,7 +49,7 @@ export default function AdminBatches() {
 
   const fetchTutors = async () => {
     try {
-      const response = await api.get('/tutors');
+      const response = await getAllPages('/tutors');
       setTutors(response.data);
     } catch (error) {
       console.error('Failed to fetch tutors:', error);
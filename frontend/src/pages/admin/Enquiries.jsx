@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -29,7 +29,7 @@ export default function AdminEnquiries() {
 
   const fetchEnquiries = async () => {
     try {
-      const response = await api.get('/enquiries');
+      const response = await getAllPages('/enquiries');
       setEnquiries(response.data);
     } catch (error) {
       toast.error('Failed to fetch enquiries');
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import api, { getAllPages, waitForImport } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -31,7 +31,7 @@ export default function AdminInvites() {
 
   const fetchInvites = async () => {
     try {
-      const response = await api.get('/invites');
+      const response = await getAllPages('/invites');
       setInvites(response.data);
     } catch (error) {
       toast.error('Failed to fetch invites');
@@ -42,7 +42,7 @@ export default function AdminInvites() {
 
   const fetchBatches = async () => {
     try {
-      const response = await api.get('/batches');
+      const response = await getAllPages('/batches');
       setBatches(response.data);
     } catch (error) {
       console.error('Failed to fetch batches:', error);
@@ -85,12 +85,18 @@ export default function AdminInvites() {
     formData.append('file', file);
 
     try {
-      await api.post(`/invites/bulk?batch_id=${selectedBatchForBulk}`, formData, {
+      const { data } = await api.post(`/invites/bulk?batch_id=${selectedBatchForBulk}`, formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
-      
-      toast.success('Bulk invites sent successfully!');
       setBulkDialogOpen(false);
+      toast.info('Sending invites in the background...');
+      
+      const job = await waitForImport(data.job_id);
+      if (job.status === 'failed') {
+        toast.error(job.error || 'Failed to send bulk invites');
+      } else {
+        toast.success(`Sent ${job.counts.created || 0} invites, skipped ${job.counts.skipped || 0}, ${job.counts.invalid || 0} invalid`);
+      }
       fetchInvites();
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to send bulk invites');
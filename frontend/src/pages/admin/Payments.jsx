@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -34,7 +34,7 @@ export default function AdminPayments() {
 
   const fetchPayments = async () => {
     try {
-      const response = await api.get('/payments');
+      const response = await getAllPages('/payments');
       setPayments(response.data);
     } catch (error) {
       toast.error('Failed to fetch payments');
@@ -45,7 +45,7 @@ export default function AdminPayments() {
 
   const fetchStudents = async () => {
     try {
-      const response = await api.get('/students');
+      const response = await getAllPages('/students');
       setStudents(response.data);
     } catch (error) {
       console.error('Failed to fetch students:', error);
@@ -54,7 +54,7 @@ export default function AdminPayments() {
 
   const fetchBatches = async () => {
     try {
-      const response = await api.get('/batches');
+      const response = await getAllPages('/batches');
       setBatches(response.data);
     } catch (error) {
       console.error('Failed to fetch batches:', error);
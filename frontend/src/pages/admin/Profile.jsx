@@ -21,7 +21,7 @@ import {
 } from 'lucide-react';
 
 export default function AdminProfile() {
-  const { user, setAuth } = useAuthStore();
+  const { user, token, setAuth } = useAuthStore();
   const { loading, execute } = useApi();
   const [editMode, setEditMode] = useState(false);
   const [subscriptionInfo, setSubscriptionInfo] = useState({
@@ -71,9 +71,9 @@ export default function AdminProfile() {
       },
       {
         onSuccess: (data) => {
-          // Update auth store with new user data
-          const token = localStorage.getItem('token');
-          setAuth({ ...user, ...values }, token);
+          // Changing the name or email revokes the current token; the
+          // response then carries its replacement
+          setAuth({ ...user, ...values }, data.access_token || token);
           setEditMode(false);
           toast.success('Profile updated successfully');
         },
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import api, { getAllPages, waitForImport } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -30,7 +30,7 @@ export default function AdminSchedule() {
 
   const fetchBatches = async () => {
     try {
-      const response = await api.get('/batches');
+      const response = await getAllPages('/batches');
       setBatches(response.data);
     } catch (error) {
       console.error('Failed to fetch batches:', error);
@@ -70,13 +70,21 @@ export default function AdminSchedule() {
     formData.append('file', file);
 
     try {
-      await api.post(`/schedule/upload-csv?batch_id=${selectedBatch}`, formData, {
+      const { data } = await api.post(`/schedule/upload-csv?batch_id=${selectedBatch}`, formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
-      
-      toast.success('Class schedule uploaded successfully!');
       setUploadDialogOpen(false);
       setSelectedBatch('');
+      toast.info('Importing class schedule in the background...');
+      
+      const job = await waitForImport(data.job_id);
+      if (job.status === 'failed') {
+        toast.error(job.error || 'Failed to upload schedule');
+      } else if (job.counts.invalid) {
+        toast.warning(`Created ${job.counts.valid} classes; ${job.counts.invalid} rows had errors`);
+      } else {
+        toast.success('Class schedule uploaded successfully!');
+      }
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to upload schedule');
     }
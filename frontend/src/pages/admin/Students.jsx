@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
 import ConfirmDialog from '@/components/shared/ConfirmDialog';
-import api from '@/api/axios';
+import api, { getAllPages, waitForImport } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -38,7 +38,7 @@ export default function AdminStudents() {
 
   const fetchStudents = async () => {
     try {
-      const response = await api.get('/students');
+      const response = await getAllPages('/students');
       setStudents(response.data);
     } catch (error) {
       toast.error('Failed to fetch students');
@@ -49,7 +49,7 @@ export default function AdminStudents() {
 
   const fetchBatches = async () => {
     try {
-      const response = await api.get('/batches');
+      const response = await getAllPages('/batches');
       setBatches(response.data);
     } catch (error) {
       console.error('Failed to fetch batches:', error);
@@ -136,12 +136,20 @@ export default function AdminStudents() {
     formData.append('file', file);
 
     try {
-      await api.post(`/students/upload-excel?batch_id=${selectedBatch}`, formData, {
+      const { data } = await api.post(`/students/upload-excel?batch_id=${selectedBatch}`, formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
-      
-      toast.success('Students imported successfully!');
       setUploadDialogOpen(false);
+      toast.info('Importing students in the background...');
+      
+      const job = await waitForImport(data.job_id);
+      if (job.status === 'failed') {
+        toast.error(job.error || 'Failed to import students');
+      } else if (job.counts.failed) {
+        toast.warning(`Imported ${job.counts.created} students; ${job.counts.failed} rows had errors`);
+      } else {
+        toast.success('Students imported successfully!');
+      }
       fetchStudents();
     } catch (error) {
       toast.error(error.response?.data?.detail || 'Failed to import students');
@@ -219,7 +227,7 @@ export default function AdminStudents() {
                     <Label>Upload Excel File</Label>
                     <Input
                       type="file"
-                      accept=".xlsx,.xls"
+                      accept=".xlsx,.csv"
                       onChange={handleFileUpload}
                       data-testid="file-upload-input"
                     />
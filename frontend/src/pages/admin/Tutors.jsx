@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -29,7 +29,7 @@ export default function AdminTutors() {
 
   const fetchTutors = async () => {
     try {
-      const response = await api.get('/tutors');
+      const response = await getAllPages('/tutors');
       setTutors(response.data);
     } catch (error) {
       toast.error('Failed to fetch tutors');
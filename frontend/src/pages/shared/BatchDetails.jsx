@@ -8,12 +8,15 @@ import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { ArrowLeft, Users, Calendar, FileText } from 'lucide-react';
 
+const SECTIONS = ['students', 'classes', 'materials'];
+
 export default function BatchDetails() {
   const { batchId } = useParams();
   const navigate = useNavigate();
   const { user } = useAuthStore();
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(null);
 
   useEffect(() => {
     fetchBatchActivities();
@@ -30,6 +33,42 @@ export default function BatchDetails() {
     }
   };
 
+  // Fetches the next page of one section; the other sections are asked for
+  // a single row since only this section's page is kept
+  const loadMore = async (section) => {
+    setLoadingMore(section);
+    try {
+      const params = { [`${section}_cursor`]: data.next_cursors[section] };
+      SECTIONS.filter((other) => other !== section).forEach((other) => {
+        params[`${other}_limit`] = 1;
+      });
+      const response = await api.get(`/batches/${batchId}/activities`, { params });
+      setData((current) => ({
+        ...current,
+        [section]: [...current[section], ...response.data[section]],
+        next_cursors: { ...current.next_cursors, [section]: response.data.next_cursors[section] },
+        totals: response.data.totals,
+      }));
+    } catch (error) {
+      toast.error('Failed to load more');
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
+  const renderLoadMore = (section) => data.next_cursors?.[section] && (
+    <div className="text-center pt-4">
+      <Button
+        variant="outline"
+        onClick={() => loadMore(section)}
+        disabled={loadingMore === section}
+        data-testid={`load-more-${section}`}
+      >
+        {loadingMore === section ? 'Loading...' : `Load more (${data[section].length} of ${data.totals[section]})`}
+      </Button>
+    </div>
+  );
+
   if (loading) {
     return (
       <Layout role={user?.role}>
@@ -112,7 +151,7 @@ export default function BatchDetails() {
                 </div>
                 <div>
                   <p className="text-sm text-gray-600">Total Students</p>
-                  <p className="text-2xl font-bold">{data.students.length}</p>
+                  <p className="text-2xl font-bold">{data.totals.students}</p>
                 </div>
               </div>
             </CardContent>
@@ -126,7 +165,7 @@ export default function BatchDetails() {
                 </div>
                 <div>
                   <p className="text-sm text-gray-600">Total Classes</p>
-                  <p className="text-2xl font-bold">{data.classes.length}</p>
+                  <p className="text-2xl font-bold">{data.totals.classes}</p>
                 </div>
               </div>
             </CardContent>
@@ -140,7 +179,7 @@ export default function BatchDetails() {
                 </div>
                 <div>
                   <p className="text-sm text-gray-600">Study Materials</p>
-                  <p className="text-2xl font-bold">{data.materials.length}</p>
+                  <p className="text-2xl font-bold">{data.totals.materials}</p>
                 </div>
               </div>
             </CardContent>
@@ -150,7 +189,7 @@ export default function BatchDetails() {
         {/* Students List */}
         <Card>
           <CardHeader>
-            <CardTitle>Students ({data.students.length})</CardTitle>
+            <CardTitle>Students ({data.totals.students})</CardTitle>
           </CardHeader>
           <CardContent>
             {data.students.length === 0 ? (
@@ -179,13 +218,14 @@ export default function BatchDetails() {
                 ))}
               </div>
             )}
+            {renderLoadMore('students')}
           </CardContent>
         </Card>
 
         {/* Classes List */}
         <Card>
           <CardHeader>
-            <CardTitle>Classes ({data.classes.length})</CardTitle>
+            <CardTitle>Classes ({data.totals.classes})</CardTitle>
           </CardHeader>
           <CardContent>
             {data.classes.length === 0 ? (
@@ -211,13 +251,14 @@ export default function BatchDetails() {
                 ))}
               </div>
             )}
+            {renderLoadMore('classes')}
           </CardContent>
         </Card>
 
         {/* Materials List */}
         <Card>
           <CardHeader>
-            <CardTitle>Study Materials ({data.materials.length})</CardTitle>
+            <CardTitle>Study Materials ({data.totals.materials})</CardTitle>
           </CardHeader>
           <CardContent>
             {data.materials.length === 0 ? (
@@ -246,6 +287,7 @@ export default function BatchDetails() {
                 ))}
               </div>
             )}
+            {renderLoadMore('materials')}
           </CardContent>
         </Card>
       </div>
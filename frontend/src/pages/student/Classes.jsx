@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Card, CardContent } from '@/components/ui/card';
 import { Calendar as CalendarIcon } from 'lucide-react';
@@ -15,7 +15,7 @@ export default function StudentClasses() {
 
   const fetchClasses = async () => {
     try {
-      const response = await api.get('/classes');
+      const response = await getAllPages('/classes');
       setClasses(response.data);
     } catch (error) {
       toast.error('Failed to fetch classes');
@@ -2,7 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import Layout from '@/components/shared/Layout';
 import NextClassCard from '@/components/shared/NextClassCard';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { BookOpen, Calendar, FileText, IndianRupee } from 'lucide-react';
 
@@ -30,7 +30,7 @@ export default function StudentDashboard() {
 
   const fetchNextClass = async () => {
     try {
-      const response = await api.get('/classes');
+      const response = await getAllPages('/classes');
       const classes = response.data;
       
       const now = new Date();
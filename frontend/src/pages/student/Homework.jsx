@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -23,7 +23,7 @@ export default function StudentHomework() {
 
   const fetchHomework = async () => {
     try {
-      const response = await api.get('/homework');
+      const response = await getAllPages('/homework');
       setHomework(response.data);
     } catch (error) {
       toast.error('Failed to fetch homework');
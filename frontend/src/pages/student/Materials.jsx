@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Card, CardContent } from '@/components/ui/card';
 import { FileText, ExternalLink } from 'lucide-react';
@@ -15,7 +15,7 @@ export default function StudentMaterials() {
 
   const fetchMaterials = async () => {
     try {
-      const response = await api.get('/materials');
+      const response = await getAllPages('/materials');
       setMaterials(response.data);
     } catch (error) {
       toast.error('Failed to fetch materials');
@@ -20,7 +20,7 @@ import {
 } from 'lucide-react';
 
 export default function StudentProfile() {
-  const { user, setAuth } = useAuthStore();
+  const { user, token, setAuth } = useAuthStore();
   const { loading, execute } = useApi();
   const [editMode, setEditMode] = useState(false);
   const [studentInfo, setStudentInfo] = useState(null);
@@ -76,8 +76,7 @@ export default function StudentProfile() {
       },
       {
         onSuccess: (data) => {
-          const token = localStorage.getItem('token');
-          setAuth({ ...user, ...values }, token);
+          setAuth({ ...user, ...values }, data.access_token || token);
           setEditMode(false);
           fetchStudentInfo();
           toast.success('Profile updated successfully');
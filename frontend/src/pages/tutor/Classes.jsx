@@ -2,7 +2,7 @@ import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
 import { StatusBadge } from '@/components/shared/StatusBadge';
 import { getClassStatus, canJoinClass } from '@/utils/classHelpers';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -35,7 +35,7 @@ export default function TutorClasses() {
 
   const fetchClasses = async () => {
     try {
-      const response = await api.get('/classes');
+      const response = await getAllPages('/classes');
       setClasses(response.data);
     } catch (error) {
       toast.error('Failed to fetch classes');
@@ -46,7 +46,7 @@ export default function TutorClasses() {
 
   const fetchBatches = async () => {
     try {
-      const response = await api.get('/batches');
+      const response = await getAllPages('/batches');
       setBatches(response.data);
     } catch (error) {
       console.error('Failed to fetch batches:', error);
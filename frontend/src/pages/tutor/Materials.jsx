@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -31,7 +31,7 @@ export default function TutorMaterials() {
 
   const fetchMaterials = async () => {
     try {
-      const response = await api.get('/materials');
+      const response = await getAllPages('/materials');
       setMaterials(response.data);
     } catch (error) {
       toast.error('Failed to fetch materials');
@@ -42,7 +42,7 @@ export default function TutorMaterials() {
 
   const fetchBatches = async () => {
     try {
-      const response = await api.get('/batches');
+      const response = await getAllPages('/batches');
       setBatches(response.data);
     } catch (error) {
       console.error('Failed to fetch batches:', error);
@@ -7,7 +7,7 @@ import { FormInput } from '@/components/reusable/FormInput';
 import { useApi } from '@/hooks/useApi';
 import { useForm } from '@/hooks/useForm';
 import useAuthStore from '@/store/authStore';
-import api from '@/api/axios';
+import api, { getAllPages } from '@/api/axios';
 import { 
   UserCircle, 
   Mail, 
@@ -19,7 +19,7 @@ import {
 } from 'lucide-react';
 
 export default function TutorProfile() {
-  const { user, setAuth } = useAuthStore();
+  const { user, token, setAuth } = useAuthStore();
   const { loading, execute } = useApi();
   const [editMode, setEditMode] = useState(false);
   const [tutorStats, setTutorStats] = useState({
@@ -56,7 +56,7 @@ export default function TutorProfile() {
 
   const fetchTutorStats = async () => {
     try {
-      const batchesResponse = await api.get('/batches');
+      const batchesResponse = await getAllPages('/batches');
       const batches = batchesResponse.data.filter(b => b.tutor_id === user?.id);
       
       setTutorStats({
@@ -83,8 +83,7 @@ export default function TutorProfile() {
       },
       {
         onSuccess: (data) => {
-          const token = localStorage.getItem('token');
-          setAuth({ ...user, ...values }, token);
+          setAuth({ ...user, ...values }, data.access_token || token);
           setEditMode(false);
           toast.success('Profile updated successfully');
         },
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import Layout from '@/components/shared/Layout';
-import api from '@/api/axios';
+import { getAllPages } from '@/api/axios';
 import { toast } from 'sonner';
 import { Card, CardContent } from '@/components/ui/card';
 import { Users } from 'lucide-react';
@@ -17,7 +17,7 @@ export default function TutorStudentsList() {
 
   const fetchStudents = async () => {
     try {
-      const response = await api.get('/students');
+      const response = await getAllPages('/students');
       setStudents(response.data);
     } catch (error) {
       toast.error('Failed to fetch students');
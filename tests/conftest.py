@@ -0,0 +1,38 @@
+"""Shared fixtures for the backend unit tests.
+
+The backend is not an installed package, so its directory goes on the
+import path, and config requires the Mongo settings to be present.
+"""
+import os
+import sys
+from importlib import import_module
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "tutorhub_test")
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def mongo_db():
+    """Empty in-memory Motor database, timezone-aware like the real client."""
+    return AsyncMongoMockClient(tz_aware=True)["tutorhub_test"]
+
+@pytest.fixture
+def use_database(monkeypatch, mongo_db):
+    """Point the module-level ``database`` of the named modules at ``mongo_db``.
+
+    Modules are named by their dotted path because ``services`` re-exports
+    instances under the same names as its submodules.
+    """
+    def apply(*module_names):
+        for module_name in module_names:
+            monkeypatch.setattr(import_module(module_name), "database", mongo_db)
+        return mongo_db
+    return apply
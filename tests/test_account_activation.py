@@ -0,0 +1,61 @@
+"""Tests for pending accounts and their activation."""
+import pytest
+
+from config import SecurityConfig
+from models import StudentCreateSchema, UserAccountStatusEnum
+from services.account_activation_service import account_activation_service
+from services.student_service import student_management_service
+
+@pytest.fixture
+def db(use_database):
+    return use_database(
+        "services.account_activation_service",
+        "services.student_service",
+        "services.user_service"
+    )
+
+def test_pending_credentials_store_only_a_token_digest():
+    activation_token, credentials = account_activation_service.build_pending_credentials()
+
+    assert credentials["password"] is None
+    assert credentials["account_status"] == UserAccountStatusEnum.PENDING_ACTIVATION
+    assert credentials["activation_token_hash"] == account_activation_service.hash_activation_token(activation_token)
+    assert activation_token not in credentials.values()
+
+@pytest.mark.anyio
+async def test_pending_account_accepts_only_the_temporary_password():
+    _, credentials = account_activation_service.build_pending_credentials()
+    user = {"id": "u1", **credentials}
+
+    assert await account_activation_service.verify_user_password(user, SecurityConfig.STUDENT_TEMPORARY_PASSWORD)
+    assert not await account_activation_service.verify_user_password(user, "guess")
+
+@pytest.mark.anyio
+async def test_create_student_returns_a_working_activation_token(db):
+    student, activation_token = await student_management_service.create_student(
+        StudentCreateSchema(name="Ann", email="ann@example.com", phone="1", batch_id="b1", total_fees=100),
+        "institute-1"
+    )
+
+    stored = await db.users.find_one({"id": student.id})
+    assert stored["account_status"] == UserAccountStatusEnum.PENDING_ACTIVATION
+    assert await db.students.find_one({"id": student.id}) is not None
+
+    activated = await account_activation_service.activate_account(activation_token, "new-password")
+    assert activated["id"] == student.id
+    assert activated["account_status"] == UserAccountStatusEnum.ACTIVE
+    assert "password" not in activated and "activation_token_hash" not in activated
+
+    stored = await db.users.find_one({"id": student.id})
+    assert await account_activation_service.verify_user_password(stored, "new-password")
+
+@pytest.mark.anyio
+async def test_activation_token_is_single_use(db):
+    student, activation_token = await student_management_service.create_student(
+        StudentCreateSchema(name="Ann", email="ann@example.com", phone="1", batch_id="b1", total_fees=100),
+        "institute-1"
+    )
+
+    assert await account_activation_service.activate_account(activation_token, "first") is not None
+    assert await account_activation_service.activate_account(activation_token, "second") is None
+    assert await account_activation_service.activate_account("unknown-token", "third") is None
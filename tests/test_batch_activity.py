@@ -0,0 +1,108 @@
+"""Tests for paged batch activity sections and their ETags."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.batch_activity_service import BatchActivityService
+from services.pagination_service import InvalidCursorError
+
+activity = BatchActivityService()
+CREATED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+async def seed(database):
+    await database.batches.insert_many([
+        {"id": "batch-1", "name": "Morning", "created_at": CREATED},
+        {"id": "batch-2", "name": "Evening", "created_at": CREATED},
+    ])
+    await database.classes.insert_many([
+        {"id": f"class-{index}", "batch_id": "batch-1", "class_date": f"2025-02-0{index}"}
+        for index in (3, 1, 2)
+    ])
+    await database.students.insert_many([
+        {"id": "student-1", "batch_id": "batch-1", "name": "Cara"},
+        {"id": "student-2", "batch_id": "batch-1", "name": "Ann"},
+        {"id": "student-3", "batch_id": "batch-2", "name": "Bob"},
+    ])
+    await database.materials.insert_many([
+        {"id": f"material-{index}", "batch_id": "batch-1", "created_at": CREATED + timedelta(days=index)}
+        for index in range(3)
+    ])
+
+@pytest.mark.anyio
+async def test_touch_stamps_only_the_given_batches(mongo_db):
+    await seed(mongo_db)
+
+    await activity.touch(mongo_db, ["batch-1", None, "batch-1", ""])
+
+    touched = await mongo_db.batches.find_one({"id": "batch-1"})
+    untouched = await mongo_db.batches.find_one({"id": "batch-2"})
+    assert touched["activity_updated_at"] > CREATED
+    assert "activity_updated_at" not in untouched
+
+@pytest.mark.anyio
+async def test_touch_accepts_a_single_id_and_ignores_empty_input(mongo_db):
+    await seed(mongo_db)
+
+    await activity.touch(mongo_db, "batch-2")
+    await activity.touch(mongo_db, [None])
+
+    assert "activity_updated_at" in await mongo_db.batches.find_one({"id": "batch-2"})
+    assert "activity_updated_at" not in await mongo_db.batches.find_one({"id": "batch-1"})
+
+def test_last_modified_falls_back_to_creation_time():
+    stamped = CREATED + timedelta(hours=1)
+
+    assert BatchActivityService.last_modified({"created_at": CREATED}) == CREATED
+    assert BatchActivityService.last_modified({"created_at": CREATED, "activity_updated_at": stamped}) == stamped
+
+def test_etag_changes_with_the_stamp_and_the_requested_pages():
+    batch = {"id": "batch-1", "created_at": CREATED}
+    pages = {"classes": (None, None), "students": (10, None)}
+    etag = activity.etag(batch, pages)
+
+    assert etag.startswith('W/"')
+    assert activity.etag(dict(batch), dict(reversed(list(pages.items())))) == etag
+    assert activity.etag({**batch, "activity_updated_at": CREATED + timedelta(seconds=1)}, pages) != etag
+    assert activity.etag(batch, {**pages, "students": (5, None)}) != etag
+    assert activity.etag(batch, {**pages, "classes": (None, "cursor")}) != etag
+    assert activity.etag({**batch, "id": "batch-2"}, pages) != etag
+
+@pytest.mark.anyio
+async def test_sections_are_sorted_per_section_and_scoped_to_the_batch(mongo_db):
+    await seed(mongo_db)
+
+    sections = await activity.get_sections(mongo_db, "batch-1", {})
+
+    assert [item["id"] for item in sections["classes"]] == ["class-1", "class-2", "class-3"]
+    assert [item["name"] for item in sections["students"]] == ["Ann", "Cara"]
+    assert [item["id"] for item in sections["materials"]] == ["material-2", "material-1", "material-0"]
+    assert sections["next_cursors"] == {"classes": None, "students": None, "materials": None}
+    assert "_id" not in sections["classes"][0]
+
+@pytest.mark.anyio
+async def test_sections_page_independently_with_next_cursors_and_totals(mongo_db):
+    await seed(mongo_db)
+
+    first = await activity.get_sections(mongo_db, "batch-1", {"classes": (2, None), "materials": (1, None)})
+
+    assert [item["id"] for item in first["classes"]] == ["class-1", "class-2"]
+    assert [item["id"] for item in first["materials"]] == ["material-2"]
+    assert first["next_cursors"]["students"] is None
+    assert first["totals"] == {"classes": 3, "students": 2, "materials": 3}
+
+    second = await activity.get_sections(mongo_db, "batch-1", {
+        "classes": (2, first["next_cursors"]["classes"]),
+        "materials": (1, first["next_cursors"]["materials"]),
+    })
+
+    assert [item["id"] for item in second["classes"]] == ["class-3"]
+    assert second["next_cursors"]["classes"] is None
+    assert [item["id"] for item in second["materials"]] == ["material-1"]
+    assert second["next_cursors"]["materials"] is not None
+
+@pytest.mark.anyio
+async def test_malformed_section_cursor_is_rejected(mongo_db):
+    await seed(mongo_db)
+
+    with pytest.raises(InvalidCursorError):
+        await activity.get_sections(mongo_db, "batch-1", {"students": (None, "not-a-cursor")})
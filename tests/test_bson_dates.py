@@ -0,0 +1,75 @@
+"""Tests for native date storage and the string date migration."""
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from services.date_migration_service import CHECKPOINT_COLLECTION, DateMigrationService
+from services.document_codec_service import document_codec_service
+
+class Entry(BaseModel):
+    created_at: datetime
+    due: date
+    history: List[datetime]
+
+def test_encode_stores_aware_utc_datetimes():
+    document = document_codec_service.encode(Entry(
+        created_at=datetime(2025, 1, 1, 10, 30),
+        due=date(2025, 2, 1),
+        history=[datetime(2025, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=5, minutes=30)))]
+    ))
+
+    assert document["created_at"] == datetime(2025, 1, 1, 10, 30, tzinfo=timezone.utc)
+    assert document["due"] == datetime(2025, 2, 1, tzinfo=timezone.utc)
+    assert document["history"] == [datetime(2025, 1, 1, 6, 30, tzinfo=timezone.utc)]
+
+def test_parse_legacy_datetime():
+    assert document_codec_service.parse_legacy_datetime("2025-01-01T10:00:00+05:30") == datetime(2025, 1, 1, 4, 30, tzinfo=timezone.utc)
+    assert document_codec_service.parse_legacy_datetime("2025-01-01") == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert document_codec_service.parse_legacy_datetime("next tuesday") is None
+
+@pytest.mark.anyio
+async def test_migration_converts_strings_and_counts_unparseable_values(mongo_db):
+    native = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    await mongo_db.payments.insert_many([
+        {"id": "p1", "payment_date": "2025-01-01T00:00:00"},
+        {"id": "p2", "payment_date": "garbage"},
+        {"id": "p3", "payment_date": native},
+    ])
+
+    result = await DateMigrationService(batch_size=1).migrate_field(mongo_db, "payments", "payment_date")
+
+    assert result == {"converted": 1, "failed": 1}
+    dates = {payment["id"]: payment["payment_date"] async for payment in mongo_db.payments.find()}
+    assert isinstance(dates["p1"], datetime) and dates["p1"].replace(tzinfo=None) == datetime(2025, 1, 1)
+    assert dates["p2"] == "garbage"
+    assert dates["p3"].replace(tzinfo=None) == native.replace(tzinfo=None)
+
+@pytest.mark.anyio
+async def test_completed_fields_are_not_rescanned_until_reset(mongo_db):
+    migration = DateMigrationService()
+    await mongo_db.users.insert_one({"id": "u1", "created_at": "2025-01-01T00:00:00"})
+    await migration.migrate_field(mongo_db, "users", "created_at")
+
+    await mongo_db.users.insert_one({"id": "u2", "created_at": "2025-01-02T00:00:00"})
+    assert await migration.migrate_field(mongo_db, "users", "created_at") == {"converted": 1, "failed": 0}
+    assert isinstance((await mongo_db.users.find_one({"id": "u2"}))["created_at"], str)
+
+    await migration.reset_checkpoints(mongo_db)
+    assert await mongo_db[CHECKPOINT_COLLECTION].count_documents({}) == 0
+    assert await migration.migrate_field(mongo_db, "users", "created_at") == {"converted": 1, "failed": 0}
+    assert isinstance((await mongo_db.users.find_one({"id": "u2"}))["created_at"], datetime)
+
+@pytest.mark.anyio
+async def test_interrupted_migration_resumes_after_the_checkpoint(mongo_db):
+    await mongo_db.classes.insert_many([{"id": f"c{index}", "class_date": "2025-01-01"} for index in range(3)])
+    first = await mongo_db.classes.find_one({"id": "c0"})
+    await mongo_db[CHECKPOINT_COLLECTION].insert_one(
+        {"_id": "bson_dates:classes.class_date", "last_id": first["_id"], "converted": 1, "failed": 0}
+    )
+
+    result = await DateMigrationService().migrate_field(mongo_db, "classes", "class_date")
+
+    assert result == {"converted": 3, "failed": 0}
+    assert isinstance((await mongo_db.classes.find_one({"id": "c0"}))["class_date"], str)
@@ -0,0 +1,81 @@
+"""Tests for the bulk invite pipeline."""
+import pytest
+from pymongo.errors import BulkWriteError
+
+from models import InviteCreateSchema
+from services.invite_service import BulkInviteService
+
+BATCH = {"id": "b1", "name": "Batch 1"}
+
+async def batches_of(emails, size=2):
+    numbered = [(row_number, {"email": email}) for row_number, email in enumerate(emails, start=2)]
+    for start in range(0, len(numbered), size):
+        yield numbered[start:start + size]
+
+def statuses(report):
+    return {row_report["row"]: (row_report["status"], row_report.get("error")) for row_report in report["rows"]}
+
+@pytest.fixture
+def db(use_database):
+    return use_database("services.invite_service")
+
+def test_normalize_email_lowercases_valid_addresses():
+    assert BulkInviteService.normalize_email("  Ann@Example.COM ") == "ann@example.com"
+    assert BulkInviteService.normalize_email("not-an-email") is None
+    assert BulkInviteService.normalize_email(None) is None
+
+@pytest.mark.anyio
+async def test_new_addresses_are_invited_once(db):
+    report = await BulkInviteService(chunk_size=2).create_invites(
+        batches_of(["a@x.com", "b@x.com", "A@X.com", "nope", "c@x.com"]), "student", "i1", BATCH
+    )
+
+    assert (report["created"], report["skipped"], report["invalid"], report["failed"]) == (3, 1, 1, 0)
+    assert statuses(report)[4] == ("skipped", "Duplicate email in file")
+    assert report["emails"] == ["a@x.com", "b@x.com", "c@x.com"]
+    invite = await db.invites.find_one({"email": "a@x.com"})
+    assert (invite["batch_id"], invite["institute_id"], invite["status"]) == ("b1", "i1", "pending")
+    assert await db.invites.count_documents({}) == 3
+
+@pytest.mark.anyio
+async def test_registered_users_and_pending_invites_are_skipped_regardless_of_case(db):
+    await db.users.insert_one({"id": "u1", "email": "user@x.com"})
+    await db.invites.insert_one({"id": "v1", "email": "pending@x.com", "institute_id": "i1", "status": "pending"})
+    await db.invites.insert_one({"id": "v2", "email": "elsewhere@x.com", "institute_id": "i2", "status": "pending"})
+
+    report = await BulkInviteService().create_invites(
+        batches_of(["User@X.com", "PENDING@x.com", "Elsewhere@x.com"]), "student", "i1", BATCH
+    )
+
+    assert statuses(report) == {
+        2: ("skipped", "User already exists"),
+        3: ("skipped", "Invite already pending"),
+        4: ("created", None),
+    }
+
+@pytest.mark.anyio
+async def test_single_invite_typed_in_mixed_case_is_matched(db):
+    invite = InviteCreateSchema(email="Ann@X.com", role="student", batch_id="b1")
+    await db.invites.insert_one({"id": "v1", **invite.model_dump(), "institute_id": "i1", "status": "pending"})
+
+    report = await BulkInviteService().create_invites(batches_of(["ann@x.com"]), "student", "i1", BATCH)
+
+    assert statuses(report) == {2: ("skipped", "Invite already pending")}
+    assert await db.invites.count_documents({}) == 1
+
+@pytest.mark.anyio
+async def test_rows_whose_insert_failed_are_reported(db, monkeypatch):
+    collection_type = type(db.invites)
+    original_insert_many = collection_type.insert_many
+
+    async def insert_many(collection, documents, **kwargs):
+        await original_insert_many(collection, documents[:1], **kwargs)
+        raise BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate invite_code"}]})
+
+    monkeypatch.setattr(collection_type, "insert_many", insert_many)
+
+    report = await BulkInviteService().create_invites(batches_of(["a@x.com", "b@x.com"]), "student", "i1", BATCH)
+
+    assert statuses(report) == {2: ("created", None), 3: ("error", "Could not save invite")}
+    assert (report["created"], report["failed"]) == (1, 1)
+    assert report["emails"] == ["a@x.com"]
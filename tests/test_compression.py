@@ -0,0 +1,172 @@
+"""Tests for gzip/brotli response compression."""
+import asyncio
+import gzip
+import zlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from middleware import CompressionMiddleware, available_encodings
+from middleware import compression
+from middleware.compression import negotiate_encoding
+
+BODY = ("student,fees\n" * 200).encode()
+
+async def large(request):
+    return PlainTextResponse(BODY)
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+async def encoded(request):
+    return Response(gzip.compress(BODY), headers={"Content-Encoding": "gzip"}, media_type="text/plain")
+
+async def workbook(request):
+    return Response(BODY, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+async def not_modified(request):
+    return Response(status_code=304)
+
+async def streamed(request):
+    async def rows():
+        for index in range(3):
+            yield f"row {index}\n".encode() * 50
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+def build_app(**options):
+    application = Starlette(routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/encoded", encoded),
+        Route("/workbook", workbook),
+        Route("/not-modified", not_modified),
+        Route("/stream", streamed),
+        Route("/api/imports/progress", large),
+    ])
+    application.add_middleware(
+        CompressionMiddleware,
+        **{"minimum_size": 500, "excluded_paths": ("/api/imports/", ""), **options}
+    )
+    return application
+
+async def get(application, path, accept_encoding="gzip"):
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers={"accept-encoding": accept_encoding})
+
+async def collect_messages(application, path, accept_encoding="gzip"):
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "server": ("test", 80),
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client stays connected until the response is complete
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("GZIP, deflate", "gzip"),
+    ("deflate", None),
+    ("gzip;q=0", None),
+    ("gzip;q=0.5, br;q=0", "gzip"),
+    ("*", "gzip"),
+    ("*;q=0", None),
+    ("gzip;q=bogus", None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ("gzip",)) == expected
+
+def test_negotiate_encoding_prefers_server_order():
+    assert negotiate_encoding("gzip, br", ("br", "gzip")) == "br"
+    assert negotiate_encoding("gzip, br;q=0", ("br", "gzip")) == "gzip"
+
+@pytest.mark.anyio
+async def test_large_body_is_gzipped():
+    response = await get(build_app(), "/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+@pytest.mark.anyio
+async def test_small_body_is_sent_as_is():
+    response = await get(build_app(), "/small")
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/encoded", "/workbook", "/api/imports/progress"])
+async def test_encoded_incompressible_and_excluded_responses_are_untouched(path):
+    messages = await collect_messages(build_app(), path)
+
+    headers = dict(messages[0]["headers"])
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    if path == "/encoded":
+        assert headers[b"content-encoding"] == b"gzip"
+        assert gzip.decompress(body) == BODY
+    else:
+        assert b"content-encoding" not in headers
+        assert body == BODY
+
+@pytest.mark.anyio
+async def test_not_modified_response_is_untouched():
+    response = await get(build_app(), "/not-modified")
+
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+
+@pytest.mark.anyio
+async def test_clients_without_gzip_and_disabled_middleware_get_identity():
+    assert "content-encoding" not in (await get(build_app(), "/large", accept_encoding="identity")).headers
+    assert "content-encoding" not in (await get(build_app(enabled=False), "/large")).headers
+
+@pytest.mark.anyio
+async def test_streamed_chunks_are_decodable_as_they_arrive():
+    messages = await collect_messages(build_app(), "/stream")
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    bodies = [message for message in messages[1:] if message["type"] == "http.response.body"]
+    decoded = [decoder.decompress(message["body"]) for message in bodies]
+    assert decoded[:3] == [f"row {index}\n".encode() * 50 for index in range(3)]
+    assert bodies[-1]["more_body"] is False
+    assert decoder.eof
+
+@pytest.mark.anyio
+async def test_brotli_is_preferred_when_installed():
+    if compression.brotli is None:
+        pytest.skip("brotli is not installed")
+
+    messages = await collect_messages(build_app(), "/large", accept_encoding="gzip, br")
+
+    assert available_encodings() == ("br", "gzip")
+    assert dict(messages[0]["headers"])[b"content-encoding"] == b"br"
+    assert compression.brotli.decompress(messages[1]["body"]) == BODY
@@ -0,0 +1,188 @@
+"""Tests for collection version counters and conditional GET responses."""
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from middleware import ConditionalGetMiddleware, etag_matches
+from services import collection_version_service
+from services.collection_version_service import CollectionVersionService
+from services.institute_stats_service import InstituteStatsService
+
+PRINCIPALS = {
+    "tutor-token": {"id": "tutor-1", "role": "tutor", "institute_id": "institute-1"},
+    "admin-token": {"id": "admin-1", "role": "admin", "institute_id": None},
+}
+
+@pytest.fixture(autouse=True)
+def fresh_version_cache():
+    collection_version_service.versions.clear()
+    yield
+    collection_version_service.versions.clear()
+
+def build_app(database, enabled=True):
+    calls = []
+
+    async def students(request):
+        calls.append(request.url.path)
+        return JSONResponse([{"id": "student-1"}])
+
+    async def resolve_principal(request):
+        return PRINCIPALS.get(request.headers.get("authorization", ""))
+
+    application = Starlette(routes=[
+        Route("/api/students", students, methods=["GET", "POST"]),
+        Route("/api/other", students),
+    ])
+    application.add_middleware(
+        ConditionalGetMiddleware,
+        database=database,
+        resources={"/api/students": ("students", "batches")},
+        resolve_principal=resolve_principal,
+        enabled=enabled,
+    )
+    application.state.calls = calls
+    return application
+
+@pytest.fixture
+def app(mongo_db):
+    return build_app(mongo_db)
+
+def client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    (None, False),
+    ("", False),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"other", W/"abc"', True),
+    ("*", True),
+    ('W/"abcd"', False),
+])
+def test_etag_matches_with_weak_comparison(if_none_match, matches):
+    assert etag_matches(if_none_match, 'W/"abc"') is matches
+
+@pytest.mark.anyio
+async def test_versions_start_at_zero_and_advance_on_bump(mongo_db):
+    versions = CollectionVersionService(cache_ttl_seconds=60, cache_max_entries=100)
+
+    assert await versions.get_versions(mongo_db, "institute-1", ["students", "batches"]) == {"students": 0, "batches": 0}
+
+    await versions.bump(mongo_db, "institute-1", "students", "students")
+    await versions.bump(mongo_db, "institute-2", "batches")
+
+    assert await versions.get_versions(mongo_db, "institute-1", ["students", "batches"]) == {"students": 1, "batches": 0}
+    assert await versions.get_versions(mongo_db, "institute-1", ["students"]) == {"students": 1}
+    assert versions.get_statistics()["hits"] == 1
+
+@pytest.mark.anyio
+async def test_bump_without_institute_or_collections_is_a_no_op(mongo_db):
+    versions = CollectionVersionService(cache_ttl_seconds=60, cache_max_entries=100)
+
+    await versions.bump(mongo_db, None, "students")
+    await versions.bump(mongo_db, "institute-1")
+
+    assert await mongo_db.collection_versions.count_documents({}) == 0
+
+@pytest.mark.anyio
+async def test_other_workers_bumps_are_seen_after_the_cache_ttl(mongo_db):
+    reader = CollectionVersionService(cache_ttl_seconds=0, cache_max_entries=100)
+    writer = CollectionVersionService(cache_ttl_seconds=60, cache_max_entries=100)
+    await reader.get_versions(mongo_db, "institute-1", ["students"])
+
+    await writer.bump(mongo_db, "institute-1", "students")
+
+    assert await reader.get_versions(mongo_db, "institute-1", ["students"]) == {"students": 1}
+
+def test_etag_depends_on_versions_and_vary_inputs():
+    etag = CollectionVersionService.etag({"students": 1, "batches": 2}, "tutor-1", "")
+
+    assert etag == CollectionVersionService.etag({"batches": 2, "students": 1}, "tutor-1", "")
+    assert etag != CollectionVersionService.etag({"students": 2, "batches": 2}, "tutor-1", "")
+    assert etag != CollectionVersionService.etag({"students": 1, "batches": 2}, "tutor-2", "")
+    assert etag != CollectionVersionService.etag({"students": 1, "batches": 2}, "tutor-1", "limit=5")
+
+@pytest.mark.anyio
+async def test_matching_etag_is_answered_with_304_without_running_the_endpoint(app):
+    async with client(app) as http:
+        first = await http.get("/api/students", headers={"authorization": "tutor-token"})
+        etag = first.headers["etag"]
+        second = await http.get("/api/students", headers={"authorization": "tutor-token", "if-none-match": etag})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+    assert app.state.calls == ["/api/students"]
+
+@pytest.mark.anyio
+async def test_bump_changes_the_etag(app, mongo_db):
+    async with client(app) as http:
+        etag = (await http.get("/api/students", headers={"authorization": "tutor-token"})).headers["etag"]
+        await collection_version_service.bump(mongo_db, "institute-1", "batches")
+        response = await http.get("/api/students", headers={"authorization": "tutor-token", "if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(app.state.calls) == 2
+
+@pytest.mark.anyio
+async def test_etag_differs_per_principal_and_query(app):
+    async with client(app) as http:
+        tutor = await http.get("/api/students", headers={"authorization": "tutor-token"})
+        admin = await http.get("/api/students", headers={"authorization": "admin-token"})
+        paged = await http.get("/api/students?limit=5", headers={"authorization": "tutor-token"})
+
+    assert len({tutor.headers["etag"], admin.headers["etag"], paged.headers["etag"]}) == 3
+
+@pytest.mark.anyio
+async def test_unauthenticated_and_unregistered_requests_pass_through(app):
+    async with client(app) as http:
+        anonymous = await http.get("/api/students", headers={"if-none-match": "*"})
+        other = await http.get("/api/other", headers={"authorization": "tutor-token", "if-none-match": "*"})
+        post = await http.post("/api/students", headers={"authorization": "tutor-token", "if-none-match": "*"})
+
+    for response in (anonymous, other, post):
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+    assert len(app.state.calls) == 3
+
+@pytest.mark.anyio
+async def test_disabled_middleware_passes_everything_through(mongo_db):
+    async with client(build_app(mongo_db, enabled=False)) as http:
+        response = await http.get("/api/students", headers={"authorization": "tutor-token", "if-none-match": "*"})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+@pytest.fixture
+async def stats_db(mongo_db):
+    await mongo_db.batches.insert_one({"id": "b1", "institute_id": "i1"})
+    await mongo_db.students.insert_one({"id": "s1", "institute_id": "i1", "total_fees": 100.0, "paid_amount": 30.0})
+    return mongo_db
+
+async def institute_stats_version(database):
+    document = await database.collection_versions.find_one({"institute_id": "i1", "collection": "institute_stats"})
+    return document["version"] if document else 0
+
+@pytest.mark.anyio
+async def test_reconcile_that_corrects_drift_bumps_the_stats_version(stats_db):
+    stats = InstituteStatsService(reconcile_interval_seconds=0)
+    await stats.get_statistics(stats_db, "i1")
+    await stats.increment(stats_db, "i1", total_students=5)
+
+    await stats.reconcile(stats_db, "i1")
+
+    assert await institute_stats_version(stats_db) == 1
+
+@pytest.mark.anyio
+async def test_reconcile_without_drift_keeps_the_stats_version(stats_db):
+    stats = InstituteStatsService(reconcile_interval_seconds=0)
+    await stats.get_statistics(stats_db, "i1")
+
+    await stats.reconcile(stats_db, "i1")
+
+    assert await institute_stats_version(stats_db) == 0
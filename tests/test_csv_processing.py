@@ -0,0 +1,49 @@
+"""Tests for the standard library CSV path and lazy spreadsheet imports."""
+import os
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from services.csv_service import csv_processing_service
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+def test_student_csv_is_parsed_with_blank_cells_as_none():
+    content = "\ufeffname,email,phone,whatsapp\nAnn,ann@x.com,1,\n".encode("utf-8")
+
+    assert csv_processing_service.parse_student_csv(content) == [
+        {"name": "Ann", "email": "ann@x.com", "phone": "1", "whatsapp": None}
+    ]
+
+def test_schedule_csv_dates_become_datetimes():
+    content = b"class_date,class_time,topic\n2025-01-15,10:00 AM,Intro\n,11:00 AM,\n"
+
+    records = csv_processing_service.parse_class_schedule_csv(content)
+
+    assert records[0]["class_date"] == datetime(2025, 1, 15)
+    assert records[1] == {"class_date": None, "class_time": "11:00 AM", "topic": None}
+
+def test_export_uses_every_column_in_first_seen_order():
+    content = csv_processing_service.export_students_to_csv([
+        {"name": "Ann", "email": "ann@x.com"},
+        {"name": "Bob", "phone": "2"},
+    ])
+
+    assert content.decode() == "name,email,phone\nAnn,ann@x.com,\nBob,,2\n"
+
+def test_sample_files_round_trip():
+    rows = csv_processing_service.parse_student_csv(csv_processing_service.generate_sample_student_csv())
+
+    assert [row["name"] for row in rows] == ["John Doe", "Jane Smith"]
+
+def test_server_start_up_does_not_load_pandas_or_openpyxl():
+    probe = "import sys, server; print('pandas' in sys.modules, 'openpyxl' in sys.modules)"
+    environment = {**os.environ, "MONGO_URL": "mongodb://localhost:27017", "DB_NAME": "tutorhub_test"}
+
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], cwd=BACKEND_DIR, env=environment,
+        capture_output=True, text=True, check=True
+    )
+
+    assert completed.stdout.split()[-2:] == ["False", "False"]
@@ -0,0 +1,80 @@
+"""Tests for the aggregation-based dashboard figures."""
+from datetime import timedelta
+
+import pytest
+
+from services.dashboard_service import dashboard_statistics_service
+
+@pytest.fixture
+async def seeded_db(mongo_db):
+    today = dashboard_statistics_service.start_of_today()
+    await mongo_db.batches.insert_many([
+        {"id": "b1", "institute_id": "i1", "tutor_id": "t1"},
+        {"id": "b2", "institute_id": "i1", "tutor_id": "t2"},
+        {"id": "other", "institute_id": "i2", "tutor_id": "t3"},
+    ])
+    await mongo_db.users.insert_many([
+        {"id": "t1", "institute_id": "i1", "role": "tutor"},
+        {"id": "t2", "institute_id": "i1", "role": "tutor"},
+        {"id": "s1", "institute_id": "i1", "role": "student"},
+    ])
+    await mongo_db.students.insert_many([
+        {"id": "s1", "institute_id": "i1", "batch_id": "b1", "batch_name": "B1", "payment_status": "partial", "total_fees": 100.0, "paid_amount": 40.0},
+        {"id": "s2", "institute_id": "i1", "batch_id": "b1", "batch_name": "B1", "payment_status": "paid", "total_fees": 50.0, "paid_amount": 50.0},
+        {"id": "s3", "institute_id": "i1", "batch_id": "b2", "batch_name": "B2", "payment_status": "unpaid", "total_fees": 80.0, "paid_amount": 0.0},
+        {"id": "x1", "institute_id": "i2", "batch_id": "other", "batch_name": "O", "payment_status": "unpaid", "total_fees": 999.0, "paid_amount": 0.0},
+    ])
+    await mongo_db.payments.insert_many([
+        {"id": "p1", "institute_id": "i1", "amount": 40.0},
+        {"id": "p2", "institute_id": "i1", "amount": 50.0},
+        {"id": "p3", "institute_id": "i2", "amount": 7.0},
+    ])
+    await mongo_db.classes.insert_many([
+        {"id": "c1", "batch_id": "b1", "tutor_id": "t1", "class_date": today + timedelta(hours=10)},
+        {"id": "c2", "batch_id": "b1", "tutor_id": "t1", "class_date": today - timedelta(days=1)},
+        {"id": "c3", "batch_id": "b2", "tutor_id": "t2", "class_date": today + timedelta(days=2)},
+    ])
+    await mongo_db.homework.insert_many([{"id": "h1", "batch_id": "b1"}, {"id": "h2", "batch_id": "b1"}])
+    await mongo_db.homework_submissions.insert_one({"id": "hs1", "homework_id": "h1", "student_id": "s1"})
+    return mongo_db
+
+@pytest.mark.anyio
+async def test_admin_statistics_cover_only_the_institute(seeded_db):
+    assert await dashboard_statistics_service.admin_statistics(seeded_db, "i1") == {
+        "total_batches": 2,
+        "total_students": 3,
+        "total_tutors": 2,
+        "total_revenue": 90.0,
+        "pending_fees": 140.0,
+    }
+
+@pytest.mark.anyio
+async def test_admin_statistics_of_an_empty_institute_are_zero(seeded_db):
+    assert await dashboard_statistics_service.admin_statistics(seeded_db, "new") == {
+        "total_batches": 0,
+        "total_students": 0,
+        "total_tutors": 0,
+        "total_revenue": 0,
+        "pending_fees": 0,
+    }
+
+@pytest.mark.anyio
+async def test_tutor_statistics_look_up_or_reuse_batch_ids(seeded_db):
+    expected = {"total_batches": 1, "total_students": 2, "today_classes": 1}
+
+    assert await dashboard_statistics_service.tutor_statistics(seeded_db, "t1") == expected
+    assert await dashboard_statistics_service.tutor_statistics(seeded_db, "t1", batch_ids=["b1"]) == expected
+
+@pytest.mark.anyio
+async def test_student_statistics(seeded_db):
+    student = await seeded_db.students.find_one({"id": "s1"})
+
+    assert await dashboard_statistics_service.student_statistics(seeded_db, student) == {
+        "batch_name": "B1",
+        "payment_status": "partial",
+        "total_fees": 100.0,
+        "paid_amount": 40.0,
+        "pending_amount": 60.0,
+        "today_classes": 1,
+        "pending_homework": 1,
+    }
@@ -0,0 +1,92 @@
+"""Tests for the shared Mongo client and its pool monitor."""
+from types import SimpleNamespace
+
+import pytest
+
+import database as database_module
+from config import DatabaseConfig
+from database import ConnectionPoolMonitor, DatabaseConnection, DatabaseProxy
+
+class RecordingClient:
+    created = []
+
+    def __init__(self, url, **options):
+        self.url = url
+        self.options = options
+        self.closed = False
+        RecordingClient.created.append(self)
+
+    def __getitem__(self, name):
+        return SimpleNamespace(name=name, read_preference=None)
+
+    def get_database(self, name, read_preference=None):
+        return SimpleNamespace(name=name, read_preference=read_preference)
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def connection(monkeypatch):
+    RecordingClient.created = []
+    monkeypatch.setattr(database_module, "AsyncIOMotorClient", RecordingClient)
+    return DatabaseConnection()
+
+def test_one_client_is_created_with_the_pool_settings(connection):
+    connection.connect_to_database()
+    connection.connect_to_database()
+
+    assert len(RecordingClient.created) == 1
+    options = RecordingClient.created[0].options
+    assert options["tz_aware"] is True
+    assert options["maxPoolSize"] == DatabaseConfig.MAX_POOL_SIZE
+    assert options["minPoolSize"] == DatabaseConfig.MIN_POOL_SIZE
+    assert options["event_listeners"] == [connection.pool_monitor]
+
+def test_analytics_handle_uses_the_configured_read_preference(connection):
+    analytics = connection.get_analytics_database()
+
+    assert analytics.name == DatabaseConfig.DB_NAME
+    assert analytics.read_preference.mongos_mode == DatabaseConfig.ANALYTICS_READ_PREFERENCE
+    assert connection.get_database() is connection.database
+
+def test_proxy_resolves_the_client_on_first_use(connection):
+    proxy = DatabaseProxy(connection.get_database)
+    assert RecordingClient.created == []
+
+    assert proxy.name == DatabaseConfig.DB_NAME
+    assert len(RecordingClient.created) == 1
+
+def test_close_allows_a_fresh_connection(connection):
+    connection.connect_to_database()
+    first = connection.client
+    connection.close_database_connection()
+
+    assert first.closed and connection.database is None
+    connection.connect_to_database()
+    assert connection.client is not first
+
+def test_pool_monitor_tracks_checkouts_and_utilization():
+    monitor = ConnectionPoolMonitor()
+    event = SimpleNamespace()
+
+    monitor.connection_created(event)
+    monitor.connection_created(event)
+    for _ in range(2):
+        monitor.connection_check_out_started(event)
+        monitor.connection_checked_out(event)
+    monitor.connection_checked_in(event)
+    monitor.connection_check_out_started(event)
+    monitor.connection_check_out_failed(event)
+    monitor.pool_cleared(event)
+
+    statistics = monitor.get_statistics()
+    assert statistics["open_connections"] == 2
+    assert statistics["checkouts"] == 2
+    assert statistics["checked_out"] == 1
+    assert statistics["peak_checked_out"] == 2
+    assert statistics["checkout_failures"] == 1
+    assert statistics["pool_clears"] == 1
+    assert statistics["utilization"] == 1 / DatabaseConfig.MAX_POOL_SIZE
+
+    monitor.reset()
+    assert monitor.get_statistics()["checkouts"] == 0
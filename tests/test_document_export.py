@@ -0,0 +1,85 @@
+"""Tests for CSV and XLSX exports streamed from cursors."""
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+
+import openpyxl
+import pytest
+
+from services.export_service import DocumentExportService
+
+COLUMNS = ["name", "message", "created_at"]
+CREATED = datetime(2025, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+
+async def seed(database, count):
+    await database.enquiries.insert_many([
+        {"name": f"Parent {index}", "message": f"Hello {index}", "created_at": CREATED}
+        for index in range(count)
+    ])
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+def test_supported_formats_and_media_types():
+    assert DocumentExportService.is_supported("csv")
+    assert DocumentExportService.is_supported("xlsx")
+    assert not DocumentExportService.is_supported("pdf")
+    assert not DocumentExportService.is_supported(None)
+    assert DocumentExportService.media_type("csv").startswith("text/csv")
+
+@pytest.mark.anyio
+async def test_csv_is_flushed_every_chunk_size_rows(mongo_db):
+    await seed(mongo_db, 5)
+    exporter = DocumentExportService(chunk_size=2)
+
+    chunks = await collect(exporter.iter_export(mongo_db.enquiries.find({}, {"_id": 0}), COLUMNS, "csv", "Enquiries"))
+
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0] == COLUMNS
+    assert [row[0] for row in rows[1:]] == [f"Parent {index}" for index in range(5)]
+    assert rows[1][2] == CREATED.astimezone(timezone.utc).isoformat()
+
+@pytest.mark.anyio
+async def test_csv_of_empty_cursor_is_only_the_header(mongo_db):
+    chunks = await collect(DocumentExportService().iter_csv(mongo_db.enquiries.find(), COLUMNS))
+
+    assert b"".join(chunks) == b"name,message,created_at\n"
+
+@pytest.mark.anyio
+async def test_xlsx_holds_every_row_with_naive_utc_dates(mongo_db):
+    await seed(mongo_db, 3)
+    await mongo_db.enquiries.update_one({"name": "Parent 0"}, {"$set": {"message": ["a", "b"]}})
+
+    chunks = await collect(DocumentExportService(chunk_size=2).iter_export(
+        mongo_db.enquiries.find({}, {"_id": 0}), COLUMNS, "xlsx", "Enquiries for a very long institute name"
+    ))
+
+    workbook = openpyxl.load_workbook(io.BytesIO(b"".join(chunks)))
+    sheet = workbook.active
+    assert sheet.title == "Enquiries for a very long insti"
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0] == tuple(COLUMNS)
+    assert len(rows) == 4
+    assert rows[1][1] == "['a', 'b']"
+    assert rows[1][2] == datetime(2025, 1, 1, 6, 30)
+
+@pytest.mark.parametrize("value", ["=HYPERLINK(\"http://x\")", "+1", "-2+3", "@SUM(A1)", "\tcmd", "\rcmd"])
+def test_formula_like_text_is_neutralised(value):
+    assert DocumentExportService._csv_value(value) == "'" + value
+    assert DocumentExportService._xlsx_value(value) == "'" + value
+
+@pytest.mark.parametrize("value", ["Hello", "a=b", 42, -3, None])
+def test_other_values_are_kept(value):
+    assert DocumentExportService._csv_value(value) == value
+    assert DocumentExportService._xlsx_value(value) == value
+
+@pytest.mark.anyio
+async def test_formula_in_stored_text_is_not_exported_as_formula(mongo_db):
+    await mongo_db.enquiries.insert_one({"name": "=1+1", "message": "ok", "created_at": CREATED})
+
+    chunks = await collect(DocumentExportService().iter_xlsx(mongo_db.enquiries.find(), COLUMNS, "Enquiries"))
+
+    sheet = openpyxl.load_workbook(io.BytesIO(b"".join(chunks))).active
+    assert sheet["A2"].value == "'=1+1"
+    assert sheet["A2"].data_type == "s"
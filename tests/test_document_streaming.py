@@ -0,0 +1,48 @@
+"""Tests for streaming cursors as JSON and NDJSON."""
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from services.streaming_service import DocumentStreamService
+
+class Item(BaseModel):
+    id: str
+    value: int
+
+async def collect(service, collection, mode):
+    return [chunk async for chunk in service.iter_encoded(collection.find({}, {"_id": 0}).sort("value", 1), Item, mode)]
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("count", [0, 1, 3, 4])
+async def test_json_stream_is_one_valid_array(mongo_db, count):
+    if count:
+        await mongo_db.items.insert_many([{"id": f"i{index}", "value": index} for index in range(count)])
+
+    chunks = await collect(DocumentStreamService(chunk_size=2), mongo_db.items, "json")
+
+    assert json.loads(b"".join(chunks)) == [{"id": f"i{index}", "value": index} for index in range(count)]
+
+@pytest.mark.anyio
+async def test_ndjson_stream_has_one_document_per_line_in_chunks(mongo_db):
+    await mongo_db.items.insert_many([{"id": f"i{index}", "value": index} for index in range(5)])
+
+    chunks = await collect(DocumentStreamService(chunk_size=2), mongo_db.items, "ndjson")
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["value"] for line in lines] == list(range(5))
+
+@pytest.mark.anyio
+async def test_documents_are_shaped_by_the_response_model(mongo_db):
+    await mongo_db.items.insert_one({"id": "i0", "value": 1, "internal": "hidden"})
+
+    chunks = await collect(DocumentStreamService(), mongo_db.items, "ndjson")
+
+    assert json.loads(b"".join(chunks)) == {"id": "i0", "value": 1}
+
+def test_supported_modes():
+    assert DocumentStreamService.is_supported("ndjson")
+    assert DocumentStreamService.media_type("json") == "application/json"
+    assert not DocumentStreamService.is_supported("csv")
+    assert not DocumentStreamService.is_supported(None)
@@ -0,0 +1,72 @@
+"""Tests for email normalization on input and for stored emails."""
+import pytest
+from pydantic import ValidationError
+
+from models import StudentUpdateSchema, UserLoginSchema, normalize_email
+from services.auth_service import account_activation_service, user_authentication_service
+from services.email_migration_service import EmailMigrationService
+from services.user_service import user_management_service
+
+def test_normalize_email_trims_and_lowercases():
+    assert normalize_email("  Ann.Lee@Example.COM ") == "ann.lee@example.com"
+
+def test_request_models_normalize_emails():
+    assert UserLoginSchema(email="Ann@X.com", password="pw").email == "ann@x.com"
+    assert StudentUpdateSchema(email="Ann@X.com").email == "ann@x.com"
+    assert StudentUpdateSchema().email is None
+
+    with pytest.raises(ValidationError):
+        UserLoginSchema(email="not-an-email", password="pw")
+
+@pytest.fixture
+async def mixed_case_db(mongo_db):
+    await mongo_db.users.create_index("email", unique=True)
+    await mongo_db.users.insert_many([
+        {"id": "u1", "email": "Ann@X.com"},
+        {"id": "u2", "email": "bob@x.com"},
+        {"id": "u3", "email": "Bob@X.com"},
+        {"id": "u4", "email": "cara@x.com"},
+    ])
+    await mongo_db.students.insert_one({"id": "s1", "email": "ANN@x.com"})
+    return mongo_db
+
+@pytest.mark.anyio
+async def test_migration_normalizes_emails_and_reports_conflicts(mixed_case_db):
+    summary = await EmailMigrationService(batch_size=2).migrate_all(mixed_case_db)
+
+    assert summary == {
+        "users": {"normalized": 1, "conflicts": 1},
+        "students": {"normalized": 1, "conflicts": 0},
+        "invites": {"normalized": 0, "conflicts": 0},
+    }
+    emails = {user["id"]: user["email"] async for user in mixed_case_db.users.find()}
+    assert emails == {"u1": "ann@x.com", "u2": "bob@x.com", "u3": "Bob@X.com", "u4": "cara@x.com"}
+    assert (await mixed_case_db.students.find_one({"id": "s1"}))["email"] == "ann@x.com"
+
+@pytest.mark.anyio
+async def test_completed_migration_is_not_rerun_until_reset(mixed_case_db):
+    migration = EmailMigrationService()
+    await migration.migrate_all(mixed_case_db)
+    await mixed_case_db.students.insert_one({"id": "s2", "email": "Dan@x.com"})
+
+    assert (await migration.migrate_all(mixed_case_db))["students"] == {"normalized": 1, "conflicts": 0}
+    assert (await mixed_case_db.students.find_one({"id": "s2"}))["email"] == "Dan@x.com"
+
+    await migration.reset_checkpoints(mixed_case_db)
+    await migration.migrate_all(mixed_case_db)
+
+    assert (await mixed_case_db.students.find_one({"id": "s2"}))["email"] == "dan@x.com"
+
+@pytest.mark.anyio
+async def test_login_and_signup_lookups_ignore_case(use_database, monkeypatch):
+    database = use_database("services.auth_service", "services.user_service")
+    await database.users.insert_one({"id": "u1", "email": "ann@x.com"})
+
+    async def verify_user_password(user, password):
+        return password == "secret"
+    monkeypatch.setattr(account_activation_service, "verify_user_password", verify_user_password)
+    monkeypatch.setattr(account_activation_service, "is_pending", lambda user: False)
+
+    assert (await user_authentication_service.authenticate_user(" Ann@X.com", "secret"))["id"] == "u1"
+    assert await user_management_service.check_email_exists("ANN@x.com") is True
+    assert await user_management_service.check_email_exists("bob@x.com") is False
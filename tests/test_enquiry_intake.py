@@ -0,0 +1,174 @@
+"""Tests for write-behind enquiry intake."""
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from models import UserRoleEnum
+from services.enquiry_intake_service import (
+    DEFAULT_INSTITUTE_ID,
+    EnquiryBufferFullError,
+    EnquiryIntakeService
+)
+
+class FlakyDatabase:
+    """Database whose ``enquiries.insert_many`` fails as scripted, then delegates."""
+
+    def __init__(self, database, *failures):
+        self.database = database
+        self.failures = list(failures)
+        self.enquiries = self
+        self.release = None
+
+    async def insert_many(self, documents, ordered=True):
+        if self.release is not None:
+            await self.release.wait()
+        if self.failures:
+            raise self.failures.pop(0)
+        return await self.database.enquiries.insert_many(documents, ordered=ordered)
+
+    async def insert_one(self, document):
+        return await self.database.enquiries.insert_one(document)
+
+def enquiry(index):
+    return {"id": f"enquiry-{index}", "name": f"Parent {index}"}
+
+def intake(**overrides):
+    settings = {
+        "enabled": True,
+        "flush_interval_ms": 60_000,
+        "flush_max_records": 10,
+        "max_pending": 10,
+        "enqueue_timeout_seconds": 0.05,
+        "institute_cache_seconds": 60,
+    }
+    return EnquiryIntakeService(**{**settings, **overrides})
+
+async def stored_ids(database):
+    return sorted(document["id"] for document in await database.enquiries.find().to_list(None))
+
+@pytest.mark.anyio
+async def test_submit_writes_directly_when_not_running(mongo_db):
+    service = intake()
+
+    await service.submit(mongo_db, enquiry(1))
+
+    assert await stored_ids(mongo_db) == ["enquiry-1"]
+    assert service.get_statistics()["written"] == 1
+    assert service.get_statistics()["pending"] == 0
+
+@pytest.mark.anyio
+async def test_disabled_service_never_starts(mongo_db):
+    service = intake(enabled=False)
+
+    service.start(mongo_db)
+
+    assert not service.is_running
+
+@pytest.mark.anyio
+async def test_queued_enquiries_are_written_on_stop(mongo_db):
+    service = intake()
+    service.start(mongo_db)
+
+    await service.submit(mongo_db, enquiry(1))
+    await service.submit(mongo_db, enquiry(2))
+    assert await stored_ids(mongo_db) == []
+
+    await service.stop(mongo_db)
+
+    assert await stored_ids(mongo_db) == ["enquiry-1", "enquiry-2"]
+    assert service.get_statistics()["written"] == 2
+    assert not service.is_running
+
+@pytest.mark.anyio
+async def test_full_batch_is_flushed_without_waiting_for_the_interval(mongo_db):
+    service = intake(flush_max_records=2)
+    service.start(mongo_db)
+
+    await service.submit(mongo_db, enquiry(1))
+    await service.submit(mongo_db, enquiry(2))
+    for _ in range(50):
+        if service.get_statistics()["written"] == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert await stored_ids(mongo_db) == ["enquiry-1", "enquiry-2"]
+    await service.stop(mongo_db)
+
+@pytest.mark.anyio
+async def test_rejected_documents_are_dropped_and_duplicates_ignored(mongo_db):
+    error = BulkWriteError({"writeErrors": [
+        {"index": 0, "code": 11000, "errmsg": "duplicate key"},
+        {"index": 1, "code": 121, "errmsg": "Document failed validation"},
+    ]})
+    database = FlakyDatabase(mongo_db, error)
+    service = intake()
+    service.start(database)
+    for index in range(3):
+        await service.submit(database, enquiry(index))
+
+    assert await service.flush(database) is True
+
+    statistics = service.get_statistics()
+    assert statistics["written"] == 2
+    assert statistics["dropped"] == 1
+    assert statistics["pending"] == 0
+    await service.stop(database)
+
+@pytest.mark.anyio
+async def test_failed_flush_requeues_the_batch_in_order(mongo_db):
+    database = FlakyDatabase(mongo_db, AutoReconnect("primary stepped down"))
+    service = intake(flush_max_records=2, max_pending=4)
+    service.start(database)
+    for index in range(3):
+        service._pending.append(enquiry(index))
+
+    assert await service.flush(database) is False
+    assert [document["id"] for document in service._pending] == ["enquiry-0", "enquiry-1", "enquiry-2"]
+    assert service.get_statistics()["failed_flushes"] == 1
+
+    assert await service.flush(database) is True
+    assert await stored_ids(mongo_db) == ["enquiry-0", "enquiry-1", "enquiry-2"]
+    await service.stop(database)
+
+@pytest.mark.anyio
+async def test_submit_is_rejected_while_the_buffer_stays_full(mongo_db):
+    database = FlakyDatabase(mongo_db)
+    database.release = asyncio.Event()
+    service = intake(flush_max_records=2, max_pending=2)
+    service.start(database)
+    await service.submit(database, enquiry(1))
+    await service.submit(database, enquiry(2))
+
+    with pytest.raises(EnquiryBufferFullError):
+        await service.submit(database, enquiry(3))
+    assert service.get_statistics()["rejected"] == 1
+
+    database.release.set()
+    await service.stop(database)
+    assert await stored_ids(mongo_db) == ["enquiry-1", "enquiry-2"]
+
+@pytest.mark.anyio
+async def test_submit_waits_for_a_flush_to_make_room(mongo_db):
+    service = intake(flush_max_records=2, max_pending=2, enqueue_timeout_seconds=1)
+    service.start(mongo_db)
+    await service.submit(mongo_db, enquiry(1))
+    await service.submit(mongo_db, enquiry(2))
+
+    await service.submit(mongo_db, enquiry(3))
+    await service.stop(mongo_db)
+
+    assert await stored_ids(mongo_db) == ["enquiry-1", "enquiry-2", "enquiry-3"]
+    assert service.get_statistics()["rejected"] == 0
+
+@pytest.mark.anyio
+async def test_institute_is_cached_once_an_admin_exists(mongo_db):
+    service = intake()
+
+    assert await service.resolve_institute(mongo_db) == DEFAULT_INSTITUTE_ID
+
+    await mongo_db.users.insert_one({"id": "admin-1", "role": UserRoleEnum.ADMIN})
+    assert await service.resolve_institute(mongo_db) == "admin-1"
+
+    await mongo_db.users.delete_many({})
+    assert await service.resolve_institute(mongo_db) == "admin-1"
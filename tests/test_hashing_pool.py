@@ -0,0 +1,50 @@
+"""Tests for the bounded password hashing pool."""
+import asyncio
+import threading
+
+import pytest
+
+from services.hashing_pool_service import HashingPoolSaturatedError, PasswordHashingPoolService
+
+@pytest.fixture
+def pool():
+    pool = PasswordHashingPoolService(executor_kind="thread", max_workers=1, max_queue_depth=1)
+    yield pool
+    pool.shutdown()
+
+@pytest.mark.anyio
+async def test_hash_and_verify_round_trip(pool):
+    hashed = await pool.hash_password("s3cret")
+
+    assert await pool.verify_password("s3cret", hashed)
+    assert not await pool.verify_password("wrong", hashed)
+    assert pool.get_statistics()["completed"] == 3
+
+@pytest.mark.anyio
+async def test_requests_beyond_workers_and_queue_are_shed(pool):
+    release = threading.Event()
+    running = [asyncio.create_task(pool._run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    assert pool.queue_depth == 1
+    with pytest.raises(HashingPoolSaturatedError):
+        await pool._run(release.wait)
+
+    release.set()
+    await asyncio.gather(*running)
+    statistics = pool.get_statistics()
+    assert statistics["rejected"] == 1
+    assert statistics["completed"] == 2
+    assert statistics["peak_queue_depth"] == 1
+    assert statistics["in_flight"] == 0
+
+@pytest.mark.anyio
+async def test_capacity_is_released_after_a_failure(pool):
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await pool._run(fail)
+
+    assert pool.get_statistics()["failed"] == 1
+    assert await pool._run(lambda: "ok") == "ok"
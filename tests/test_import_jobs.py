@@ -0,0 +1,158 @@
+"""Tests for background import jobs, their limits and stale detection."""
+import asyncio
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models import ImportJobStatusEnum
+from services.import_job_service import ImportJobLimitError, ImportJobService
+from services.upload_service import upload_ingestion_service
+
+INSTITUTE = "institute-1"
+
+def open_sheet(row_count):
+    lines = ["name,email"] + [f"Student {index},s{index}@x.com" for index in range(row_count)]
+    file = io.BytesIO("\n".join(lines).encode("utf-8"))
+    return file, upload_ingestion_service.open_file(file, "students.csv")
+
+async def submit(jobs, database, runner, row_count=3):
+    file, sheet = open_sheet(row_count)
+    job = await jobs.submit(database, "students", file, sheet, runner, INSTITUTE, "tutor-1", filename="students.csv")
+    return job, file
+
+async def finish(jobs):
+    await asyncio.gather(*list(jobs._tasks), return_exceptions=True)
+
+async def create_all(row_batches):
+    rows = []
+    async for batch in row_batches:
+        rows.extend({"row": row_number, "status": "created"} for row_number, _ in batch)
+    rows[-1] = {"row": rows[-1]["row"], "status": "error", "error": "Duplicate email"}
+    return {"created": len(rows) - 1, "failed": 1, "rows": rows}
+
+def test_summarize_splits_counts_from_row_errors():
+    counts, errors = ImportJobService.summarize({
+        "created": 2,
+        "skipped": 1,
+        "dry_run": False,
+        "rows": [{"row": 2, "status": "created"}, {"row": 3, "status": "skipped"}],
+        "errors": [{"row": 4, "error": "Bad date"}],
+    })
+
+    assert counts == {"created": 2, "skipped": 1}
+    assert errors == [{"row": 3, "status": "skipped"}, {"row": 4, "error": "Bad date"}]
+
+@pytest.mark.anyio
+async def test_job_completes_with_progress_counts_and_errors(mongo_db):
+    jobs = ImportJobService(max_concurrent_jobs=2, stale_seconds=60, max_stored_errors=10)
+    batch_size = upload_ingestion_service.batch_size
+
+    job, file = await submit(jobs, mongo_db, create_all, row_count=batch_size + 5)
+    await finish(jobs)
+
+    stored = await jobs.get_job(mongo_db, job.id, INSTITUTE)
+    assert stored["status"] == ImportJobStatusEnum.COMPLETED
+    assert stored["total_rows"] == batch_size + 5
+    assert stored["processed_rows"] == batch_size + 5
+    assert stored["counts"] == {"created": batch_size + 4, "failed": 1}
+    assert stored["errors"] == [{"row": batch_size + 6, "status": "error", "error": "Duplicate email"}]
+    assert stored["errors_truncated"] is False
+    assert file.closed
+
+@pytest.mark.anyio
+async def test_stored_errors_are_truncated(mongo_db):
+    async def fail_all(row_batches):
+        rows = []
+        async for batch in row_batches:
+            rows.extend({"row": row_number, "status": "error"} for row_number, _ in batch)
+        return {"created": 0, "rows": rows}
+
+    jobs = ImportJobService(max_concurrent_jobs=1, stale_seconds=60, max_stored_errors=2)
+
+    job, _ = await submit(jobs, mongo_db, fail_all, row_count=5)
+    await finish(jobs)
+
+    stored = await jobs.get_job(mongo_db, job.id, INSTITUTE)
+    assert len(stored["errors"]) == 2
+    assert stored["errors_truncated"] is True
+
+@pytest.mark.anyio
+async def test_runner_exception_fails_the_job(mongo_db):
+    async def broken(row_batches):
+        raise ValueError("Unknown batch")
+
+    jobs = ImportJobService(max_concurrent_jobs=1, stale_seconds=60, max_stored_errors=10)
+
+    job, file = await submit(jobs, mongo_db, broken)
+    await finish(jobs)
+
+    stored = await jobs.get_job(mongo_db, job.id, INSTITUTE)
+    assert stored["status"] == ImportJobStatusEnum.FAILED
+    assert stored["error"] == "Unknown batch"
+    assert file.closed
+
+@pytest.mark.anyio
+async def test_limit_rejects_extra_jobs_and_closes_their_file(mongo_db):
+    release = asyncio.Event()
+
+    async def wait(row_batches):
+        await release.wait()
+        return {}
+
+    jobs = ImportJobService(max_concurrent_jobs=1, stale_seconds=60, max_stored_errors=10)
+    await submit(jobs, mongo_db, wait)
+
+    file, sheet = open_sheet(1)
+    with pytest.raises(ImportJobLimitError):
+        await jobs.submit(mongo_db, "students", file, sheet, wait, INSTITUTE, "tutor-1")
+    assert file.closed
+    assert await mongo_db.import_jobs.count_documents({}) == 1
+
+    # Other institutes have their own limit
+    other_file, other_sheet = open_sheet(1)
+    await jobs.submit(mongo_db, "students", other_file, other_sheet, wait, "institute-2", "tutor-2")
+
+    release.set()
+    await finish(jobs)
+
+@pytest.mark.anyio
+async def test_stale_job_is_failed_when_read_and_frees_its_slot(mongo_db):
+    jobs = ImportJobService(max_concurrent_jobs=1, stale_seconds=60, max_stored_errors=10)
+    await mongo_db.import_jobs.insert_one({
+        "id": "job-1",
+        "institute_id": INSTITUTE,
+        "status": ImportJobStatusEnum.RUNNING,
+        "updated_at": datetime.now(timezone.utc) - timedelta(minutes=5),
+    })
+
+    stored = await jobs.get_job(mongo_db, "job-1", INSTITUTE)
+
+    assert stored["status"] == ImportJobStatusEnum.FAILED
+    assert stored["error"] == "Import stopped reporting progress"
+    assert (await mongo_db.import_jobs.find_one({"id": "job-1"}))["status"] == ImportJobStatusEnum.FAILED
+    assert await jobs.get_job(mongo_db, "job-1", "institute-2") is None
+
+    job, _ = await submit(jobs, mongo_db, create_all)
+    await finish(jobs)
+    assert (await jobs.get_job(mongo_db, job.id, INSTITUTE))["status"] == ImportJobStatusEnum.COMPLETED
+
+@pytest.mark.anyio
+async def test_stop_marks_running_jobs_interrupted(mongo_db):
+    started = asyncio.Event()
+
+    async def hang(row_batches):
+        started.set()
+        await asyncio.Event().wait()
+
+    jobs = ImportJobService(max_concurrent_jobs=1, stale_seconds=60, max_stored_errors=10)
+    job, file = await submit(jobs, mongo_db, hang)
+    await started.wait()
+
+    await jobs.stop()
+
+    stored = await jobs.get_job(mongo_db, job.id, INSTITUTE)
+    assert stored["status"] == ImportJobStatusEnum.FAILED
+    assert stored["error"] == "Import was interrupted by a server shutdown"
+    assert file.closed
+    assert not jobs._tasks
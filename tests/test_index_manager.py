@@ -0,0 +1,55 @@
+"""Tests for the declarative index registry."""
+import pytest
+from pymongo import ASCENDING, IndexModel
+
+from services.index_service import INDEX_REGISTRY, IndexManagementService
+
+@pytest.mark.anyio
+async def test_applying_the_registry_leaves_nothing_missing(mongo_db):
+    manager = IndexManagementService()
+
+    summary = await manager.apply_indexes(mongo_db)
+    report = await manager.report_indexes(mongo_db)
+
+    assert summary["failed"] == {}
+    assert set(summary["created"]) == set(INDEX_REGISTRY)
+    assert report == {"missing": {}, "extra": {}, "mismatched": {}}
+
+@pytest.mark.anyio
+async def test_report_lists_missing_extra_and_mismatched_indexes(mongo_db):
+    await mongo_db.users.create_index([("email", ASCENDING)], name="email_unique")
+    await mongo_db.users.create_index([("legacy", ASCENDING)], name="legacy")
+    manager = IndexManagementService({
+        "users": [
+            IndexModel([("email", ASCENDING), ("role", ASCENDING)], name="email_unique"),
+            IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        ],
+    })
+
+    report = await manager.report_indexes(mongo_db)
+
+    assert report == {
+        "missing": {"users": ["id_unique"]},
+        "extra": {"users": ["legacy"]},
+        "mismatched": {"users": ["email_unique"]},
+    }
+
+@pytest.mark.anyio
+async def test_drop_extra_removes_undeclared_indexes(mongo_db):
+    await mongo_db.users.create_index([("legacy", ASCENDING)], name="legacy")
+    manager = IndexManagementService({"users": [IndexModel([("id", ASCENDING)], name="id_unique", unique=True)]})
+
+    summary = await manager.apply_indexes(mongo_db, drop_extra=True)
+
+    assert summary["dropped"] == {"users": ["legacy"]}
+    names = [index["name"] async for index in mongo_db.users.list_indexes()]
+    assert sorted(names) == ["_id_", "id_unique"]
+
+@pytest.mark.anyio
+async def test_unique_index_conflicts_are_reported_not_raised(mongo_db):
+    await mongo_db.users.insert_many([{"id": "same"}, {"id": "same"}])
+    manager = IndexManagementService({"users": [IndexModel([("id", ASCENDING)], name="id_unique", unique=True)]})
+
+    summary = await manager.apply_indexes(mongo_db)
+
+    assert "users" in summary["failed"]
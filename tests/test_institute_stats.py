@@ -0,0 +1,53 @@
+"""Tests for the materialized per-institute dashboard counters."""
+import pytest
+
+from services.institute_stats_service import InstituteStatsService
+
+@pytest.fixture
+async def institute_db(mongo_db):
+    await mongo_db.batches.insert_one({"id": "b1", "institute_id": "i1"})
+    await mongo_db.users.insert_one({"id": "t1", "institute_id": "i1", "role": "tutor"})
+    await mongo_db.students.insert_one({"id": "s1", "institute_id": "i1", "total_fees": 100.0, "paid_amount": 30.0})
+    await mongo_db.payments.insert_one({"id": "p1", "institute_id": "i1", "amount": 30.0})
+    return mongo_db
+
+EXPECTED = {"total_batches": 1, "total_students": 1, "total_tutors": 1, "total_revenue": 30.0, "pending_fees": 70.0}
+
+@pytest.mark.anyio
+async def test_first_read_seeds_the_counters(institute_db):
+    stats = InstituteStatsService(reconcile_interval_seconds=0)
+
+    assert await stats.get_statistics(institute_db, "i1") == EXPECTED
+    assert (await institute_db.institute_stats.find_one({"institute_id": "i1"}))["reconciled_at"] is not None
+
+@pytest.mark.anyio
+async def test_increments_adjust_the_counters(institute_db):
+    stats = InstituteStatsService(reconcile_interval_seconds=0)
+    await stats.get_statistics(institute_db, "i1")
+
+    await stats.increment(institute_db, "i1", total_students=2, pending_fees=50.0, total_revenue=0)
+
+    assert await stats.get_statistics(institute_db, "i1") == {**EXPECTED, "total_students": 3, "pending_fees": 120.0}
+
+@pytest.mark.anyio
+async def test_increments_skip_institutes_without_counters(mongo_db):
+    await InstituteStatsService(reconcile_interval_seconds=0).increment(mongo_db, "i1", total_students=1)
+
+    assert await mongo_db.institute_stats.count_documents({}) == 0
+
+@pytest.mark.anyio
+async def test_reconcile_corrects_drift(institute_db):
+    stats = InstituteStatsService(reconcile_interval_seconds=0)
+    await stats.get_statistics(institute_db, "i1")
+    await stats.increment(institute_db, "i1", total_students=5)
+
+    assert await stats.reconcile(institute_db, "i1") == EXPECTED
+    assert await stats.get_statistics(institute_db, "i1") == EXPECTED
+
+@pytest.mark.anyio
+async def test_reconcile_all_visits_every_seeded_institute(institute_db):
+    stats = InstituteStatsService(reconcile_interval_seconds=0)
+    await stats.get_statistics(institute_db, "i1")
+    await stats.get_statistics(institute_db, "i2")
+
+    assert await stats.reconcile_all(institute_db) == 2
@@ -0,0 +1,85 @@
+"""Tests for keyset pagination cursors and pages."""
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pymongo import ASCENDING, DESCENDING
+
+from services.pagination_service import InvalidCursorError, KeysetPaginationService
+
+pagination = KeysetPaginationService(default_limit=2, max_limit=3)
+
+@pytest.mark.parametrize("sort_value", [
+    "Ann",
+    42,
+    12.5,
+    None,
+    datetime(2025, 1, 1, 10, 30, tzinfo=timezone.utc),
+])
+def test_cursor_round_trip(sort_value):
+    cursor = pagination.encode_cursor(sort_value, "doc-1")
+
+    assert "=" not in cursor
+    assert pagination.decode_cursor(cursor) == (sort_value, "doc-1")
+
+def test_decoded_datetimes_are_utc_aware():
+    sort_value, _ = pagination.decode_cursor(pagination.encode_cursor(datetime(2025, 1, 1, tzinfo=timezone.utc), "doc-1"))
+
+    assert sort_value.tzinfo is not None
+    assert sort_value.utcoffset() == timedelta(0)
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'["only one"]').decode(),
+    base64.urlsafe_b64encode(b'["value", 7]').decode(),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        pagination.decode_cursor(cursor)
+
+def test_limit_is_clamped():
+    assert pagination.resolve_limit(None) == 2
+    assert pagination.resolve_limit(0) == 1
+    assert pagination.resolve_limit(100) == 3
+
+def test_build_query_keeps_the_base_filter():
+    cursor = pagination.encode_cursor("Ann", "doc-1")
+
+    assert pagination.build_query({"batch_id": "b1"}, "name", ASCENDING, None) == {"batch_id": "b1"}
+    assert pagination.build_query({"batch_id": "b1"}, "name", ASCENDING, cursor) == {"$and": [
+        {"batch_id": "b1"},
+        {"$or": [{"name": {"$gt": "Ann"}}, {"name": "Ann", "id": {"$gt": "doc-1"}}]},
+    ]}
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("direction", [ASCENDING, DESCENDING])
+async def test_pages_cover_every_document_once_with_tied_sort_keys(mongo_db, direction):
+    # Several documents share a sort key, so the id tie-breaker decides the order
+    await mongo_db.students.insert_many([
+        {"id": f"s{index}", "name": f"Name {index // 3}", "batch_id": "b1"} for index in range(7)
+    ])
+    await mongo_db.students.insert_one({"id": "other", "name": "Name 0", "batch_id": "b2"})
+
+    seen = []
+    cursor = None
+    while True:
+        documents, cursor = await pagination.fetch_page(
+            mongo_db.students, {"batch_id": "b1"}, "name", direction, limit=2, cursor=cursor
+        )
+        seen.extend(document["id"] for document in documents)
+        assert "_id" not in documents[0]
+        if cursor is None:
+            break
+
+    expected = sorted((f"s{index}" for index in range(7)), key=lambda doc_id: (int(doc_id[1:]) // 3, doc_id))
+    assert seen == (expected if direction == ASCENDING else expected[::-1])
+
+@pytest.mark.anyio
+async def test_last_full_page_has_no_next_cursor(mongo_db):
+    await mongo_db.batches.insert_many([{"id": f"b{index}", "created_at": index} for index in range(2)])
+
+    documents, cursor = await pagination.fetch_page(mongo_db.batches, {}, "created_at", limit=2)
+
+    assert [document["id"] for document in documents] == ["b1", "b0"]
+    assert cursor is None
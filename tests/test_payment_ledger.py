@@ -0,0 +1,68 @@
+"""Tests for the atomic payment ledger."""
+import asyncio
+
+import pytest
+
+from services.payment_ledger_service import payment_ledger_service
+
+@pytest.fixture
+async def db(use_database):
+    database = use_database("services.payment_ledger_service")
+    await database.students.insert_one({"id": "s1", "total_fees": 100.0, "paid_amount": 0.0, "payment_status": "unpaid"})
+    return database
+
+@pytest.mark.anyio
+async def test_payments_accumulate_and_derive_the_status(db):
+    assert await payment_ledger_service.apply_payment("s1", 40.0) == {
+        "total_fees": 100.0, "paid_amount": 40.0, "payment_status": "partial"
+    }
+    assert (await payment_ledger_service.apply_payment("s1", 60.0))["payment_status"] == "paid"
+
+@pytest.mark.anyio
+async def test_reversal_moves_the_status_back(db):
+    await payment_ledger_service.apply_payment("s1", 100.0)
+
+    updated = await payment_ledger_service.apply_payment("s1", -100.0)
+
+    assert updated["paid_amount"] == 0.0
+    assert updated["payment_status"] == "unpaid"
+
+@pytest.mark.anyio
+async def test_concurrent_payments_are_not_lost(db):
+    await asyncio.gather(*(payment_ledger_service.apply_payment("s1", 10.0) for _ in range(10)))
+
+    student = await db.students.find_one({"id": "s1"})
+    assert student["paid_amount"] == 100.0
+    assert student["payment_status"] == "paid"
+
+@pytest.mark.anyio
+async def test_missing_paid_amount_counts_as_zero(db):
+    await db.students.insert_one({"id": "legacy", "total_fees": 50.0})
+
+    assert (await payment_ledger_service.apply_payment("legacy", 20.0))["paid_amount"] == 20.0
+
+@pytest.mark.anyio
+async def test_unknown_student_returns_none(db):
+    assert await payment_ledger_service.apply_payment("ghost", 10.0) is None
+
+@pytest.mark.anyio
+async def test_refresh_status_follows_a_fee_change(db):
+    await payment_ledger_service.apply_payment("s1", 60.0)
+    await db.students.update_one({"id": "s1"}, {"$set": {"total_fees": 60.0}})
+
+    await payment_ledger_service.refresh_status("s1")
+
+    assert (await db.students.find_one({"id": "s1"}))["payment_status"] == "paid"
+
+@pytest.mark.anyio
+async def test_rebuild_recomputes_the_total_from_payments(db):
+    await db.payments.insert_many([
+        {"id": "p1", "student_id": "s1", "amount": 30.0},
+        {"id": "p2", "student_id": "s1", "amount": 20.0},
+        {"id": "p3", "student_id": "other", "amount": 99.0},
+    ])
+    await db.students.update_one({"id": "s1"}, {"$set": {"paid_amount": 999.0}})
+
+    assert await payment_ledger_service.rebuild_student_total("s1") == 50.0
+    student = await db.students.find_one({"id": "s1"})
+    assert (student["paid_amount"], student["payment_status"]) == (50.0, "partial")
@@ -0,0 +1,133 @@
+"""Tests for the principal and token cache."""
+import time
+
+import pytest
+
+from services.principal_cache_service import PrincipalCacheService, TimedLRUCache
+
+def make_loader(users):
+    calls = []
+
+    async def loader(user_id):
+        calls.append(user_id)
+        user = users.get(user_id)
+        return dict(user) if user else None
+
+    return loader, calls
+
+@pytest.mark.anyio
+async def test_principal_is_loaded_once_and_returned_without_password():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+    loader, calls = make_loader({"u1": {"id": "u1", "email": "a@x.com", "password": "hash"}})
+
+    first = await cache.get_principal("u1", loader)
+    second = await cache.get_principal("u1", loader)
+
+    assert calls == ["u1"]
+    assert first == second == {"id": "u1", "email": "a@x.com"}
+    assert cache.get_statistics()["principal_hits"] == 1
+
+@pytest.mark.anyio
+async def test_cached_principal_is_a_copy():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+    loader, _ = make_loader({"u1": {"id": "u1", "role": "tutor"}})
+
+    await cache.get_principal("u1", loader)
+    principal = await cache.get_principal("u1", loader)
+    principal["role"] = "admin"
+
+    assert (await cache.get_principal("u1", loader))["role"] == "tutor"
+
+@pytest.mark.anyio
+async def test_missing_user_is_not_cached():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+    loader, calls = make_loader({})
+
+    assert await cache.get_principal("ghost", loader) is None
+    assert await cache.get_principal("ghost", loader) is None
+    assert calls == ["ghost", "ghost"]
+
+@pytest.mark.anyio
+async def test_invalidate_user_forces_a_reload():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+    users = {"u1": {"id": "u1", "name": "Old"}}
+    loader, calls = make_loader(users)
+
+    await cache.get_principal("u1", loader)
+    users["u1"] = {"id": "u1", "name": "New"}
+    cache.invalidate_user("u1")
+
+    assert (await cache.get_principal("u1", loader))["name"] == "New"
+    assert calls == ["u1", "u1"]
+
+@pytest.mark.anyio
+async def test_invalidate_email_drops_only_matching_principals():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+    loader, calls = make_loader({
+        "u1": {"id": "u1", "email": "a@x.com"},
+        "u2": {"id": "u2", "email": "b@x.com"},
+    })
+    await cache.get_principal("u1", loader)
+    await cache.get_principal("u2", loader)
+
+    cache.invalidate_email("a@x.com")
+    await cache.get_principal("u1", loader)
+    await cache.get_principal("u2", loader)
+
+    assert calls == ["u1", "u2", "u1"]
+
+def test_token_is_decoded_once():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+    decoded = []
+
+    def decoder(token):
+        decoded.append(token)
+        return {"sub": "u1", "exp": time.time() + 3600}
+
+    assert cache.decode_token("token", decoder)["sub"] == "u1"
+    assert cache.decode_token("token", decoder)["sub"] == "u1"
+    assert decoded == ["token"]
+
+def test_expired_token_payload_is_not_cached():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+    decoded = []
+
+    def decoder(token):
+        decoded.append(token)
+        return {"sub": "u1", "exp": time.time() - 1}
+
+    cache.decode_token("token", decoder)
+    cache.decode_token("token", decoder)
+
+    assert decoded == ["token", "token"]
+
+def test_decoder_errors_propagate_and_are_not_cached():
+    cache = PrincipalCacheService(principal_ttl_seconds=60)
+
+    def decoder(token):
+        raise ValueError("bad token")
+
+    with pytest.raises(ValueError):
+        cache.decode_token("token", decoder)
+    assert len(cache.tokens) == 0
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = TimedLRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = TimedLRUCache(max_entries=10, ttl_seconds=5)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("a", 1)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,123 @@
+"""Tests for cached principal scopes and the list filters built from them."""
+import pytest
+
+from models import UserRoleEnum
+from services.scope_service import PrincipalScope, PrincipalScopeService
+
+ADMIN = {"id": "admin-1", "role": UserRoleEnum.ADMIN, "email": "admin@x.com", "institute_id": "institute-1"}
+TUTOR = {"id": "tutor-1", "role": UserRoleEnum.TUTOR, "email": "tutor@x.com", "institute_id": "institute-1"}
+STUDENT = {"id": "user-9", "role": UserRoleEnum.STUDENT, "email": "ann@x.com", "institute_id": "institute-1"}
+
+async def seed(database):
+    await database.batches.insert_many([
+        {"id": "batch-1", "tutor_id": "tutor-1"},
+        {"id": "batch-2", "tutor_id": "tutor-1"},
+        {"id": "batch-3", "tutor_id": "tutor-2"},
+    ])
+    await database.students.insert_one({"id": "student-1", "email": "ann@x.com", "batch_id": "batch-2"})
+
+@pytest.mark.anyio
+async def test_tutor_scope_holds_the_batches_they_teach(mongo_db):
+    await seed(mongo_db)
+    scopes = PrincipalScopeService(ttl_seconds=60, max_entries=10)
+
+    scope = await scopes.resolve(mongo_db, TUTOR)
+
+    assert sorted(scope.batch_ids) == ["batch-1", "batch-2"]
+    assert scope.institute_id == "institute-1"
+    assert scope.student_id is None
+    assert scopes.build_filter(scope, "batches") == {"tutor_id": "tutor-1"}
+    assert sorted(scopes.build_filter(scope, "students")["batch_id"]["$in"]) == ["batch-1", "batch-2"]
+
+@pytest.mark.anyio
+async def test_student_scope_holds_their_record_and_batch(mongo_db):
+    await seed(mongo_db)
+    scopes = PrincipalScopeService(ttl_seconds=60, max_entries=10)
+
+    scope = await scopes.resolve(mongo_db, STUDENT)
+
+    assert scope.batch_ids == ("batch-2",)
+    assert scope.student_id == "student-1"
+    assert scopes.build_filter(scope, "batches") == {"id": {"$in": ["batch-2"]}}
+    assert scopes.build_filter(scope, "students") == {"email": "ann@x.com"}
+    assert scopes.build_filter(scope, "payments") == {"student_id": "student-1"}
+
+@pytest.mark.anyio
+async def test_student_without_a_record_matches_nothing(mongo_db):
+    await mongo_db.payments.insert_one({"id": "payment-1", "student_id": None})
+    scopes = PrincipalScopeService(ttl_seconds=60, max_entries=10)
+
+    scope = await scopes.resolve(mongo_db, STUDENT)
+    payments = await mongo_db.payments.find(scopes.build_filter(scope, "payments")).to_list(None)
+    materials = await mongo_db.materials.find(scopes.build_filter(scope, "materials")).to_list(None)
+
+    assert scope.student_id is None
+    assert payments == []
+    assert materials == []
+
+def test_other_roles_see_their_whole_institute():
+    scope = PrincipalScope("admin-1", UserRoleEnum.ADMIN, "admin@x.com", "institute-1", (), None)
+
+    for collection in ("batches", "students", "payments", "classes", "materials", "homework"):
+        assert PrincipalScopeService.build_filter(scope, collection) == {"institute_id": "institute-1"}
+
+@pytest.mark.anyio
+async def test_institute_owner_without_institute_id_scopes_to_themselves(mongo_db):
+    scopes = PrincipalScopeService(ttl_seconds=60, max_entries=10)
+
+    assert await scopes.build_query(mongo_db, {**ADMIN, "institute_id": None}, "students") == {"institute_id": "admin-1"}
+
+@pytest.mark.anyio
+async def test_scopes_are_cached_until_invalidated(mongo_db):
+    await seed(mongo_db)
+    scopes = PrincipalScopeService(ttl_seconds=60, max_entries=10)
+    await scopes.resolve(mongo_db, TUTOR)
+
+    await mongo_db.batches.insert_one({"id": "batch-4", "tutor_id": "tutor-1"})
+    assert "batch-4" not in (await scopes.resolve(mongo_db, TUTOR)).batch_ids
+
+    scopes.invalidate_batch("batch-4", tutor_id="tutor-1")
+    assert "batch-4" in (await scopes.resolve(mongo_db, TUTOR)).batch_ids
+    assert scopes.get_statistics()["hits"] == 1
+    assert scopes.get_statistics()["misses"] == 2
+
+@pytest.mark.anyio
+async def test_a_role_change_is_not_served_from_cache(mongo_db):
+    await seed(mongo_db)
+    scopes = PrincipalScopeService(ttl_seconds=60, max_entries=10)
+    await scopes.resolve(mongo_db, {**STUDENT, "id": "tutor-1", "email": "tutor@x.com"})
+
+    scope = await scopes.resolve(mongo_db, TUTOR)
+
+    assert scope.role == UserRoleEnum.TUTOR
+    assert sorted(scope.batch_ids) == ["batch-1", "batch-2"]
+
+@pytest.mark.anyio
+async def test_invalidation_drops_only_the_affected_scopes(mongo_db):
+    await seed(mongo_db)
+    scopes = PrincipalScopeService(ttl_seconds=60, max_entries=10)
+    for principal in (ADMIN, TUTOR, STUDENT):
+        await scopes.resolve(mongo_db, principal)
+
+    scopes.invalidate_batch("batch-1")
+    assert {user_id for user_id, _ in scopes.scopes.items()} == {"admin-1", "user-9"}
+
+    scopes.invalidate_email(None, "ann@x.com")
+    assert {user_id for user_id, _ in scopes.scopes.items()} == {"admin-1"}
+
+    await scopes.resolve(mongo_db, STUDENT)
+    scopes.invalidate_role(UserRoleEnum.STUDENT)
+    assert {user_id for user_id, _ in scopes.scopes.items()} == {"admin-1"}
+
+    scopes.invalidate_user("admin-1")
+    assert len(scopes.scopes) == 0
+
+@pytest.mark.anyio
+async def test_expired_scopes_are_reloaded(mongo_db):
+    await seed(mongo_db)
+    scopes = PrincipalScopeService(ttl_seconds=0, max_entries=10)
+
+    await scopes.resolve(mongo_db, TUTOR)
+    await scopes.resolve(mongo_db, TUTOR)
+
+    assert scopes.get_statistics()["misses"] == 2
@@ -0,0 +1,45 @@
+"""Tests for batched recurring class generation."""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from services.schedule_service import ClassScheduleService
+
+BATCH = {"id": "b1", "name": "Batch 1", "tutor_id": "t1"}
+
+def brute_force(start, end, weekdays):
+    days = ((end - start).days + 1)
+    return [start + timedelta(days=offset) for offset in range(days) if (start + timedelta(days=offset)).weekday() in weekdays]
+
+@pytest.mark.parametrize("weekdays", [{0}, {0, 2, 4}, {5, 6}, set(range(7))])
+def test_weekday_dates_match_a_day_by_day_scan(weekdays):
+    start, end = date(2025, 1, 1), date(2025, 3, 31)
+
+    assert ClassScheduleService.weekday_dates(start, end, weekdays) == brute_force(start, end, weekdays)
+
+def test_weekday_dates_include_both_ends_and_handle_empty_ranges():
+    assert ClassScheduleService.weekday_dates(date(2025, 1, 6), date(2025, 1, 13), [0]) == [date(2025, 1, 6), date(2025, 1, 13)]
+    assert ClassScheduleService.weekday_dates(date(2025, 1, 7), date(2025, 1, 8), [0]) == []
+
+@pytest.mark.parametrize("start, end, weekdays", [
+    (date(2025, 1, 1), date(2025, 1, 31), [7]),
+    (date(2025, 1, 31), date(2025, 1, 1), [0]),
+])
+def test_weekday_dates_reject_bad_input(start, end, weekdays):
+    with pytest.raises(ValueError):
+        ClassScheduleService.weekday_dates(start, end, weekdays)
+
+@pytest.mark.anyio
+async def test_generation_writes_in_chunks_and_skips_existing_dates(use_database):
+    db = use_database("services.schedule_service")
+    scheduler = ClassScheduleService(chunk_size=2)
+
+    first = await scheduler.generate_recurring(BATCH, date(2025, 1, 1), date(2025, 1, 14), [0, 2], "10:00", "i1")
+    second = await scheduler.generate_recurring(BATCH, date(2025, 1, 1), date(2025, 1, 21), [0, 2], "10:00", "i1")
+
+    assert first == {"created": ["2025-01-01", "2025-01-06", "2025-01-08", "2025-01-13"], "skipped": []}
+    assert second == {"created": ["2025-01-15", "2025-01-20"], "skipped": first["created"]}
+    assert await db.classes.count_documents({"batch_id": "b1"}) == 6
+    stored = await db.classes.find_one({"batch_id": "b1"})
+    assert isinstance(stored["class_date"], datetime)
+    assert (stored["tutor_id"], stored["institute_id"], stored["class_time"]) == ("t1", "i1", "10:00")
@@ -0,0 +1,75 @@
+"""Tests for schedule sheet validation and the dry-run preview."""
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from services.schedule_service import ClassScheduleService
+
+BATCH = {"id": "b1", "name": "Batch 1", "tutor_id": "t1"}
+START = datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+def test_dates_accept_iso_strings_and_spreadsheet_values():
+    assert ClassScheduleService._parse_dates(["2025-01-02", datetime(2025, 1, 3, 8, 0), date(2025, 1, 4), None, ""]) == [
+        date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 4), None, None,
+    ]
+
+def test_bad_dates_are_explained():
+    assert ClassScheduleService._parse_dates(["2025-02-30", "02/01/2025"]) == [
+        "'2025-02-30' is not a valid date",
+        "'02/01/2025' is not in YYYY-MM-DD format",
+    ]
+
+@pytest.mark.parametrize("value, expected", [
+    ("10:00", ("10:00", None)),
+    ("9:30 pm", ("9:30 pm", None)),
+    (time(14, 5), ("14:05", None)),
+    ("24:00", (None, "'24:00' is not a valid time")),
+    ("13:00 PM", (None, "'13:00 PM' is not a valid time")),
+    ("0:15 am", (None, "'0:15 am' is not a valid time")),
+    ("noon", (None, "'noon' is not a valid time")),
+    (None, (None, "time is required")),
+])
+def test_times(value, expected):
+    assert ClassScheduleService._parse_times([value]) == [expected]
+
+def test_rows_without_a_date_follow_their_sheet_position():
+    entries, errors = ClassScheduleService().validate_rows([
+        (2, {"date": "2025-04-01", "time": "10:00", "topic": " Algebra "}),
+        (3, {"time": "11:00"}),
+        (4, {"date": "bad", "time": "25:00"}),
+        (5, {"time": "12:00"}),
+    ], START)
+
+    assert [(entry["row"], entry["class_date"], entry["date_source"]) for entry in entries] == [
+        (2, datetime(2025, 4, 1, tzinfo=timezone.utc), "file"),
+        (3, datetime(2025, 3, 3, 9, 0, tzinfo=timezone.utc), "auto"),
+        (5, datetime(2025, 3, 5, 9, 0, tzinfo=timezone.utc), "auto"),
+    ]
+    assert entries[0]["topic"] == "Algebra"
+    assert [(error["row"], error["field"]) for error in errors] == [(4, "date"), (4, "time")]
+
+async def batches_of(rows):
+    yield list(enumerate(rows, start=2))
+
+ROWS = [{"date": "2025-04-01", "time": "10:00", "topic": "A"}, {"date": "2025-04-02", "time": "oops"}]
+
+@pytest.mark.anyio
+async def test_dry_run_previews_without_writing(use_database):
+    db = use_database("services.schedule_service")
+
+    report = await ClassScheduleService().import_rows(batches_of(ROWS), BATCH, "i1", dry_run=True)
+
+    assert (report["valid"], report["invalid"]) == (1, 1)
+    assert report["preview"][0]["class_date"] == "2025-04-01"
+    assert "class_ids" not in report
+    assert await db.classes.count_documents({}) == 0
+
+@pytest.mark.anyio
+async def test_import_writes_valid_rows(use_database):
+    db = use_database("services.schedule_service")
+
+    report = await ClassScheduleService().import_rows(batches_of(ROWS), BATCH, "i1")
+
+    assert len(report["class_ids"]) == 1
+    stored = await db.classes.find_one({"id": report["class_ids"][0]})
+    assert (stored["topic"], stored["class_time"], stored["tutor_id"]) == ("A", "10:00", "t1")
@@ -0,0 +1,105 @@
+"""Tests for the bulk student import pipeline."""
+import pytest
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+from services.student_import_service import StudentImportService
+
+BATCH = {"id": "b1", "name": "Batch 1"}
+
+def row(name, email, phone="9000000000", total_fees="100"):
+    return {"name": name, "email": email, "phone": phone, "whatsapp": None, "total_fees": total_fees}
+
+async def batches_of(rows, size=2):
+    numbered = list(enumerate(rows, start=2))
+    for start in range(0, len(numbered), size):
+        yield numbered[start:start + size]
+
+@pytest.fixture
+async def db(use_database):
+    database = use_database("services.student_import_service")
+    await database.users.create_index([("email", ASCENDING)], unique=True)
+    return database
+
+def statuses(report):
+    return {row_report["row"]: (row_report["status"], row_report.get("error") or row_report.get("note")) for row_report in report["rows"]}
+
+@pytest.mark.anyio
+async def test_rows_are_validated_deduplicated_and_written(db):
+    importer = StudentImportService(chunk_size=2)
+
+    report = await importer.import_students(batches_of([
+        row("Ann", "ann@x.com"),
+        row("Bob", "bob@x.com", total_fees="50"),
+        row("Ann again", "ANN@x.com"),
+        row("No phone", "np@x.com", phone=""),
+        row("Bad", "not-an-email"),
+    ]), BATCH, "i1")
+
+    assert (report["created"], report["skipped"], report["failed"]) == (2, 0, 3)
+    assert statuses(report)[4] == ("error", "Duplicate email in file")
+    assert statuses(report)[5][0] == statuses(report)[6][0] == "error"
+    assert report["students"] == ["Ann", "Bob"]
+    assert report["total_fees"] == 150.0
+    assert [email for email, _ in report["activations"]] == ["ann@x.com", "bob@x.com"]
+    assert await db.students.count_documents({"batch_id": "b1"}) == 2
+    assert await db.users.count_documents({"role": "student", "account_status": "pending_activation"}) == 2
+
+@pytest.mark.anyio
+async def test_emails_are_matched_and_stored_lowercased(db):
+    await db.users.insert_one({"id": "u1", "email": "ann@x.com", "role": "student"})
+    await db.students.insert_one({"id": "s0", "email": "bob@x.com", "batch_id": "b1"})
+
+    report = await StudentImportService().import_students(batches_of([
+        row("Ann", "Ann@X.com"),
+        row("Bob", "BOB@x.com"),
+        row("Cid", "Cid@X.com"),
+    ]), BATCH, "i1")
+
+    assert statuses(report) == {
+        2: ("created", "Existing user account kept"),
+        3: ("skipped", "Already enrolled in this batch"),
+        4: ("created", None),
+    }
+    assert [email for email, _ in report["activations"]] == ["cid@x.com"]
+    assert await db.users.find_one({"email": "cid@x.com"}) is not None
+
+@pytest.mark.anyio
+async def test_account_created_concurrently_is_kept(db, monkeypatch):
+    collection_type = type(db.users)
+    original_insert_many = collection_type.insert_many
+
+    async def insert_many(collection, documents, **kwargs):
+        if collection.name == "users":
+            await original_insert_many(db.users, [{"id": "other", "email": "ann@x.com"}])
+        return await original_insert_many(collection, documents, **kwargs)
+
+    monkeypatch.setattr(collection_type, "insert_many", insert_many)
+
+    report = await StudentImportService().import_students(batches_of([row("Ann", "ann@x.com")]), BATCH, "i1")
+
+    assert statuses(report) == {2: ("created", "Existing user account kept")}
+    assert report["activations"] == []
+
+@pytest.mark.anyio
+async def test_other_account_write_errors_fail_the_row(db, monkeypatch):
+    collection_type = type(db.users)
+    original_insert_many = collection_type.insert_many
+
+    async def insert_many(collection, documents, **kwargs):
+        if collection.name != "users":
+            return await original_insert_many(collection, documents, **kwargs)
+        await original_insert_many(collection, documents[1:], **kwargs)
+        raise BulkWriteError({"writeErrors": [{"index": 0, "code": 121, "errmsg": "Document failed validation"}]})
+
+    monkeypatch.setattr(collection_type, "insert_many", insert_many)
+
+    report = await StudentImportService().import_students(batches_of([
+        row("Ann", "ann@x.com"),
+        row("Bob", "bob@x.com"),
+    ]), BATCH, "i1")
+
+    assert statuses(report) == {2: ("error", "Could not create user account"), 3: ("created", None)}
+    assert report["students"] == ["Bob"]
+    assert [email for email, _ in report["activations"]] == ["bob@x.com"]
+    assert await db.students.find_one({"email": "ann@x.com"}) is None
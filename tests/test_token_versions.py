@@ -0,0 +1,108 @@
+"""Tests for self-contained token claims and token version revocation."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.auth_service import jwt_token_service
+from services.token_version_service import TokenVersionRegistryService
+
+USER = {"id": "u1", "role": "tutor", "institute_id": "i1", "email": "t@x.com", "name": "Tutor", "token_version": 2}
+
+def test_claims_round_trip_through_a_token():
+    token = jwt_token_service.create_access_token(jwt_token_service.build_user_claims(USER))
+    principal = jwt_token_service.principal_from_claims(jwt_token_service.decode_access_token(token))
+
+    assert principal == {key: USER[key] for key in principal}
+
+def test_add_version_bump_extends_an_update():
+    update = TokenVersionRegistryService.add_version_bump({"$set": {"email": "new@x.com"}})
+
+    assert update["$inc"] == {"token_version": 1}
+    assert update["$set"]["email"] == "new@x.com"
+    assert isinstance(update["$set"]["token_version_updated_at"], datetime)
+
+@pytest.mark.parametrize("update_data, changed", [
+    ({"email": "t@x.com", "name": "Tutor", "phone": "123"}, False),
+    ({"phone": "123"}, False),
+    ({"email": "new@x.com"}, True),
+    ({"name": "Tutor B", "email": "t@x.com"}, True),
+])
+def test_claims_changed_ignores_resubmitted_values(update_data, changed):
+    assert TokenVersionRegistryService.claims_changed(USER, update_data) is changed
+
+@pytest.mark.anyio
+async def test_first_refresh_loads_only_bumped_users(mongo_db):
+    await mongo_db.users.insert_many([{"id": "fresh", "token_version": 0}, {"id": "bumped", "token_version": 3}])
+    registry = TokenVersionRegistryService()
+
+    await registry.refresh(mongo_db)
+
+    assert registry.is_loaded
+    assert registry.get_statistics()["tracked_users"] == 1
+    assert registry.is_token_current("fresh", 0)
+    assert registry.is_token_current("bumped", 3)
+    assert not registry.is_token_current("bumped", 2)
+
+@pytest.mark.anyio
+async def test_unknown_users_are_at_version_zero(mongo_db):
+    registry = TokenVersionRegistryService()
+    await registry.refresh(mongo_db)
+
+    assert registry.is_token_current("created-elsewhere", 0)
+    assert not registry.is_token_current("created-elsewhere", 1)
+
+@pytest.mark.anyio
+async def test_incremental_refresh_picks_up_bumps_from_other_workers(mongo_db):
+    await mongo_db.users.insert_one({"id": "u1", "token_version": 0})
+    registry = TokenVersionRegistryService()
+    await registry.refresh(mongo_db)
+
+    await mongo_db.users.update_one({"id": "u1"}, TokenVersionRegistryService.add_version_bump({}))
+    assert registry.is_token_current("u1", 0)
+
+    await registry.refresh(mongo_db)
+    assert not registry.is_token_current("u1", 0)
+    assert registry.is_token_current("u1", 1)
+
+@pytest.mark.anyio
+async def test_incremental_refresh_skips_old_bumps(mongo_db):
+    registry = TokenVersionRegistryService()
+    await registry.refresh(mongo_db)
+    long_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    await mongo_db.users.insert_one({"id": "u1", "token_version": 4, "token_version_updated_at": long_ago})
+
+    await registry.refresh(mongo_db)
+
+    assert registry.get_statistics()["tracked_users"] == 0
+
+@pytest.mark.anyio
+async def test_revocation_reaches_other_workers(mongo_db):
+    deleting_worker = TokenVersionRegistryService()
+    other_worker = TokenVersionRegistryService()
+    await other_worker.refresh(mongo_db)
+
+    await deleting_worker.revoke(mongo_db, "u1")
+
+    assert not deleting_worker.is_token_current("u1", 0)
+    assert other_worker.is_token_current("u1", 0)
+    await other_worker.refresh(mongo_db)
+    assert not other_worker.is_token_current("u1", 0)
+
+@pytest.mark.anyio
+async def test_startup_refresh_loads_existing_revocations(mongo_db):
+    await TokenVersionRegistryService().revoke(mongo_db, "u1")
+    registry = TokenVersionRegistryService()
+
+    await registry.refresh(mongo_db)
+
+    assert not registry.is_token_current("u1", 0)
+    assert registry.get_statistics()["revoked_users"] == 1
+
+def test_register_records_local_bumps():
+    registry = TokenVersionRegistryService()
+
+    registry.register("u1", 2)
+
+    assert registry.is_token_current("u1", 2)
+    assert not registry.is_token_current("u1", 1)
+    assert registry.get_statistics()["rejected"] == 1
@@ -0,0 +1,106 @@
+"""Tests for streaming, size-capped sheet ingestion."""
+import io
+
+import openpyxl
+import pytest
+
+from services.upload_service import (
+    XLS_SIGNATURE,
+    UnsupportedUploadError,
+    UploadIngestionService,
+    UploadTooLargeError,
+    chunked,
+    clean_cell
+)
+
+def workbook_bytes(rows):
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    (float("nan"), None),
+    ("  ", None),
+    (" Ann ", "Ann"),
+    (9876543210.0, "9876543210"),
+    (12.5, "12.5"),
+    (7, "7"),
+])
+def test_clean_cell(value, expected):
+    assert clean_cell(value) == expected
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+def test_csv_rows_keep_sheet_row_numbers_and_skip_blank_lines():
+    file = io.BytesIO("\ufeffname , email\nAnn,ann@x.com\n\nBob,bob@x.com\n".encode("utf-8"))
+
+    sheet = UploadIngestionService().open_file(file, "students.csv")
+
+    assert sheet.columns == ["name", "email"]
+    assert sheet.total_rows == 2
+    assert list(sheet.rows) == [(2, {"name": "Ann", "email": "ann@x.com"}), (4, {"name": "Bob", "email": "bob@x.com"})]
+
+def test_empty_csv_is_rejected():
+    with pytest.raises(ValueError, match="empty"):
+        UploadIngestionService().open_file(io.BytesIO(b""), "students.csv")
+
+def test_excel_rows_are_read_with_clean_headers():
+    file = workbook_bytes([[" name", "phone"], ["Ann", 9876543210], [None, None], ["Bob", None]])
+
+    sheet = UploadIngestionService().open_file(file, "Students.XLSX")
+
+    assert sheet.columns == ["name", "phone"]
+    assert list(sheet.rows) == [(2, {"name": "Ann", "phone": 9876543210}), (4, {"name": "Bob", "phone": None})]
+
+@pytest.mark.parametrize("filename", ["students.csv", "students", None])
+def test_workbooks_are_detected_by_content_not_name(filename):
+    sheet = UploadIngestionService().open_file(workbook_bytes([["name"], ["Ann"]]), filename)
+
+    assert list(sheet.rows) == [(2, {"name": "Ann"})]
+
+def test_extensionless_csv_is_read_as_csv():
+    sheet = UploadIngestionService().open_file(io.BytesIO(b"name\nAnn\n"), "students")
+
+    assert list(sheet.rows) == [(2, {"name": "Ann"})]
+
+@pytest.mark.parametrize("filename", ["students.xls", "students.csv", None])
+def test_legacy_xls_workbooks_are_rejected(filename):
+    with pytest.raises(UnsupportedUploadError, match="legacy .xls"):
+        UploadIngestionService().open_file(io.BytesIO(XLS_SIGNATURE + b"\0" * 504), filename)
+
+def test_oversized_files_are_rejected_before_parsing():
+    with pytest.raises(UploadTooLargeError):
+        UploadIngestionService(max_bytes=10).open_file(io.BytesIO(b"email\n" + b"a@x.com\n" * 5), "invites.csv")
+
+@pytest.mark.parametrize("filename, file_factory", [
+    ("invites.csv", lambda: io.BytesIO(b"email\n" + b"a@x.com\n" * 4)),
+    ("invites.xlsx", lambda: workbook_bytes([["email"]] + [["a@x.com"]] * 4)),
+])
+def test_sheets_over_the_row_limit_are_rejected_up_front(filename, file_factory):
+    with pytest.raises(UploadTooLargeError):
+        UploadIngestionService(max_rows=3).open_file(file_factory(), filename)
+
+def test_row_limit_also_applies_while_streaming():
+    ingestion = UploadIngestionService(max_rows=3)
+    sheet = ingestion.open_file(io.BytesIO(b"email\n" + b"a@x.com\n" * 3), "invites.csv")
+    rows = ingestion._limit_rows(iter([(row_number, {}) for row_number in range(2, 7)]))
+
+    assert len(list(sheet.rows)) == 3
+    with pytest.raises(UploadTooLargeError):
+        list(rows)
+
+@pytest.mark.anyio
+async def test_rows_are_handed_over_in_bounded_batches():
+    ingestion = UploadIngestionService(batch_size=2)
+    sheet = ingestion.open_file(io.BytesIO(b"email\n" + b"a@x.com\n" * 5), "invites.csv")
+
+    sizes = [len(batch) async for batch in ingestion.iter_batches(sheet.rows)]
+
+    assert sizes == [2, 2, 1]